@@ -15,6 +15,8 @@ def run():
     SERVER.register_function(hello)
     sdk = SDK()
     SERVER.register_instance(sdk, prefix="sdk")
+    # the frontend pulls these into its log panel (BackendLogCollector)
+    SERVER.enable_log_forwarding()
     SERVER.start()
 
 
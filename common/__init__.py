@@ -1,14 +1,57 @@
+from __future__ import annotations
+
+import importlib
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from pathlib import Path
 
-from common.configuration.parser import ConfigurationManager
-from common.appearance.fontmanager import FontManager
-from common.logger import Logger
-from common.tcpinterface.backendclient import BackendClient
-from common.appearance.stylemanager import StyleManager
-from common.threadmanager import ThreadManager
-from common.data import AppData
+# imported first: the startup timeline measures offsets from here
+from common.diagnostics.startup import StartupTimeline
+
+if TYPE_CHECKING:
+    from common.configuration.parser import ConfigurationManager
+    from common.appearance.fontmanager import FontManager
+    from common.logger import Logger
+    from common.appearance.stylemanager import StyleManager
+    from common.threadmanager import ThreadManager
+    from common.jobqueue import JobQueue
+    from common.data import AppData
+    from common.diagnostics.stalls import StallDetector
+    from common.tcpinterface.logforward import BackendLogCollector
+
+# Names re-exported from submodules, imported on first access. Importing ``common`` (e.g. from
+# the backend process or a headless tool) therefore no longer pulls in QtWidgets, QtSvg or the
+# crypto package; see common/diagnostics/imports.py to measure what an import costs.
+_LAZY_ATTRIBUTES = {
+    "ConfigurationManager": ("common.configuration.parser", "ConfigurationManager"),
+    "FontManager": ("common.appearance.fontmanager", "FontManager"),
+    "Logger": ("common.logger", "Logger"),
+    "BackendClient": ("common.tcpinterface.backendclient", "BackendClient"),
+    "StyleManager": ("common.appearance.stylemanager", "StyleManager"),
+    "ThreadManager": ("common.threadmanager", "ThreadManager"),
+    "JobQueue": ("common.jobqueue", "JobQueue"),
+    "default_jobs_path": ("common.jobqueue", "default_path"),
+    "AppData": ("common.data", "AppData"),
+    "Tracer": ("common.diagnostics.tracing", "Tracer"),
+    "SamplingProfiler": ("common.diagnostics.profiler", "SamplingProfiler"),
+    "StallDetector": ("common.diagnostics.stalls", "StallDetector"),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attribute)
+    # cache on the package so the next access is a plain attribute lookup
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 # noinspection PyCompatibility
 @dataclass
@@ -22,23 +65,41 @@ class AppContext:
     styler: Optional[StyleManager] = None
     font: Optional[FontManager] = None
     threader: Optional[ThreadManager] = None
+    jobs: Optional[JobQueue] = None
+    stalls: Optional[StallDetector] = None
     backend: Optional[object] = None
+    backend_logs: Optional[BackendLogCollector] = None
     data: Optional[AppData] = None
 
+
 # create a global app context instance that other modules import
 AppCntxt = AppContext()
 
 
-def initialise_context():
+# fonts preloaded at startup: tag -> (file under resources/fonts, point size)
+STARTUP_FONTS = {
+    "h1": ("RobotoCondensed-VariableFont_wght.ttf", 18),
+    "h2": ("RobotoCondensed-VariableFont_wght.ttf", 14),
+    "p": ("Roboto-VariableFont_wdth,wght.ttf", 11),
+    "pc": ("RobotoCondensed-VariableFont_wght.ttf", 11),
+    "log": ("Inconsolata-VariableFont_wdth,wght.ttf", 11),
+}
+
+
+def build_startup_pipeline(progress=None):
     """
-    Initialise the global AppCntxt. This was previously done in frontend.app._initialise_context.
-    Imports inside the function minimise import-time side-effects / cycles.
+    Prepare the global AppCntxt and return the startup pipeline that fills in the rest.
+    The logger and thread manager are created right away (the pipeline runs on them); config,
+    backend client, palette and fonts are pipeline steps, so callers can add their own steps
+    (e.g. the backend handshake) before start(). Non-essential services (the job queue
+    database, the stall detector) are set up lazily on first use.
     """
-    # local imports to avoid circular import at module import time
-    import hashlib
-    import time
+    # local imports: the GUI / crypto stack is only loaded once the application actually starts
     import common.threadmanager as threadmanager_module
-    from common.tcpinterface.backendclient import BackendClient
+    from common.appearance.fontmanager import FontManager
+    from common.data import AppData
+    from common.jobqueue import JobQueue, default_path as default_jobs_path
+    from common.pipeline import StartupPipeline
 
     # Resolve config path relative to project root (module location), not current working directory
     project_root = Path(__file__).resolve().parent.parent  # <project_root>/common -> parent is project root
@@ -48,22 +109,117 @@ def initialise_context():
     # normalize and store absolute string back to context for later use
     AppCntxt.config_path = str(cfg_path.resolve())
 
+    timeline = StartupTimeline()
+    timeline.load_budgets()
+
     # Logger
-    AppCntxt.logger = Logger()
+    with timeline.phase("logger"):
+        _setup_logger()
 
     # Thread manager instance
-    AppCntxt.threader = threadmanager_module.get_instance()
+    with timeline.phase("threadmanager"):
+        AppCntxt.threader = threadmanager_module.get_instance()
+
+        # AppData
+        AppCntxt.data = AppData()
+
+        # Start thread manager
+        AppCntxt.threader.start()
+
+    # Durable job queue; queued jobs for its handlers are persisted at shutdown. Its database is
+    # only opened once the frontend starts it after startup.
+    with timeline.phase("jobqueue"):
+        AppCntxt.jobs = JobQueue(AppCntxt.threader, str(default_jobs_path(AppCntxt.name)))
+        AppCntxt.threader.set_persist_handler(AppCntxt.jobs.persist_pending)
+
+    pipeline = StartupPipeline(AppCntxt.threader, progress=progress)
+
+    # Font files are read once each on the pool; Qt wants the registration on the GUI thread
+    resources = project_root / "resources" / "fonts"
+
+    def read_font_files():
+        try:
+            return FontManager.read_font_files(str(resources / file) for file, _ in STARTUP_FONTS.values())
+        except OSError:
+            # register_fonts retries from disk and reports what is missing
+            return {}
 
-    # AppData
-    AppCntxt.data = AppData()
+    def register_fonts():
+        AppCntxt.font = FontManager()
+        try:
+            files = pipeline.result("font files")
+            for tag, (file, size) in STARTUP_FONTS.items():
+                path = str(resources / file)
+                AppCntxt.font.load_font(path, tag, size, data=files.get(path))
+        except Exception:
+            # non-fatal; log and continue
+            if AppCntxt.logger:
+                AppCntxt.logger.warning("Some fonts could not be loaded during initialisation.")
 
-    # Start thread manager
-    AppCntxt.threader.start()
+    pipeline.add("configuration", _load_configuration)
+    pipeline.add("backend client", _create_backend_client, requires=("configuration",))
+    pipeline.add("style", _compute_palette, requires=("configuration",))
+    pipeline.add("font files", read_font_files)
+    pipeline.add("fonts", register_fonts, requires=("font files",), gui=True)
+    return pipeline
+
+
+def _setup_logger():
+    """Create AppCntxt.logger and apply the APP_LOG_* / APP_TRACE / APP_PROFILE options."""
+    import logging
+    import os
+    from common.diagnostics.profiler import SamplingProfiler
+    from common.diagnostics.tracing import Tracer
+    from common.logger import Logger
+    from common.logstore import default_spill_directory
+    from common.logfilter import LogThrottle
+
+    AppCntxt.logger = Logger()
+    # e.g. APP_LOG_LEVEL=INFO: debug calls then return before doing any work
+    if os.environ.get("APP_LOG_LEVEL"):
+        AppCntxt.logger.set_level(logging.getLevelName(os.environ["APP_LOG_LEVEL"].upper()))
+    # the newest APP_LOG_CAPACITY lines stay in memory, older ones go to rotating files on disk
+    if os.environ.get("APP_LOG_CAPACITY"):
+        AppCntxt.logger.logs.resize(int(os.environ["APP_LOG_CAPACITY"]))
+    AppCntxt.logger.logs.enable_spill(str(default_spill_directory(AppCntxt.name)))
+    # repeated messages collapse into "message (x N)" and chatty call sites are rate-limited;
+    # APP_LOG_THROTTLE=0 logs every line
+    if os.environ.get("APP_LOG_THROTTLE", "1") != "0":
+        AppCntxt.logger.set_throttle(LogThrottle())
+    # every session is journaled to disk and the last one's tail is shown again on start;
+    # APP_LOG_JOURNAL=0 turns the journal off
+    if os.environ.get("APP_LOG_JOURNAL", "1") != "0":
+        _start_log_journal()
+    # APP_LOG_FILE=<path> also writes the session log to a rotating file (on the writer thread)
+    if os.environ.get("APP_LOG_FILE"):
+        AppCntxt.logger.add_file_sink(os.environ["APP_LOG_FILE"])
+
+    # Tracing and profiling stay off unless APP_TRACE / APP_PROFILE name an output file
+    Tracer().enable_from_environment()
+    SamplingProfiler().enable_from_environment()
+
+
+def _start_log_journal():
+    from common.logjournal import default_journal_directory
+
+    journal = AppCntxt.logger.add_journal_sink(str(default_journal_directory(AppCntxt.name))).journal
+    sessions = journal.previous_sessions()
+    if sessions:
+        restored = AppCntxt.logger.restore_from_journal(sessions[-1])
+        AppCntxt.logger.info("Restored %d log records of the last session (%s)", restored, sessions[-1][0].name)
+
+
+# ---------------- startup pipeline steps -----------------
+def _load_configuration():
+    from common.configuration.parser import ConfigurationManager
 
-    # Settings / Configuration
     AppCntxt.settings = ConfigurationManager(AppCntxt.config_path)
 
-    # Backend client
+
+def _create_backend_client():
+    import hashlib
+    from common.tcpinterface.backendclient import BackendClient
+
     ip = AppCntxt.settings.get_value('sdk_ip_address')
     port = AppCntxt.settings.get_value('sdk_tcp_port')
     timeout = AppCntxt.settings.get_value('sdk_tcp_timeout')
@@ -71,8 +227,12 @@ def initialise_context():
     key = hashlib.sha256(b"sample key").digest()
     AppCntxt.backend = BackendClient(ip, port, timeout, secret_key=key)
 
-    # Style manager initialisation
-    AppCntxt.styler = StyleManager()
+
+def _compute_palette():
+    """Style manager initialisation (colour maths only, so it runs off the GUI thread)."""
+    from common.appearance.stylemanager import StyleManager
+
+    styler = StyleManager()
     try:
         accent = AppCntxt.settings.get_value('accent')
         support = AppCntxt.settings.get_value('support')
@@ -84,21 +244,17 @@ def initialise_context():
         support = "#bb1133"
         neutral = "#7d8be0"
         theme = "light"
-    AppCntxt.styler.initialise(accent, support, neutral, theme)
+    styler.initialise(accent, support, neutral, theme)
+    AppCntxt.styler = styler
 
-    # Font manager and preload some fonts (keep the previous behaviour)
-    AppCntxt.font = FontManager()
-    try:
-        # make font paths relative to project root as well (optional)
-        resources = project_root / "resources" / "fonts"
-        AppCntxt.font.load_font(str(resources / "RobotoCondensed-VariableFont_wght.ttf"), "h1", 18)
-        AppCntxt.font.load_font(str(resources / "RobotoCondensed-VariableFont_wght.ttf"), "h2", 14)
-        AppCntxt.font.load_font(str(resources / "Roboto-VariableFont_wdth,wght.ttf"), "p", 11)
-        AppCntxt.font.load_font(str(resources / "RobotoCondensed-VariableFont_wght.ttf"), "pc", 11)
-        AppCntxt.font.load_font(str(resources / "Inconsolata-VariableFont_wdth,wght.ttf"), "log", 11)
-    except Exception:
-        # non-fatal; log and continue
-        if AppCntxt.logger:
-            AppCntxt.logger.warning("Some fonts could not be loaded during initialisation.")
+
+def initialise_context():
+    """
+    Initialise the global AppCntxt. This was previously done in frontend.app._initialise_context.
+    Runs the whole startup pipeline and returns once every step is done.
+    """
+    pipeline = build_startup_pipeline()
+    pipeline.start()
+    pipeline.wait()
     # allow caller to process events if needed
     return AppCntxt
@@ -19,26 +19,50 @@ class FontManager:
         self._font_map = {}           # Maps tags like 'h1' to font info
         self._loaded_families = []    # List of loaded font families
         self._family_cycle = None     # Iterator for round-robin font assignment
+        self._path_families = {}      # Font file -> family, so each file is registered once
 
-    def load_font(self, font_path: str, tag: str = None, size: int = None):
+    @staticmethod
+    def read_font_files(font_paths) -> dict:
+        """
+        Reads each distinct font file once and returns {path: bytes}.
+        Safe to call from a worker thread; pass the bytes to load_font(data=...) on the GUI thread.
+        """
+        data = {}
+        for font_path in font_paths:
+            if font_path not in data:
+                if not os.path.exists(font_path):
+                    raise FileNotFoundError(f"Font file not found: {font_path}")
+                with open(font_path, "rb") as f:
+                    data[font_path] = f.read()
+        return data
+
+    def load_font(self, font_path: str, tag: str = None, size: int = None, data: bytes = None):
         """
         Loads a TTF font and optionally maps it to a tag with a size.
         If tag/size is not provided, font is added to the pool for round-robin mapping.
+        A file that is already loaded is not registered again; ``data`` (the file contents,
+        see read_font_files) avoids opening the file on the calling thread.
         """
-        if not os.path.exists(font_path):
-            raise FileNotFoundError(f"Font file not found: {font_path}")
+        family = self._path_families.get(font_path)
+        if family is None:
+            if data is None and not os.path.exists(font_path):
+                raise FileNotFoundError(f"Font file not found: {font_path}")
 
-        font_id = QFontDatabase.addApplicationFont(font_path)
-        if font_id == -1:
-            raise RuntimeError(f"Failed to load font: {font_path}")
+            if data is not None:
+                font_id = QFontDatabase.addApplicationFontFromData(data)
+            else:
+                font_id = QFontDatabase.addApplicationFont(font_path)
+            if font_id == -1:
+                raise RuntimeError(f"Failed to load font: {font_path}")
 
-        families = QFontDatabase.applicationFontFamilies(font_id)
-        if not families:
-            raise RuntimeError(f"No font families found in: {font_path}")
+            families = QFontDatabase.applicationFontFamilies(font_id)
+            if not families:
+                raise RuntimeError(f"No font families found in: {font_path}")
 
-        family = families[0]
-        self._loaded_families.append(family)
-        self._family_cycle = cycle(self._loaded_families)
+            family = families[0]
+            self._path_families[font_path] = family
+            self._loaded_families.append(family)
+            self._family_cycle = cycle(self._loaded_families)
 
         if tag:
             self._font_map[tag] = {
@@ -1,7 +1,7 @@
 import os
 import threading
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from PySide6.QtCore import QObject, Signal, Qt, QThreadPool, QRunnable
 from PySide6.QtGui import QPixmap, QPainter, QColor, QImage
 from PySide6.QtSvg import QSvgRenderer
@@ -114,33 +114,15 @@ class IconManager:
         Returns a colored QPixmap of an icon.
         If async_load=True, loads in background and emits `icon_loaded(name, image)` when done.
         """
-        if not cls._icon_list:
-            cls.list_icons()
-
-        # Find the full icon name if a partial name is given
-        name_list = cls.search_icons(name, cls._icon_list)
-        if name_list:
-            resolved_name = name_list[0]
-        elif name in cls._icon_list:
-            resolved_name = name
-        else:
-            raise FileNotFoundError(f"[IconManager] Icon not found: {name}")
+        resolved_name, file_path, cached_image = cls._lookup(name, color, size)
+        if cached_image is not None:
+            if async_load:
+                # For async, emit signal immediately with cached data instead of returning
+                cls._notifier.icon_loaded.emit(resolved_name, cached_image)
+                return None
+            # For sync, convert cached QImage to QPixmap and return
+            return QPixmap.fromImage(cached_image)
 
-        cache_key = f"{resolved_name}|{color.lower()}|{size}"
-
-        # --- Cache lookup (now checking for QImage) ---
-        with cls._icon_lock:
-            if cache_key in cls._icon_cache:
-                cached_image = cls._icon_cache[cache_key]
-                if async_load:
-                    # For async, emit signal immediately with cached data instead of returning
-                    cls._notifier.icon_loaded.emit(resolved_name, cached_image)
-                    return None
-                else:
-                    # For sync, convert cached QImage to QPixmap and return
-                    return QPixmap.fromImage(cached_image)
-
-        file_path = os.path.join(cls._images_path, f"{resolved_name}.svg")
         if not os.path.exists(file_path):
             print(f"[IconManager] Missing icon file: {file_path}")
             return QPixmap()
@@ -156,6 +138,48 @@ class IconManager:
             cls._cache_result(resolved_name, color, size, image)
             return QPixmap.fromImage(image)
 
+    @classmethod
+    def load_image(cls, name: str, color: str = "#FFFFFF", size: int = 24) -> QImage:
+        """
+        Blocking, thread-safe variant of get_pixmap(async_load=True) for use on worker threads.
+        Renders (or fetches from cache) a QImage and emits `icon_loaded(name, image)`.
+        """
+        resolved_name, file_path, cached_image = cls._lookup(name, color, size)
+        if cached_image is not None:
+            cls._notifier.icon_loaded.emit(resolved_name, cached_image)
+            return cached_image
+
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"[IconManager] Missing icon file: {file_path}")
+
+        image = cls._load_icon_image(file_path, color, size)
+        cls._cache_result(resolved_name, color, size, image)
+        return image
+
+    @classmethod
+    def _lookup(cls, name: str, color: str, size: int) -> Tuple[str, str, Optional[QImage]]:
+        """
+        Resolves a (partial) icon name and checks the cache.
+        Returns (resolved name, SVG file path, cached QImage or None); raises FileNotFoundError
+        if no icon matches the name.
+        """
+        if not cls._icon_list:
+            cls.list_icons()
+
+        # Find the full icon name if a partial name is given
+        name_list = cls.search_icons(name, cls._icon_list)
+        if name_list:
+            resolved_name = name_list[0]
+        elif name in cls._icon_list:
+            resolved_name = name
+        else:
+            raise FileNotFoundError(f"[IconManager] Icon not found: {name}")
+
+        cache_key = f"{resolved_name}|{color.lower()}|{size}"
+        with cls._icon_lock:
+            cached_image = cls._icon_cache.get(cache_key)
+        return resolved_name, os.path.join(cls._images_path, f"{resolved_name}.svg"), cached_image
+
     @classmethod
     def clear_cache(cls):
         with cls._icon_lock:
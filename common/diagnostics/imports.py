@@ -0,0 +1,122 @@
+"""
+imports.py
+
+Import-cost audit: what does importing a module cost on a cold start?
+
+Features:
+- Imports the module in a fresh interpreter with ``-X importtime`` and returns, per imported
+  module, its own (self) and cumulative import time
+- Flags the GUI modules (QtWidgets, QtGui, QtSvg) an import dragged in, so headless entry
+  points (backend process, tools) can be checked to stay free of them
+- Command line: ``python -m common.diagnostics.imports common.tcpinterface.backendserver --top 20``
+
+Design notes:
+- Every audit runs in a subprocess: modules already imported by the caller would otherwise look
+  free. Timings vary between runs (disk cache, CPU), compare cumulative times rather than
+  single modules.
+
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# modules a headless process (backend, CLI tools) should not have to load
+HEAVY_MODULES = ("PySide6.QtWidgets", "PySide6.QtGui", "PySide6.QtSvg")
+
+
+@dataclass
+class ImportCost:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportAudit:
+    target: str
+    costs: List[ImportCost]
+
+    @property
+    def total_us(self) -> int:
+        """Cumulative time of the audited import itself."""
+        return next((c.cumulative_us for c in self.costs if c.module == self.target), 0)
+
+    def modules(self) -> List[str]:
+        return [c.module for c in self.costs]
+
+    def heavy(self, prefixes: Sequence[str] = HEAVY_MODULES) -> List[str]:
+        """Heavy modules (see HEAVY_MODULES) loaded by the import."""
+        return sorted(m for m in self.modules() if m in prefixes or m.startswith(tuple(p + "." for p in prefixes)))
+
+    def top(self, n: int = 20, cumulative: bool = False) -> List[ImportCost]:
+        key = (lambda c: c.cumulative_us) if cumulative else (lambda c: c.self_us)
+        return sorted(self.costs, key=key, reverse=True)[:n]
+
+    def format_report(self, n: int = 20) -> str:
+        lines = [f"import {self.target}: {self.total_us / 1000:.1f} ms, {len(self.costs)} modules",
+                 f"{'self ms':>9} {'cumul ms':>9}  module"]
+        for c in self.top(n):
+            lines.append(f"{c.self_us / 1000:>9.1f} {c.cumulative_us / 1000:>9.1f}  {c.module}")
+        heavy = self.heavy()
+        lines.append("heavy modules: " + (", ".join(heavy) if heavy else "none"))
+        return "\n".join(lines)
+
+
+def parse_importtime(output: str) -> List[ImportCost]:
+    """Parse the stderr of ``python -X importtime``."""
+    costs = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header row
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        costs.append(ImportCost(name.strip(), int(fields[0]), int(fields[1]), depth))
+    return costs
+
+
+def audit(module: str, python: str = sys.executable) -> ImportAudit:
+    """Import ``module`` in a fresh interpreter and return what the import cost.
+
+    Raises ImportError when the module cannot be imported.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    result = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"], cwd=PROJECT_ROOT,
+                            env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise ImportError(f"Cannot import {module}: {errors[-1] if errors else result.returncode}")
+    return ImportAudit(module, parse_importtime(result.stderr))
+
+
+def main(argv: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report the cold-start cost of importing modules.")
+    parser.add_argument("modules", nargs="+", help="modules to audit, e.g. common.logger")
+    parser.add_argument("--top", type=int, default=20, help="number of most expensive modules to list")
+    parser.add_argument("--headless", action="store_true",
+                        help="exit with status 1 if a module pulls in GUI modules")
+    args = parser.parse_args(argv)
+    status = 0
+    for module in args.modules:
+        report = audit(module)
+        print(report.format_report(args.top))
+        print()
+        if args.headless and report.heavy():
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
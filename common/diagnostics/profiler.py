@@ -0,0 +1,176 @@
+"""
+profiler.py
+
+In-app sampling profiler for production sessions where an external profiler cannot be attached.
+
+Features:
+- A background thread samples the Python stacks of the GUI thread, the ThreadmanagerLoopThread
+  and the pool workers (or any thread-name prefixes you choose) at a configurable rate
+- Writes flamegraph-compatible collapsed stacks ("thread;outer;...;leaf count" per line), readable
+  by flamegraph.pl, speedscope or Perfetto
+- Start / stop at runtime (tester "Diagnostics" tab) or for a whole session via APP_PROFILE
+
+Design notes:
+- Uses sys._current_frames(), so it only sees Python frames; time spent inside C / Qt calls is
+  attributed to the Python frame that made the call.
+- Pool worker names ("ThreadPoolExecutor-0_3") are folded into one root per executor, so all
+  workers aggregate into a single flame.
+- APP_PROFILE=<path.folded> profiles the session and writes the file at exit;
+  APP_PROFILE_HZ sets the sampling rate (default 200).
+
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_THREADS = ("MainThread", "ThreadmanagerLoopThread", "ThreadPoolExecutor")
+_WORKER_SUFFIX = re.compile(r"_\d+$")
+
+
+class SamplingProfiler:
+    """Singleton stack-sampling profiler.
+
+    Typical usage:
+        profiler = SamplingProfiler()
+        profiler.start(hz=200)
+        ...
+        profiler.stop()
+        profiler.write_collapsed("session.folded")
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, "_initialized", False):
+            return
+        self._samples: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._threads: Tuple[str, ...] = DEFAULT_THREADS
+        self._include_lines = False
+        self._labels: Dict[Tuple[object, int], str] = {}
+        self.sample_count = 0
+        self.elapsed = 0.0
+        self._initialized = True
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ---------------- control -----------------
+    def start(self, hz: float = 200.0, threads: Optional[Tuple[str, ...]] = None, include_lines: bool = False) -> None:
+        """Start sampling (no-op when already running). Samples accumulate until clear().
+
+        Args:
+            hz: samples per second.
+            threads: thread-name prefixes to sample (default: GUI, loop and pool threads).
+            include_lines: label frames with line numbers (finer, but splits the flames).
+        """
+        if self.running:
+            return
+        self._threads = tuple(threads) if threads else DEFAULT_THREADS
+        self._include_lines = include_lines
+        self._labels.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(1.0 / hz,), name="SamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> int:
+        """Stop sampling. Returns the total number of samples collected so far."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self.sample_count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self.sample_count = 0
+            self.elapsed = 0.0
+
+    def enable_from_environment(self, variable: str = "APP_PROFILE") -> bool:
+        """Profile the session when ``variable`` names an output file; it is written at exit."""
+        path = os.environ.get(variable)
+        if not path:
+            return False
+        self.start(hz=float(os.environ.get(f"{variable}_HZ", 200)))
+
+        def _write() -> None:
+            self.stop()
+            self.write_collapsed(path)
+        atexit.register(_write)
+        return True
+
+    # ---------------- results -----------------
+    def collapsed(self) -> Dict[str, int]:
+        """Collapsed stacks -> sample count."""
+        with self._lock:
+            return dict(self._samples)
+
+    def write_collapsed(self, file_path: str) -> int:
+        """Write flamegraph collapsed stacks. Returns the number of distinct stacks written."""
+        stacks = sorted(self.collapsed().items())
+        with open(file_path, "w", encoding="utf-8") as f:
+            for stack, count in stacks:
+                f.write(f"{stack} {count}\n")
+        return len(stacks)
+
+    def top(self, n: int = 20) -> List[Tuple[str, int]]:
+        """Frames with the most samples anywhere on the stack (inclusive), busiest first."""
+        totals: Counter = Counter()
+        for stack, count in self.collapsed().items():
+            # a recursive frame counts once per sample
+            for frame in set(stack.split(";")[1:]):
+                totals[frame] += count
+        return totals.most_common(n)
+
+    # ---------------- sampling -----------------
+    def _run(self, interval: float) -> None:
+        own = threading.get_ident()
+        names: Dict[int, str] = {}
+        started = time.perf_counter()
+        while not self._stop.wait(interval):
+            frames = sys._current_frames()
+            if any(ident not in names for ident in frames):
+                names = {t.ident: _WORKER_SUFFIX.sub("", t.name) for t in threading.enumerate()}
+            stacks = []
+            for ident, frame in frames.items():
+                name = names.get(ident)
+                if ident == own or name is None or not name.startswith(self._threads):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame))
+                    frame = frame.f_back
+                stack.append(name)
+                stacks.append(";".join(reversed(stack)))
+            del frames
+            with self._lock:
+                self._samples.update(stacks)
+                self.sample_count += 1
+        with self._lock:
+            self.elapsed += time.perf_counter() - started
+
+    def _label(self, frame) -> str:
+        code = frame.f_code
+        key = (code, frame.f_lineno if self._include_lines else 0)
+        label = self._labels.get(key)
+        if label is None:
+            where = os.path.basename(code.co_filename)
+            if self._include_lines:
+                where = f"{where}:{frame.f_lineno}"
+            label = self._labels[key] = f"{code.co_name} ({where})"
+        return label
@@ -0,0 +1,159 @@
+"""
+stalls.py
+
+GUI thread stall ("jank") detector.
+
+Features:
+- A QTimer heartbeat on the GUI thread plus a watchdog thread; when the event loop has not turned
+  over for ``threshold_ms`` the watchdog captures the GUI thread's Python stack
+- Keeps sampling the stack while the stall lasts, so the reported call site is where the time
+  actually went, not only where it started
+- Aggregates stalls per offending call site (count, total / max duration, example stack) and
+  returns them ranked by total blocked time
+- Each stall is logged once it ends, with its duration and call site
+
+Design notes:
+- The call site is the innermost frame of application code (outside the standard library and
+  site-packages), so a stall inside QSettings.sync() is charged to the line that called it.
+- APP_STALL_MS sets the threshold for the frontend (0 disables the detector).
+
+"""
+from __future__ import annotations
+
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer
+
+from common.logger import Logger
+
+_LIBRARY_PATHS = tuple({os.path.normcase(p) for p in (sysconfig.get_paths()["stdlib"],
+                                                      sysconfig.get_paths()["purelib"],
+                                                      sysconfig.get_paths()["platlib"])})
+
+
+@dataclass
+class StallSite:
+    """Aggregated stalls charged to one call site."""
+    site: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    stack: List[str] = field(default_factory=list)
+
+
+class StallDetector(QObject):
+    """Watchdog for the GUI event loop.
+
+    Typical usage (on the GUI thread, after the QApplication exists):
+        detector = StallDetector(threshold_ms=200)
+        detector.start()
+        ...
+        for site in detector.report(10):
+            print(site.site, site.count, site.total_ms)
+    """
+
+    def __init__(self, threshold_ms: int = 200, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self._logger = Logger()
+        self._sites: Dict[str, StallSite] = {}
+        self._lock = threading.Lock()
+        self._beat = time.perf_counter()
+        self._gui_ident: Optional[int] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._heartbeat)
+
+    @property
+    def running(self) -> bool:
+        return self._watchdog is not None
+
+    def start(self) -> None:
+        """Start watching the event loop of the calling (GUI) thread."""
+        if self.running:
+            return
+        self._gui_ident = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._timer.start(max(5, self.threshold_ms // 4))
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        if self._watchdog is not None:
+            self._stop.set()
+            self._watchdog.join()
+            self._watchdog = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sites.clear()
+
+    def report(self, n: Optional[int] = None) -> List[StallSite]:
+        """Call sites ranked by total blocked time."""
+        with self._lock:
+            sites = sorted(self._sites.values(), key=lambda s: s.total_ms, reverse=True)
+        return sites[:n] if n else sites
+
+    def format_report(self, n: int = 10) -> str:
+        lines = [f"{s.total_ms:>9.0f} ms  {s.count:>4}x  max {s.max_ms:>6.0f} ms  {s.site}" for s in self.report(n)]
+        return "\n".join(lines) if lines else "No GUI stalls recorded."
+
+    # ---------------- internals -----------------
+    def _heartbeat(self) -> None:
+        self._beat = time.perf_counter()
+
+    def _watch(self) -> None:
+        poll = max(0.005, self.threshold_ms / 4000)
+        threshold = self.threshold_ms / 1000
+        while not self._stop.wait(poll):
+            beat = self._beat
+            if time.perf_counter() - beat < threshold:
+                continue
+            # stalled: sample the GUI thread until the heartbeat comes back
+            samples: Counter = Counter()
+            stacks: Dict[str, List[str]] = {}
+            while self._beat == beat and not self._stop.is_set():
+                captured = self._capture()
+                if captured is not None:
+                    site, stack = captured
+                    samples[site] += 1
+                    stacks.setdefault(site, stack)
+                self._stop.wait(poll)
+            if samples:
+                duration_ms = ((self._beat if self._beat != beat else time.perf_counter()) - beat) * 1000
+                site = samples.most_common(1)[0][0]
+                self._record(site, stacks[site], duration_ms)
+
+    def _capture(self) -> Optional[Tuple[str, List[str]]]:
+        frame = sys._current_frames().get(self._gui_ident)
+        if frame is None:
+            return None
+        stack, site = [], None
+        while frame is not None:
+            code = frame.f_code
+            label = f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}"
+            stack.append(label)
+            if site is None and not os.path.normcase(code.co_filename).startswith(_LIBRARY_PATHS):
+                site = label
+            frame = frame.f_back
+        return site or stack[0], stack
+
+    def _record(self, site: str, stack: List[str], duration_ms: float) -> None:
+        with self._lock:
+            stats = self._sites.get(site)
+            if stats is None:
+                stats = self._sites[site] = StallSite(site, stack=stack)
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+        self._logger.warning("GUI thread stalled for %.0f ms at %s", duration_ms, site)
@@ -0,0 +1,151 @@
+"""
+startup.py
+
+Startup timeline: where the time goes between launch and a usable window.
+
+Features:
+- Named (optionally nested) phases recording wall time and process CPU time, plus instant marks
+- Per-phase budgets (milliseconds, loaded from config/startup_budgets.json) with a check that
+  lists every phase over budget; tests use it to catch startup regressions
+- Plain-text report for the log / tester, and a JSON dump for tooling
+
+Design notes:
+- The timeline origin is the import of this module, which happens at the top of
+  common/__init__.py, so phases show their offset from (almost) process start.
+- CPU time is process-wide (time.process_time), so work other threads do during a phase counts;
+  a phase whose CPU time is far below its wall time was waiting (I/O, locks, the backend).
+
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_BUDGETS_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "startup_budgets.json"
+
+# clocks in seconds; module level so tests can substitute deterministic ones
+_wall_clock = time.perf_counter
+_cpu_clock = time.process_time
+
+
+@dataclass
+class Phase:
+    name: str
+    depth: int
+    start_ms: float
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    budget_ms: Optional[float] = None
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget_ms is not None and self.wall_ms > self.budget_ms
+
+
+class StartupTimeline:
+    """Singleton recorder for startup phases.
+
+    Typical usage:
+        timeline = StartupTimeline()
+        with timeline.phase("config"):
+            ...
+        timeline.mark("window shown")
+        print(timeline.report())
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, "_initialized", False):
+            return
+        self._origin = _wall_clock()
+        self._phases: List[Phase] = []
+        self._marks: List[tuple] = []
+        self._depth = threading.local()
+        self._lock = threading.Lock()
+        self.budgets: Dict[str, float] = {}
+        self._initialized = True
+
+    def reset(self) -> None:
+        """Forget recorded phases and restart the clock (budgets are kept)."""
+        with self._lock:
+            self._origin = _wall_clock()
+            self._phases.clear()
+            self._marks.clear()
+
+    def _offset_ms(self, t: float) -> float:
+        return (t - self._origin) * 1000
+
+    # ---------------- recording -----------------
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Phase]:
+        """Time the enclosed block as phase ``name`` (phases may nest)."""
+        depth = getattr(self._depth, "value", 0)
+        wall, cpu = _wall_clock(), _cpu_clock()
+        record = Phase(name, depth, self._offset_ms(wall), budget_ms=self.budgets.get(name))
+        with self._lock:
+            self._phases.append(record)
+        self._depth.value = depth + 1
+        try:
+            yield record
+        finally:
+            self._depth.value = depth
+            record.wall_ms = (_wall_clock() - wall) * 1000
+            record.cpu_ms = (_cpu_clock() - cpu) * 1000
+
+    def mark(self, name: str) -> None:
+        """Record an instant (e.g. "window shown") at the current offset."""
+        with self._lock:
+            self._marks.append((name, self._offset_ms(_wall_clock())))
+
+    def phases(self) -> List[Phase]:
+        with self._lock:
+            return list(self._phases)
+
+    def marks(self) -> List[tuple]:
+        with self._lock:
+            return list(self._marks)
+
+    # ---------------- budgets -----------------
+    def load_budgets(self, path: Optional[str] = None) -> Dict[str, float]:
+        """Load ``{"phase": budget_ms}`` from ``path`` (default config/startup_budgets.json)."""
+        file_path = Path(path) if path else DEFAULT_BUDGETS_PATH
+        if file_path.exists():
+            with open(file_path, "r", encoding="utf-8") as f:
+                self.budgets = {k: float(v) for k, v in json.load(f).items()}
+        for record in self.phases():
+            record.budget_ms = self.budgets.get(record.name)
+        return self.budgets
+
+    def over_budget(self) -> List[Phase]:
+        """Finished phases that took longer than their budget."""
+        return [p for p in self.phases() if p.over_budget]
+
+    # ---------------- output -----------------
+    def report(self) -> str:
+        lines = [f"{'phase':<32} {'start':>9} {'wall':>9} {'cpu':>9} {'budget':>9}"]
+        for p in self.phases():
+            budget = f"{p.budget_ms:.0f}" if p.budget_ms is not None else "-"
+            flag = "  OVER" if p.over_budget else ""
+            lines.append(f"{'  ' * p.depth + p.name:<32} {p.start_ms:>9.1f} {p.wall_ms:>9.1f} {p.cpu_ms:>9.1f} "
+                         f"{budget:>9}{flag}")
+        for name, at in self.marks():
+            lines.append(f"{'@ ' + name:<32} {at:>9.1f}")
+        return "\n".join(lines)
+
+    def as_dict(self) -> dict:
+        return {"phases": [asdict(p) for p in self.phases()],
+                "marks": [{"name": n, "at_ms": at} for n, at in self.marks()]}
+
+    def write_json(self, file_path: str) -> None:
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2)
@@ -0,0 +1,256 @@
+"""
+tracing.py
+
+Lightweight built-in tracing for multi-hop operations (click -> ThreadManager -> backend RPC -> GUI).
+
+Features:
+- Spans with parent/child propagation through contextvars
+- ThreadManager hands the submitting span to run_async / submit_blocking jobs (and records how
+  long each job sat in the queue), Token waits and GUI-thread future deliveries get spans too
+- BackendClient sends the current trace context with each call; BackendServer dispatches the
+  function inside a child span, so both processes share one trace id
+- Export as Chrome trace / Perfetto JSON ("X" complete events, thread names, and flow arrows
+  for parents on another thread)
+
+Design notes:
+- Disabled by default. Every hook first checks ``Tracer().enabled``, so an idle tracer costs one
+  attribute read per call site.
+- Set APP_TRACE=<path.json> to trace a whole session; the file is written at exit.
+- Finished spans are kept in a bounded buffer (oldest dropped first).
+
+"""
+from __future__ import annotations
+
+import atexit
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+_ids = itertools.count(1)
+
+
+class Span:
+    """One timed operation. Use as a context manager (see Tracer.span)."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "parent_tid", "start", "end", "tid",
+                 "thread_name", "attrs", "queued_since", "_tracer", "_reset")
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"] = None,
+                 trace_id: Optional[str] = None, parent_id: Optional[str] = None, attrs: Optional[dict] = None):
+        self._tracer = tracer
+        self.name = name
+        self.span_id = f"{os.getpid():x}-{next(_ids):x}"
+        if parent is not None:
+            self.trace_id, self.parent_id, self.parent_tid = parent.trace_id, parent.span_id, parent.tid
+        else:
+            self.trace_id, self.parent_id, self.parent_tid = trace_id or self.span_id, parent_id, None
+        self.attrs = attrs or {}
+        self.start = 0
+        self.end = 0
+        self.tid = 0
+        self.thread_name = ""
+        # perf_counter_ns() when the work was handed over; recorded as queued_ms on entry
+        self.queued_since: Optional[int] = None
+        self._reset = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attrs[key] = value
+
+    def context(self) -> Dict[str, str]:
+        """Serialisable trace context, to carry the span across a process boundary."""
+        return {"trace_id": self.trace_id, "span_id": self.span_id}
+
+    def __enter__(self) -> "Span":
+        thread = threading.current_thread()
+        self.tid = thread.ident or 0
+        self.thread_name = thread.name
+        self._reset = _current_span.set(self)
+        self.start = time.perf_counter_ns()
+        if self.queued_since is not None:
+            self.attrs["queued_ms"] = round((self.start - self.queued_since) / 1e6, 3)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._reset)
+        self._tracer._record(self)
+
+
+class _NoSpan:
+    """Shared stand-in returned while tracing is disabled."""
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def context(self) -> Optional[Dict[str, str]]:
+        return None
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """Singleton span recorder.
+
+    Typical usage:
+        tracer = Tracer()
+        tracer.enable()
+        with tracer.span("load-project", path=path):
+            ...
+        tracer.export_chrome_trace("trace.json")
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, max_spans: int = 100_000):
+        if getattr(self, "_initialized", False):
+            return
+        self.enabled = False
+        self._spans: deque = deque(maxlen=max_spans)
+        self._origin = time.perf_counter_ns()
+        self._initialized = True
+
+    # ---------------- control -----------------
+    def enable(self, max_spans: Optional[int] = None) -> None:
+        if max_spans is not None:
+            self._spans = deque(self._spans, maxlen=max_spans)
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+    def enable_from_environment(self, variable: str = "APP_TRACE") -> bool:
+        """Enable tracing when ``variable`` names an output file; it is written at exit."""
+        path = os.environ.get(variable)
+        if not path:
+            return False
+        self.enable()
+        atexit.register(self.export_chrome_trace, path)
+        return True
+
+    # ---------------- spans -----------------
+    def span(self, name: str, **attrs) -> Any:
+        """Context manager timing ``name`` as a child of the current span."""
+        if not self.enabled:
+            return _NO_SPAN
+        return Span(self, name, parent=_current_span.get(), attrs=attrs)
+
+    def remote_span(self, name: str, context: Optional[Dict[str, str]], **attrs) -> Any:
+        """Span continuing a trace started in another process (see Span.context)."""
+        if not self.enabled:
+            return _NO_SPAN
+        if not context:
+            return Span(self, name, parent=_current_span.get(), attrs=attrs)
+        return Span(self, name, trace_id=context.get("trace_id"), parent_id=context.get("span_id"), attrs=attrs)
+
+    def child(self, name: str, parent: Optional[Span], queued_since: Optional[int] = None, **attrs) -> Any:
+        """Span under an explicit ``parent``, for work that runs outside the submitting context.
+
+        Args:
+            queued_since: perf_counter_ns() at hand-over; the wait is recorded as ``queued_ms``.
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        span = Span(self, name, parent=parent, attrs=attrs)
+        span.queued_since = queued_since
+        return span
+
+    @staticmethod
+    def current() -> Optional[Span]:
+        return _current_span.get()
+
+    def traced(self, name: Optional[str] = None) -> Callable:
+        """Decorator: run the function inside a span (named after it by default)."""
+        def decorator(func):
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def bind(self, fn: Callable[..., Any], name: str) -> Callable[..., Any]:
+        """Wrap ``fn`` to run later (on another thread) as a child of the *current* span.
+
+        The span records how long the call waited between bind() and its start as ``queued_ms``.
+        Returns ``fn`` unchanged while tracing is disabled.
+        """
+        if not self.enabled:
+            return fn
+        parent = _current_span.get()
+        submitted = time.perf_counter_ns()
+
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with self.child(name, parent, submitted):
+                return fn(*args, **kwargs)
+        return run
+
+    def bind_coroutine(self, coro: Any, name: str) -> Any:
+        """Coroutine counterpart of bind(): the loop does not see the submitting thread's context."""
+        if not self.enabled:
+            return coro
+        return self._traced_coroutine(coro, name, _current_span.get(), time.perf_counter_ns())
+
+    async def _traced_coroutine(self, coro: Any, name: str, parent: Optional[Span], submitted: int) -> Any:
+        with self.child(name, parent, submitted):
+            return await coro
+
+    def _record(self, span: Span) -> None:
+        self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        return list(self._spans)
+
+    # ---------------- export -----------------
+    def chrome_trace_events(self) -> Iterator[Dict[str, Any]]:
+        """Finished spans as Chrome trace events (timestamps in microseconds)."""
+        pid = os.getpid()
+        threads: Dict[int, str] = {}
+        for span in self.spans():
+            threads.setdefault(span.tid, span.thread_name)
+            ts = (span.start - self._origin) / 1000
+            args = {"trace_id": span.trace_id, "span_id": span.span_id, **span.attrs}
+            if span.parent_id:
+                args["parent_id"] = span.parent_id
+            yield {"name": span.name, "ph": "X", "ts": ts, "dur": (span.end - span.start) / 1000,
+                   "pid": pid, "tid": span.tid, "args": args}
+            if span.parent_tid is not None and span.parent_tid != span.tid:
+                # flow arrow from the parent's thread to where the child started
+                yield {"name": span.name, "ph": "s", "id": span.span_id, "cat": "flow", "ts": ts,
+                       "pid": pid, "tid": span.parent_tid}
+                yield {"name": span.name, "ph": "f", "bp": "e", "id": span.span_id, "cat": "flow", "ts": ts,
+                       "pid": pid, "tid": span.tid}
+        for tid, thread_name in threads.items():
+            yield {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+
+    def export_chrome_trace(self, file_path: str) -> int:
+        """Write a Chrome trace / Perfetto JSON file. Returns the number of spans written."""
+        events = list(self.chrome_trace_events())
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return sum(1 for e in events if e["ph"] == "X")
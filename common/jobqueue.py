@@ -0,0 +1,323 @@
+"""
+jobqueue.py
+
+Durable background job queue on top of the ThreadManager.
+
+Features:
+- Jobs are stored in a small SQLite database in the local app-data directory, so they
+  survive restarts and crashes
+- At-least-once execution: a job is only removed once its handler returned; jobs that were
+  running when the app exited are picked up again on the next start
+- Retries with exponential backoff (and jitter) up to a per-job attempt limit; jobs that keep
+  failing are kept as "failed" for inspection / retry_failed()
+- Optional idempotency key so enqueueing the same logical job twice keeps a single row
+- Plugs into ThreadManager.shutdown(policy="persist"): queued calls to registered handlers are
+  stored instead of dropped
+
+Design notes:
+- Jobs are referenced by handler *name* (see register()), never by pickled callables, so the
+  database stays readable and handlers can move between modules. Arguments must be JSON.
+- Handlers must be idempotent. They run on the ThreadManager pool as abandonable jobs: shutting
+  down never waits for them, an interrupted job simply runs again next time.
+- The queue only wakes up when a job is due (one timer on the ThreadManager loop), it never polls.
+- The database is opened on first use, so creating the queue during startup costs nothing.
+
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from PySide6.QtCore import QStandardPaths
+
+from common.logger import Logger
+from common.threadmanager import PendingJob, ThreadManager
+
+logger = Logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    args TEXT NOT NULL,
+    key TEXT UNIQUE,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_at REAL NOT NULL,
+    created REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_due ON jobs (state, run_at);
+"""
+
+
+def default_path(app_name: str = "Python-Desktop-Application") -> Path:
+    """Location of the job database inside the per-user app-data directory."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    return Path(base or Path.home()) / app_name / "jobs.sqlite3"
+
+
+class JobQueue:
+    """Persistent queue of deferrable, idempotent background jobs.
+
+    Typical usage:
+        jobs = JobQueue(Threadmanager)
+        jobs.register("upload-logs", upload_logs)
+        jobs.start(delay=5)                       # resume leftovers once startup is done
+        jobs.enqueue("upload-logs", ("session.log",), key="upload:session.log")
+    """
+
+    def __init__(self, Threadmanager: ThreadManager, path: Optional[str] = None, *, concurrency: int = 1,
+                 max_attempts: int = 5, base_delay: float = 2.0, max_delay: float = 600.0):
+        """Set up the queue; the database is opened (or created) on first use. Call start() to begin running jobs.
+
+        Args:
+            Threadmanager: the ThreadManager whose loop and pool run the jobs.
+            path: database file; defaults to default_path().
+            concurrency: how many jobs may run at the same time.
+            max_attempts: default attempt limit for enqueued jobs.
+            base_delay / max_delay: retry backoff in seconds (doubles per failed attempt).
+        """
+        self._Threadmanager = Threadmanager
+        self.path = Path(path) if path else default_path()
+        self._concurrency = max(1, concurrency)
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+
+        self._handlers: Dict[str, Callable[..., Any]] = {}
+        self._names: Dict[Callable[..., Any], str] = {}
+        self._running: Set[concurrent.futures.Future] = set()
+        self._started = False
+        self._timer = None
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._closed = False
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.executescript(_SCHEMA)
+                logger.debug("Job queue opened at %s", self.path)
+            return self._conn
+
+    # ---------------- handlers -----------------
+    def register(self, name: str, handler: Callable[..., Any]) -> None:
+        """Register the blocking callable that runs jobs called ``name``.
+
+        If the handler declares a ``cancel_token`` parameter it receives the job's CancelToken.
+        """
+        with self._lock:
+            self._handlers[name] = handler
+            self._names[handler] = name
+        self._wake()
+
+    # ---------------- queueing -----------------
+    def enqueue(self, name: str, args: tuple = (), kwargs: Optional[dict] = None, *, delay: float = 0.0,
+                key: Optional[str] = None, max_attempts: Optional[int] = None) -> int:
+        """Store a job and return its id.
+
+        Args:
+            name: registered handler name (jobs for unknown names wait until one is registered).
+            args / kwargs: JSON-serialisable arguments for the handler.
+            delay: seconds from now before the job may run.
+            key: idempotency key; while a job with the same key is queued no new row is added
+                and the existing id is returned. A failed job with the key is queued again
+                with a fresh set of attempts.
+            max_attempts: attempt limit, defaults to the queue's.
+        """
+        payload = json.dumps({"args": list(args), "kwargs": kwargs or {}})
+        now = time.time()
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO jobs (name, args, key, max_attempts, run_at, created) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET name = excluded.name, args = excluded.args, state = 'pending', "
+                "attempts = 0, max_attempts = excluded.max_attempts, run_at = excluded.run_at, last_error = NULL "
+                "WHERE state = 'failed'",
+                (name, payload, key, max_attempts or self._max_attempts, now + delay, now))
+            if key is None:
+                job_id = cur.lastrowid
+            else:
+                job_id = self._db.execute("SELECT id FROM jobs WHERE key = ?", (key,)).fetchone()[0]
+        logger.debug("Job %s queued (%s, delay=%s)", job_id, name, delay)
+        self._wake()
+        return job_id
+
+    def persist_pending(self, jobs: List[PendingJob]) -> None:
+        """ThreadManager persist handler: store queued calls to registered handlers.
+
+        Install with ``Threadmanager.set_persist_handler(queue.persist_pending)``; jobs for other
+        callables, or with arguments that are not JSON, are logged and dropped.
+        """
+        for job in jobs:
+            name = self._names.get(job.fn)
+            if name is None:
+                logger.warning("Cannot persist job %r: no handler registered for it", job.fn)
+                continue
+            try:
+                self.enqueue(name, job.args, job.kwargs)
+            except TypeError as ex:
+                logger.warning("Cannot persist job %r: %s", name, ex)
+
+    def pending(self) -> int:
+        """Number of jobs waiting or running."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM jobs WHERE state != 'failed'").fetchone()[0]
+
+    def failed(self) -> List[Dict[str, Any]]:
+        """Jobs that used up all their attempts, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, name, args, attempts, last_error FROM jobs WHERE state = 'failed' ORDER BY id").fetchall()
+        return [{"id": r[0], "name": r[1], "args": json.loads(r[2]), "attempts": r[3], "error": r[4]} for r in rows]
+
+    def retry_failed(self) -> int:
+        """Give every failed job a fresh set of attempts. Returns how many were re-queued."""
+        with self._lock:
+            count = self._db.execute("UPDATE jobs SET state = 'pending', attempts = 0, run_at = ? "
+                                     "WHERE state = 'failed'", (time.time(),)).rowcount
+        self._wake()
+        return count
+
+    # ---------------- lifecycle -----------------
+    def start(self, delay: float = 0.0) -> None:
+        """Resume jobs left over from the last session and start running due jobs.
+
+        Args:
+            delay: seconds to hold off before the first job, so deferred work does not compete
+                with application startup.
+        """
+        with self._lock:
+            # anything still marked running did not finish last time: at-least-once means run it again
+            resumed = self._db.execute("UPDATE jobs SET state = 'pending' WHERE state = 'running'").rowcount
+            self._started = True
+        if resumed:
+            logger.info("Resuming %s interrupted background job(s)", resumed)
+        self._arm(delay)
+
+    def close(self) -> None:
+        """Stop picking up jobs and close the database.
+
+        Running jobs are asked to stop through their cancel_token and run again on the next start.
+        """
+        with self._lock:
+            self._started = False
+            timer, self._timer = self._timer, None
+            running, self._running = self._running, set()
+            self._closed = True
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        for fut in running:
+            fut.cancel_token.cancel("job queue closed")
+        if timer is not None:
+            self._loop_call(timer.cancel)
+
+    # ---------------- internals -----------------
+    def _wake(self) -> None:
+        if self._started:
+            self._arm(0.0)
+
+    def _arm(self, delay: float) -> None:
+        self._loop_call(self._arm_on_loop, delay)
+
+    def _arm_on_loop(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._started:
+            return
+        loop = self._Threadmanager._loop
+        self._timer = loop.call_later(max(0.0, delay), self._pump) if loop is not None else None
+
+    def _loop_call(self, fn: Callable[..., Any], *args) -> None:
+        loop = self._Threadmanager._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(fn, *args)
+
+    def _pump(self) -> None:
+        # on the loop: claiming touches the database, so hand it to the pool
+        self._timer = None
+        try:
+            self._Threadmanager.submit_cancellable(self._claim, abandonable=True)
+        except RuntimeError:
+            pass  # shutting down
+
+    def _claim(self) -> None:
+        now = time.time()
+        with self._lock:
+            if not self._started or not self._handlers:
+                return
+            names = list(self._handlers)
+            marks = ",".join("?" * len(names))
+            free = self._concurrency - len(self._running)
+            rows = []
+            if free > 0:
+                rows = self._db.execute(
+                    f"SELECT id, name, args, attempts, max_attempts FROM jobs WHERE state = 'pending' "
+                    f"AND run_at <= ? AND name IN ({marks}) ORDER BY run_at LIMIT ?", (now, *names, free)).fetchall()
+                for row in rows:
+                    self._db.execute("UPDATE jobs SET state = 'running', attempts = attempts + 1 WHERE id = ?",
+                                     (row[0],))
+            next_due = self._db.execute(
+                f"SELECT MIN(run_at) FROM jobs WHERE state = 'pending' AND name IN ({marks})", names).fetchone()[0]
+            # submitted under the lock so a concurrent close() sees every running job
+            for row in rows:
+                fut = self._Threadmanager.submit_cancellable(self._execute, (row,), abandonable=True)
+                self._running.add(fut)
+                fut.add_done_callback(self._job_done)
+            idle = len(self._running) < self._concurrency
+
+        if next_due is not None and idle:
+            self._arm(next_due - time.time())
+
+    def _execute(self, row: tuple, cancel_token) -> None:
+        job_id, name, payload, attempts, max_attempts = row
+        attempt = attempts + 1
+        call = json.loads(payload)
+        kwargs = dict(call["kwargs"])
+        handler = self._handlers[name]
+        if ThreadManager._accepts_cancel_token(handler):
+            kwargs["cancel_token"] = cancel_token
+        try:
+            handler(*call["args"], **kwargs)
+        except Exception as ex:
+            self._failed(job_id, name, attempt, max_attempts, ex)
+        else:
+            with self._lock:
+                if self._started:
+                    self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            logger.debug("Job %s (%s) done", job_id, name)
+
+    def _job_done(self, fut: concurrent.futures.Future) -> None:
+        with self._lock:
+            self._running.discard(fut)
+        self._wake()
+
+    def _failed(self, job_id: int, name: str, attempt: int, max_attempts: int, ex: Exception) -> None:
+        error = f"{type(ex).__name__}: {ex}"
+        with self._lock:
+            if not self._started:
+                return
+            if attempt >= max_attempts:
+                self._db.execute("UPDATE jobs SET state = 'failed', last_error = ? WHERE id = ?", (error, job_id))
+                logger.error("Job %s (%s) failed after %s attempt(s): %s", job_id, name, attempt, error)
+                return
+            backoff = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+            backoff *= random.uniform(0.5, 1.0)
+            self._db.execute("UPDATE jobs SET state = 'pending', run_at = ?, last_error = ? WHERE id = ?",
+                             (time.time() + backoff, error, job_id))
+        logger.warning("Job %s (%s) attempt %s failed, retrying in %.1fs: %s", job_id, name, attempt, backoff, error)
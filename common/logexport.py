@@ -0,0 +1,240 @@
+"""
+logexport.py
+
+Streaming export of the application log (spilled segments + in-memory ring).
+
+Features:
+- Streams chunk by chunk: memory use does not depend on how much is exported
+- Time range (start <= time < end) and level range (min_level .. max_level) selection
+- Plain text (the UI line format) or JSON Lines (one object per record)
+- gzip or zstd output, picked from the file name (``.gz`` / ``.zst``) or given explicitly
+- Progress as a percentage, cooperative cancellation, and an atomic result: the file only
+  appears once the export finished (a cancelled or failed export leaves nothing behind)
+- start_export() runs it on a Threadmanager worker, so the GUI never waits for the disk
+
+Design notes:
+- Spilled segments only keep the text line, so their records are parsed back
+  ("dd-mm-YYYY HH:MM:SS | LEVEL | message"); their time has one-second resolution and, in
+  JSON Lines, they carry no thread / logger name / extras.
+- zstd uses the standard library's ``compression.zstd`` (Python 3.14+) or the optional
+  ``zstandard`` package; without either, a zstd export raises RuntimeError.
+- Progress weighs segments by bytes read and in-memory records by count.
+
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import gzip
+import io
+import json
+import logging
+import os
+import time
+from typing import IO, Any, Callable, Iterator, List, Optional, Tuple
+
+from common.logstore import LogStore
+
+FORMATS = ("text", "jsonl")
+COMPRESSIONS = (None, "gzip", "zstd")
+_LINE_TIME_FORMAT = "%d-%m-%Y %H:%M:%S"
+
+
+class ExportCancelled(Exception):
+    """Raised by export_logs when its cancel token fired; no output file is left behind."""
+
+
+def guess_options(path: str) -> Tuple[str, Optional[str]]:
+    """(format, compression) implied by a file name, e.g. ``app.jsonl.gz`` -> ("jsonl", "gzip")."""
+    name = path.lower()
+    compression = None
+    if name.endswith(".gz"):
+        compression, name = "gzip", name[:-3]
+    elif name.endswith(".zst"):
+        compression, name = "zstd", name[:-4]
+    return ("jsonl" if name.endswith((".jsonl", ".ndjson")) else "text"), compression
+
+
+def export_logs(store: LogStore, path: str, *, start: Optional[float] = None, end: Optional[float] = None,
+                min_level: Optional[int] = None, max_level: Optional[int] = None,
+                fmt: Optional[str] = None, compression: Optional[str] = "auto",
+                progress: Optional[Callable[[int], None]] = None, cancel_token=None,
+                chunk: int = 1000) -> int:
+    """Write the selected records of ``store`` to ``path``, oldest first. Returns records written.
+
+    Args:
+        start / end: time range (epoch seconds), ``start <= time < end``; None leaves it open.
+        min_level / max_level: level range, inclusive; None leaves it open.
+        fmt: "text" or "jsonl"; None picks it from the file name.
+        compression: None, "gzip" or "zstd"; "auto" picks it from the file name.
+        progress: optional ``progress(percent)`` callback, called from the exporting thread.
+        cancel_token: optional CancelToken (Threadmanager.submit_cancellable passes one).
+    """
+    fmt, compression = _resolve_options(path, fmt, compression)
+    segments = store.spill_segments()
+    # ring records are weighed like an average segment line (~100 bytes)
+    tracker = _Progress(sum(_size(segment) for segment in segments) + len(store) * 100, progress)
+
+    tmp_path = f"{path}.part"
+    written = 0
+    try:
+        with _open_output(tmp_path, compression) as out:
+            for text, count, units in _formatted_chunks(store, segments, (start, end, min_level, max_level),
+                                                        fmt, chunk):
+                if cancel_token is not None and cancel_token.cancelled:
+                    raise ExportCancelled(f"export to {path} cancelled")
+                if count:
+                    out.write(text)
+                    written += count
+                tracker.advance(units)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    tracker.finish()
+    return written
+
+
+def start_export(threader, store: LogStore, path: str, **options) -> concurrent.futures.Future:
+    """Run export_logs on a Threadmanager worker. Returns its future (cancel via ``future.cancel_token``).
+
+    Example:
+        fut = start_export(AppCntxt.threader, AppCntxt.logger.logs, "session.jsonl.gz",
+                           min_level=logging.WARNING, progress=progress_changed.emit)
+        AppCntxt.threader.watch(fut, lambda f: print(f.result(), "records exported"))
+    """
+    def _run(cancel_token=None) -> int:
+        return export_logs(store, path, cancel_token=cancel_token, **options)
+
+    return threader.submit_cancellable(_run, abandonable=True)
+
+
+# ---------------- internals -----------------
+class _Progress:
+    """Turns units of work done into ``callback(percent)`` calls, once per percent."""
+
+    def __init__(self, total: int, callback: Optional[Callable[[int], None]]):
+        self.total = max(1, total)
+        self.callback = callback
+        self.done = 0
+        self.reported = -1
+
+    def advance(self, units: int) -> None:
+        self.done += units
+        percent = min(100, self.done * 100 // self.total)
+        if self.callback is not None and percent != self.reported:
+            self.reported = percent
+            self.callback(percent)
+
+    def finish(self) -> None:
+        if self.callback is not None and self.reported != 100:
+            self.callback(100)
+
+
+def _resolve_options(path: str, fmt: Optional[str], compression: Optional[str]) -> Tuple[str, Optional[str]]:
+    guessed_fmt, guessed_compression = guess_options(path)
+    fmt = fmt or guessed_fmt
+    if compression == "auto":
+        compression = guessed_compression
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"unknown compression {compression!r}")
+    return fmt, compression
+
+
+def _formatted_chunks(store: LogStore, segments: List, selection: tuple, fmt: str,
+                      chunk: int) -> Iterator[Tuple[str, int, int]]:
+    """(text, records, progress units) per chunk: the spilled segments first, then the ring."""
+    for segment in segments:
+        for lines, read in _segment_chunks(segment, chunk):
+            records = [r for r in (_parse_line(line) for line in lines) if _selected(r[0], r[1], *selection)]
+            yield "".join(_format_parsed(r, fmt) for r in records), len(records), read
+    for records in store.iter_chunks(*selection, chunk):
+        text = "".join(_format_record(created, record, fmt) for created, record in records)
+        yield text, len(records), len(records) * 100
+
+
+def _size(path) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _open_output(path: str, compression: Optional[str]) -> IO[str]:
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    if compression == "zstd":
+        try:
+            from compression import zstd
+            return zstd.open(path, "wt", encoding="utf-8")
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd export needs Python 3.14+ or the 'zstandard' package") from None
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(path, "wb")), encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def _segment_chunks(segment, chunk: int) -> Iterator[Tuple[List[str], int]]:
+    """Lines of a segment file in chunks, with the bytes each chunk took."""
+    try:
+        f = open(segment, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return      # rotated away meanwhile
+    with f:
+        while True:
+            lines = [line for line in (f.readline() for _ in range(chunk)) if line]
+            if not lines:
+                return
+            yield lines, sum(len(line) for line in lines)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_stamp(stamp: str) -> float:
+    # consecutive lines mostly share their second, so most lookups hit the cache
+    try:
+        return time.mktime(time.strptime(stamp, _LINE_TIME_FORMAT))
+    except ValueError:
+        return 0.0
+
+
+def _parse_line(line: str) -> Tuple[float, int, str, str, str]:
+    """(time, levelno, level_name, message, line) of a spilled line."""
+    line = line.rstrip("\n")
+    parts = line.split(" | ", 2)
+    if len(parts) < 3:
+        return 0.0, logging.NOTSET, "", line, line
+    stamp, level_name, message = parts
+    levelno = logging.getLevelName(level_name)
+    return _parse_stamp(stamp), levelno if isinstance(levelno, int) else logging.NOTSET, level_name, message, line
+
+
+def _selected(created: float, levelno: int, start, end, min_level, max_level) -> bool:
+    if (start is not None and created < start) or (end is not None and created >= end):
+        return False
+    return (min_level is None or levelno >= min_level) and (max_level is None or levelno <= max_level)
+
+
+def _format_parsed(parsed: Tuple[float, int, str, str, str], fmt: str) -> str:
+    created, levelno, level_name, message, line = parsed
+    if fmt == "text":
+        return line + "\n"
+    return json.dumps({"created": created, "level": levelno, "level_name": level_name,
+                       "message": message}, ensure_ascii=False) + "\n"
+
+
+def _format_record(created: float, record: Any, fmt: str) -> str:
+    if fmt == "text":
+        return f"{record}\n"
+    if hasattr(record, "to_dict"):
+        fields = record.to_dict()
+    else:
+        fields = {"created": created, "level": getattr(record, "levelno", logging.NOTSET), "message": str(record)}
+    return json.dumps(fields, ensure_ascii=False, default=repr) + "\n"
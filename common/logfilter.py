@@ -0,0 +1,146 @@
+"""
+logfilter.py
+
+Deduplication and per-call-site rate limiting for the Logger.
+
+Features:
+- Dedup: the first occurrence of a message is logged, identical repeats (same level, message
+  and args) within ``window`` seconds are held back and then logged once as "message (x N)"
+- Rate limit: every call site (file + line) has a token bucket of ``burst`` lines refilled at
+  ``rate`` lines per second; lines over budget are dropped and the site's next admitted line
+  says how many were ("message (+N suppressed)")
+- Counters: total suppressed lines, per call site, for diagnostics
+
+Design notes:
+- Summaries are produced lazily: the Logger asks for due summaries on its next call (at most
+  every ``window / 4`` seconds) and on flush(), so no timer or thread is needed.
+- Tracked messages are bounded by ``max_keys``; beyond that the oldest ones are summarised early.
+- One lock; a check is a few dict operations.
+
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Tuple
+
+Site = Tuple[str, int]
+
+
+class _Repeat:
+    __slots__ = ("first", "count", "levelno", "level_name", "message")
+
+    def __init__(self, first: float, levelno: int, level_name: str, message: str):
+        self.first = first
+        self.count = 0
+        self.levelno = levelno
+        self.level_name = level_name
+        self.message = message
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "dropped")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+        self.dropped = 0
+
+
+class LogThrottle:
+    """Decides which log lines pass; see the module docstring.
+
+    Typical usage (the Logger does this for every call):
+        throttle = LogThrottle(window=5.0, rate=20.0, burst=100)
+        verdict = throttle.admit(site, levelno, level_name, key, message)
+        if verdict is None: drop the line
+        for levelno, level_name, text in throttle.due(): log the summary
+    """
+
+    def __init__(self, window: float = 5.0, rate: Optional[float] = 20.0, burst: int = 100,
+                 max_keys: int = 1000):
+        """
+        Args:
+            window: seconds in which identical messages are collapsed (0 disables dedup).
+            rate: lines per second refilled into each call site's bucket (None disables it).
+            burst: bucket size, i.e. lines a call site may log back to back.
+            max_keys: messages tracked for dedup at once.
+        """
+        self.window = window
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.suppressed = 0
+        self._repeats: Dict[Hashable, _Repeat] = {}
+        self._buckets: Dict[Site, _Bucket] = {}
+        self._suppressed_by_site: Counter = Counter()
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def admit(self, site: Site, levelno: int, level_name: str, key: Hashable, message,
+              now: Optional[float] = None) -> Optional[int]:
+        """Whether a line may be logged: None to drop it, else the number of lines this call site
+        dropped since its last admitted one (to be mentioned in the line).
+
+        ``message`` may be a callable producing the text; it is only called for a line that
+        starts a dedup window.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.window > 0:
+                repeat = self._repeats.get(key)
+                if repeat is not None and now - repeat.first < self.window:
+                    repeat.count += 1
+                    self._suppress(site)
+                    return None
+            if self.rate is not None:
+                bucket = self._buckets.get(site)
+                if bucket is None:
+                    bucket = self._buckets[site] = _Bucket(self.burst, now)
+                else:
+                    bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+                    bucket.updated = now
+                if bucket.tokens < 1:
+                    bucket.dropped += 1
+                    self._suppress(site)
+                    return None
+                bucket.tokens -= 1
+                dropped, bucket.dropped = bucket.dropped, 0
+            else:
+                dropped = 0
+            if self.window > 0:
+                if len(self._repeats) >= self.max_keys:
+                    self._next_sweep = 0.0
+                self._repeats[key] = _Repeat(now, levelno, level_name, message() if callable(message) else message)
+            return dropped
+
+    def due(self, now: Optional[float] = None, force: bool = False) -> List[Tuple[int, str, str]]:
+        """Summaries of finished dedup windows as (levelno, level_name, "message (x N)").
+
+        Cheap to call often: it only looks at the tracked messages every ``window / 4`` seconds
+        (always with ``force``, which also ends every open window).
+        """
+        now = time.monotonic() if now is None else now
+        if not force and now < self._next_sweep:
+            return []
+        summaries = []
+        with self._lock:
+            self._next_sweep = now + self.window / 4
+            crowded = len(self._repeats) >= self.max_keys
+            for key, repeat in list(self._repeats.items()):
+                if force or crowded or now - repeat.first >= self.window:
+                    del self._repeats[key]
+                    if repeat.count:
+                        summaries.append((repeat.levelno, repeat.level_name, f"{repeat.message} (x {repeat.count + 1})"))
+                    crowded = crowded and len(self._repeats) >= self.max_keys // 2
+        return summaries
+
+    def suppressed_by_site(self) -> Dict[Site, int]:
+        """Suppressed lines per call site (file, line)."""
+        with self._lock:
+            return dict(self._suppressed_by_site)
+
+    def _suppress(self, site: Site) -> None:
+        self.suppressed += 1
+        self._suppressed_by_site[site] += 1
@@ -1,8 +1,21 @@
+import atexit
 import logging
+import logging.handlers
 import functools
-from datetime import datetime
-from queue import Queue
-from PySide6.QtCore import QObject, Signal
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from typing import Optional
+from PySide6.QtCore import QMetaMethod, QObject, Qt, QTimer, Signal
+
+from common.logexport import export_logs
+from common.logfilter import LogThrottle
+from common.logjournal import JournalHandler, LogJournal, read_tail
+from common.logstore import DEFAULT_CAPACITY, LogStore
 
 
 class ColouredConsoleHandler(logging.StreamHandler):
@@ -23,24 +36,171 @@ class ColouredConsoleHandler(logging.StreamHandler):
         return f"{color}{base}{reset}"
 
 
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the background writer as they are; formatting happens on the writer thread."""
+
+    def prepare(self, record):
+        return record
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """Background writer: drains the queue in batches and writes each batch to every sink.
+
+    Plain stream sinks (the console) get one write and one flush per batch; other handlers
+    (rotating files, custom sinks) handle the batch record by record.
+    """
+
+    def __init__(self, log_queue, *handlers, batch_size: int = 256):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def _monitor(self):
+        stop = False
+        while not stop:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            records = []
+            for item in batch:
+                if item is self._sentinel:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    # flush() marker: everything queued before it is written first
+                    self.handle_batch(records)
+                    records = []
+                    item.set()
+                else:
+                    records.append(item)
+            self.handle_batch(records)
+
+    def handle_batch(self, records):
+        if not records:
+            return
+        for handler in self.handlers:
+            selected = [r for r in records if r.levelno >= handler.level]
+            if not isinstance(handler, JournalHandler):
+                # merged records (see Logger.merge_records) were written out by the process that logged them
+                selected = [r for r in selected if not getattr(r, "merged", False)]
+            if not selected:
+                continue
+            if type(handler) in (logging.StreamHandler, ColouredConsoleHandler):
+                selected = [r for r in selected if handler.filter(r)]
+                try:
+                    text = "".join(handler.format(r) + handler.terminator for r in selected)
+                    with handler.lock:
+                        handler.stream.write(text)
+                        handler.flush()
+                except Exception:
+                    handler.handleError(selected[-1])
+            else:
+                for record in selected:
+                    handler.handle(record)
+
+
+def _format_message(msg, args: tuple) -> str:
+    """``msg`` with its %-args applied (like logging.LogRecord.getMessage)."""
+    msg = str(msg)
+    if args:
+        try:
+            msg = msg % args
+        except (TypeError, ValueError):
+            msg = f"{msg} {args!r}"
+    return msg
+
+
+class LogEntry:
+    """One stored log record; the message and the display line are only formatted when read.
+
+    Fields: ``created`` (epoch seconds), ``levelno`` / ``level_name``, ``name`` (logger name),
+    ``thread`` (name of the thread that logged), ``msg`` + ``args`` (see ``message``) and
+    ``extras`` (the ``extra=`` dict of the call, or None).
+
+    str(entry) is the line shown in the UI and written on export
+    ("dd-mm-YYYY HH:MM:SS | LEVEL | message"). ``in``, ``==`` and hash() work on that line, so an entry
+    can be used wherever the formatted string used to be.
+    """
+    __slots__ = ("created", "levelno", "level_name", "name", "thread", "msg", "args", "extras", "_line")
+
+    def __init__(self, levelno: int, level_name: str, msg, args: tuple, name: str = "",
+                 extras: Optional[dict] = None):
+        self.created = time.time()
+        self.levelno = levelno
+        self.level_name = level_name
+        self.name = name
+        self.thread = threading.current_thread().name
+        self.msg = msg
+        self.args = args
+        self.extras = extras
+        self._line = None
+
+    @property
+    def message(self) -> str:
+        """The message with its %-args applied (like logging.LogRecord.getMessage)."""
+        return _format_message(self.msg, self.args)
+
+    def __str__(self) -> str:
+        if self._line is None:
+            timestamp = time.strftime("%d-%m-%Y %H:%M:%S", time.localtime(self.created))
+            self._line = f"{timestamp} | {self.level_name} | {self.message}"
+        return self._line
+
+    def __repr__(self) -> str:
+        return f"LogEntry({str(self)!r})"
+
+    def to_dict(self) -> dict:
+        """The record's fields as plain values (e.g. for JSON)."""
+        return {"created": self.created, "level": self.levelno, "level_name": self.level_name,
+                "name": self.name, "thread": self.thread, "message": self.message,
+                "extras": self.extras}
+
+    @classmethod
+    def from_dict(cls, fields: dict) -> "LogEntry":
+        """Rebuild an entry from to_dict() output (e.g. a record received from another process)."""
+        levelno = int(fields.get("level", logging.NOTSET))
+        entry = cls(levelno, fields.get("level_name") or logging.getLevelName(levelno), fields.get("message", ""),
+                    (), fields.get("name", ""), fields.get("extras"))
+        entry.created = float(fields.get("created", entry.created))
+        entry.thread = fields.get("thread", "")
+        return entry
+
+    def __contains__(self, text) -> bool:
+        return str(text) in str(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (LogEntry, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+
 class Logger(QObject):
-    """Singleton Qt Logger with queue-based storage, coloured console output, and export feature."""
+    """Singleton Qt Logger with bounded ring-buffer storage, coloured console output, and export feature."""
     _instance = None
     log_updated = Signal(str)  # Qt signal emitted when a new log entry is added
+    # LogEntry lists, at most one per ``batch_interval_ms``: use this for views, it scales to log storms
+    log_batch = Signal(list)
+    _batch_pending = Signal()
+    MAX_BATCH = 5000  # a batch keeps the newest records only; the full history stays in ``logs``
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, name: str = "Application", level=logging.DEBUG):
+    def __init__(self, name: str = "Application", level=logging.DEBUG, capacity: int = DEFAULT_CAPACITY):
         if getattr(self, "_initialized", False):
             return
 
         super().__init__()
         self.name = name
         self.level = level
-        self.logs = Queue()
+        # newest ``capacity`` lines; see LogStore.enable_spill to keep older ones on disk
+        self.logs = LogStore(capacity)
 
         # Python logging setup
         self._logger = logging.getLogger(name)
@@ -54,72 +214,308 @@ class Logger(QObject):
         )
         console_handler.setFormatter(formatter)
 
-        if not self._logger.handlers:
-            self._logger.addHandler(console_handler)
+        # Records go through a queue to a background writer, so a slow terminal or disk never
+        # blocks the thread that logs. The Python logger (and so the writer) is shared by every
+        # Logger created for ``name``.
+        queue_handler = next((h for h in self._logger.handlers if isinstance(h, _DeferredQueueHandler)), None)
+        if queue_handler is None:
+            queue_handler = _DeferredQueueHandler(queue.SimpleQueue())
+            queue_handler.listener = BatchingQueueListener(queue_handler.queue, console_handler)
+            queue_handler.listener.start()
+            atexit.register(queue_handler.listener.stop)
+            self._logger.addHandler(queue_handler)
+        self._listener: BatchingQueueListener = queue_handler.listener
+
+        # records below this level are stored but not sent through log_updated / log_batch
+        self.emit_level = logging.INFO
+        self._log_updated_method = QMetaMethod.fromSignal(self.log_updated)
+        self._log_batch_method = QMetaMethod.fromSignal(self.log_batch)
+
+        # log_batch: records collect in _batch from any thread; the first one of a batch asks the
+        # GUI thread (queued) to start a single-shot timer that delivers the whole list
+        self.batch_interval_ms = 100
+        self._batch = deque(maxlen=self.MAX_BATCH)
+        self._batch_lock = threading.Lock()
+        self._batch_timer = QTimer(self)
+        self._batch_timer.setSingleShot(True)
+        self._batch_timer.timeout.connect(self._deliver_batch)
+        self._batch_pending.connect(self._arm_batch, Qt.ConnectionType.QueuedConnection)
+
+        # optional dedup / rate limit stage, see set_throttle
+        self._throttle: Optional[LogThrottle] = None
 
         self.set_level(level)
         self._initialized = True
 
     def set_level(self, level):
-        """Sets the logging level for the logger and its handlers."""
+        """Sets the logging level for the logger and its console output.
+
+        Sinks added with add_sink / add_file_sink / add_journal_sink keep their own level.
+        """
         self.level = level
         self._logger.setLevel(level)
         for handler in self._logger.handlers:
             handler.setLevel(level)
+        for handler in self._listener.handlers:
+            if isinstance(handler, ColouredConsoleHandler):
+                handler.setLevel(level)
 
-    def _store_log(self, level_name: str, msg: str):
-        """Store log in queue and emit update signal."""
-        timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
-        formatted = f"{timestamp} | {level_name} | {msg}"
-        self.logs.put(formatted)
+    # ---------------- sinks -----------------
+    def add_sink(self, handler: logging.Handler) -> logging.Handler:
+        """Add a logging handler to the background writer (it runs on the writer thread)."""
+        self._listener.handlers = self._listener.handlers + (handler,)
+        return handler
 
-        self.log_updated.emit(formatted)
-        return formatted
+    def remove_sink(self, handler: logging.Handler) -> None:
+        self._listener.handlers = tuple(h for h in self._listener.handlers if h is not handler)
+        handler.close()
 
-    # Public logging API (unchanged)
+    def add_file_sink(self, file_path: str, max_bytes: int = 5 << 20, backup_count: int = 5,
+                      level: Optional[int] = None) -> logging.Handler:
+        """Also write the log to ``file_path``, rotating it at ``max_bytes`` and keeping ``backup_count`` old files."""
+        handler = logging.handlers.RotatingFileHandler(file_path, maxBytes=max_bytes, backupCount=backup_count,
+                                                       encoding="utf-8", delay=True)
+        handler.setLevel(self.level if level is None else level)
+        handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s"))
+        return self.add_sink(handler)
+
+    def add_journal_sink(self, directory: str, level: Optional[int] = None, **options) -> JournalHandler:
+        """Also append the log to a binary journal in ``directory`` (see logjournal.LogJournal).
+
+        ``handler.journal.previous_sessions()`` lists the journals of earlier sessions.
+        """
+        handler = JournalHandler(LogJournal(directory, **options))
+        handler.setLevel(self.level if level is None else level)
+        return self.add_sink(handler)
+
+    def restore_from_journal(self, paths, count: int = 1000) -> int:
+        """Load the last ``count`` records of a journal into the store.
+
+        ``paths`` is a journal file or the parts of a session, oldest first (e.g. the last item of
+        ``handler.journal.previous_sessions()``).
+        """
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        entries = [LogEntry.from_dict(record._asdict()) for record in read_tail(paths, count)]
+        return self.merge_records(entries, journal=False)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until everything logged so far reached the sinks. Returns False on timeout."""
+        if self._throttle is not None:
+            self._log_summaries(self._throttle.due(force=True))
+        if self._listener._thread is None:
+            return True
+        marker = threading.Event()
+        self._listener.queue.put_nowait(marker)
+        return marker.wait(timeout)
+
+    def set_emit_level(self, level):
+        """Sets the lowest level sent to log_updated / log_batch listeners (INFO by default)."""
+        self.emit_level = level
+
+    def set_throttle(self, throttle: Optional[LogThrottle]):
+        """Deduplicate and rate-limit log calls through ``throttle`` (None turns it off).
+
+        Repeats of a message within the throttle's window are logged once more as
+        "message (x N)"; call sites over their rate lose lines, which the site's next line
+        reports. ``logger.throttle.suppressed`` counts what was held back.
+        """
+        if throttle is None and self._throttle is not None:
+            self._log_summaries(self._throttle.due(force=True))
+        self._throttle = throttle
+
+    @property
+    def throttle(self) -> Optional[LogThrottle]:
+        return self._throttle
+
+    def set_batch_interval(self, ms: int):
+        """Sets how often (at most) log_batch is delivered."""
+        self.batch_interval_ms = ms
+
+    def _store_log(self, levelno: int, level_name: str, msg, args: tuple = (), extras: Optional[dict] = None):
+        """Store the record in the ring buffer and emit update signal.
+
+        Nothing is formatted here: the line is built when a listener or reader needs it.
+        """
+        entry = LogEntry(levelno, level_name, msg, args, self.name, extras)
+        self.logs.put(entry, entry.created)
+        if levelno >= self.emit_level:
+            self._notify(entry)
+        return entry
+
+    def merge_records(self, entries, journal: bool = True) -> int:
+        """Add records from another process (e.g. BackendLogCollector) at their place in time.
+
+        They are stored and shown like local records and, unless ``journal`` is False, appended
+        to the journal sinks; they are not written to the console or file sinks again. Returns
+        the number merged.
+        """
+        entries = list(entries)
+        merged = self.logs.merge((entry.created, entry) for entry in entries)
+        if journal and any(isinstance(handler, JournalHandler) for handler in self._listener.handlers):
+            for entry in entries:
+                self._listener.queue.put_nowait(logging.makeLogRecord(
+                    {"name": entry.name, "levelno": entry.levelno, "levelname": entry.level_name,
+                     "msg": entry.message, "created": entry.created, "threadName": entry.thread, "merged": True}))
+        for entry in entries:
+            if entry.levelno >= self.emit_level:
+                self._notify(entry)
+        return merged
+
+    def _notify(self, entry: LogEntry):
+        if self.isSignalConnected(self._log_batch_method):
+            with self._batch_lock:
+                first = not self._batch
+                self._batch.append(entry)
+            if first:
+                self._batch_pending.emit()
+        if self.isSignalConnected(self._log_updated_method):
+            self.log_updated.emit(str(entry))
+
+    def _admit(self, levelno: int, level_name: str, msg, args: tuple, stacklevel: int = 1):
+        """Run a call through the throttle: None drops it, else the (msg, args) to log."""
+        throttle = self._throttle
+        self._log_summaries(throttle.due())
+        frame = sys._getframe(stacklevel + 1)
+        site = (frame.f_code.co_filename, frame.f_lineno)
+        key = (levelno, msg, args)
+        try:
+            hash(key)
+        except TypeError:
+            key = (levelno, str(msg), repr(args))
+        dropped = throttle.admit(site, levelno, level_name, key, lambda: _format_message(msg, args))
+        if dropped is None:
+            return None
+        if dropped:
+            return "%s (+%d suppressed)", (_format_message(msg, args), dropped)
+        return msg, args
+
+    def _log_summaries(self, summaries):
+        for levelno, level_name, text in summaries:
+            self._store_log(levelno, level_name, "%s", (text,))
+            self._logger.log(levelno, "%s", text)
+
+    def _arm_batch(self):
+        if not self._batch_timer.isActive():
+            self._batch_timer.start(self.batch_interval_ms)
+
+    def _deliver_batch(self):
+        with self._batch_lock:
+            batch = list(self._batch)
+            self._batch.clear()
+        if batch:
+            self.log_batch.emit(batch)
+
+    # Public logging API. Each call checks the level first, so a disabled level costs one
+    # comparison; it returns the stored LogEntry (None when the level is disabled or the
+    # throttle held the line back).
     def debug(self, msg, *args, **kwargs):
-        formatted = self._store_log("DEBUG", msg)
-        self._logger.debug(msg, *args, **kwargs)
-        return formatted
+        if logging.DEBUG < self.level:
+            return None
+        return self._log(logging.DEBUG, "DEBUG", msg, args, kwargs)
 
     def info(self, msg, *args, **kwargs):
-        formatted = self._store_log("INFO", msg)
-        self._logger.info(msg, *args, **kwargs)
-        return formatted
+        if logging.INFO < self.level:
+            return None
+        return self._log(logging.INFO, "INFO", msg, args, kwargs)
 
     def warning(self, msg, *args, **kwargs):
-        formatted = self._store_log("WARNING", msg)
-        self._logger.warning(msg, *args, **kwargs)
-        return formatted
+        if logging.WARNING < self.level:
+            return None
+        return self._log(logging.WARNING, "WARNING", msg, args, kwargs)
 
     def error(self, msg, *args, **kwargs):
-        formatted = self._store_log("ERROR", msg)
-        self._logger.error(msg, *args, **kwargs)
-        return formatted
+        if logging.ERROR < self.level:
+            return None
+        return self._log(logging.ERROR, "ERROR", msg, args, kwargs)
 
     def critical(self, msg, *args, **kwargs):
-        formatted = self._store_log("CRITICAL", msg)
-        self._logger.critical(msg, *args, **kwargs)
-        return formatted
+        if logging.CRITICAL < self.level:
+            return None
+        return self._log(logging.CRITICAL, "CRITICAL", msg, args, kwargs)
+
+    def exception(self, msg, *args, exc_info=True, **kwargs):
+        """Logs at ERROR level with the traceback of the exception being handled (use it in an except block)."""
+        if logging.ERROR < self.level:
+            return None
+        return self._log(logging.ERROR, "ERROR", msg, args, dict(kwargs, exc_info=exc_info))
+
+    def _log(self, levelno: int, level_name: str, msg, args: tuple, kwargs: dict):
+        # called from the public methods above: the caller is two frames up
+        stacklevel = kwargs.get("stacklevel", 1) + 1
+        if self._throttle is not None:
+            admitted = self._admit(levelno, level_name, msg, args, stacklevel)
+            if admitted is None:
+                return None
+            msg, args = admitted
+        entry = self._store_log(levelno, level_name, msg, args, kwargs.get("extra"))
+        self._logger.log(levelno, msg, *args, **dict(kwargs, stacklevel=stacklevel + 1))
+        return entry
+
+    def isEnabledFor(self, level) -> bool:
+        """Guard for log calls whose arguments are expensive to build."""
+        return level >= self.level
+
+    def log_function(self, level=logging.DEBUG, sample: int = 1, max_arg_chars: int = 120, timing: bool = True):
+        """Decorator logging calls of the wrapped function as one line: args, result and duration.
+
+        Args:
+            level: level of the call lines.
+            sample: log 1 in ``sample`` calls; the others run the raw function with no overhead
+                beyond a counter.
+            max_arg_chars: each argument / result repr is cut to this many characters.
+            timing: append the call's duration.
+
+        If ``level`` is disabled when the function is decorated (normally at import time), the
+        function is returned unwrapped and costs nothing; enabling the level later does not
+        instrument it. While wrapped, a disabled level is one comparison per call.
+        """
+        sample = max(1, int(sample))
+        log = getattr(self, logging.getLevelName(level).lower(), self.debug)
+
+        def short(value) -> str:
+            text = repr(value)
+            return text if len(text) <= max_arg_chars else text[:max_arg_chars - 3] + "..."
 
-    def log_function(self, level=logging.DEBUG):
         def decorator(func):
+            if level < self.level:
+                return func
+            calls = itertools.count()
+            name = func.__name__
+
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
-                if self._logger.isEnabledFor(level):
-                    arg_list = [repr(a) for a in args] + [f"{k}={v!r}" for k, v in kwargs.items()]
-                    call_msg = f"Calling {func.__name__}({', '.join(arg_list)})"
-                    self.debug(call_msg)
-                result = func(*args, **kwargs)
-                if self._logger.isEnabledFor(level):
-                    self.debug(f"{func.__name__} returned {result!r}")
+                if level < self.level or (sample > 1 and next(calls) % sample):
+                    return func(*args, **kwargs)
+                call = ", ".join([short(a) for a in args] + [f"{k}={short(v)}" for k, v in kwargs.items()])
+                started = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException as exc:
+                    if timing:
+                        log("Calling %s(%s) raised %s [%.3f ms]", name, call, short(exc),
+                            (time.perf_counter() - started) * 1000, stacklevel=2)
+                    else:
+                        log("Calling %s(%s) raised %s", name, call, short(exc), stacklevel=2)
+                    raise
+                if timing:
+                    log("Calling %s(%s) -> %s [%.3f ms]", name, call, short(result),
+                        (time.perf_counter() - started) * 1000, stacklevel=2)
+                else:
+                    log("Calling %s(%s) -> %s", name, call, short(result), stacklevel=2)
                 return result
             return wrapper
 
         return decorator
 
-    def export_to_file(self, file_path: str):
-        items = list(self.logs.queue)
-        with open(file_path, "w", encoding="utf-8") as f:
-            for line in items:
-                f.write(line + "\n")
+    def query(self, **filters):
+        """Stored records matching ``filters`` (see LogStore.query), oldest first."""
+        return self.logs.query(**filters)
+
+    def export_to_file(self, file_path: str, **options):
+        """Write the spilled and in-memory log lines to ``file_path``, oldest first.
+
+        Streams in chunks; ``options`` select a time / level range, JSON Lines and compression
+        (see logexport.export_logs). For large logs on the GUI thread use logexport.start_export.
+        """
+        return export_logs(self.logs, file_path, **options)
@@ -0,0 +1,401 @@
+"""
+logjournal.py
+
+Persistent, append-only binary journal of the application log.
+
+Features:
+- One journal file per session (``journal-<YYYYmmdd-HHMMSS>-<pid>-<part>.bin``) in the app-data
+  directory, the newest ``max_files`` are kept (files of another running instance are never
+  deleted); a session rolls over to a new part at ``max_file_bytes``
+- Length-prefixed, CRC-checked binary records written through mmap: appending is a struct pack
+  and a memory copy, no text formatting
+- Sparse time index (``.idx`` next to each file): every ``index_every``-th record's time and
+  offset, so a reader seeks to a time or to the tail without scanning the file
+- JournalReader: records by time / level range, tail(n) of a journal file, fast iteration for
+  offline tools; read_tail(parts, n) reads across the parts of a session;
+  ``python -m common.logjournal <file> --tail 100`` prints a journal as text
+- JournalHandler: a logging handler, so the Logger's background writer does the appends
+
+Design notes:
+- Record: ``<II`` (payload length, crc32 of payload), then the payload ``<dHHHII`` (time, level,
+  name / thread / message / extras lengths) followed by the UTF-8 strings (extras as JSON).
+- The file grows in ``chunk_bytes`` steps and is trimmed to its used size on close. After a
+  crash it ends in zeros (or a torn record): readers stop at the first record whose length is
+  zero or whose CRC does not match, so everything written before the crash is readable.
+- The index is a plain append-only file of ``<dQ`` (time, offset) pairs; it may lag behind the
+  journal after a crash, readers scan forward from its last entry.
+
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+
+MAGIC = b"PDALOGJ1"
+MAGIC_SIZE = len(MAGIC)
+_FRAME = struct.Struct("<II")
+_FIELDS = struct.Struct("<dHHHII")
+_INDEX = struct.Struct("<dQ")
+_LINE_TIME_FORMAT = "%d-%m-%Y %H:%M:%S"
+
+
+def default_journal_directory(app_name: str = "Python-Desktop-Application") -> Path:
+    """Where journal files go: next to the spilled log segments, in the per-user app-data directory."""
+    from common.logstore import default_spill_directory
+    return default_spill_directory(app_name).parent / "journal"
+
+
+class JournalRecord(NamedTuple):
+    """One journal record; the field names match LogEntry.to_dict()."""
+    created: float
+    level: int
+    level_name: str
+    name: str
+    thread: str
+    message: str
+    extras: Optional[dict]
+
+    def __str__(self) -> str:
+        return f"{time.strftime(_LINE_TIME_FORMAT, time.localtime(self.created))} | {self.level_name} | {self.message}"
+
+
+class LogJournal:
+    """Writer side: appends records to the current session's journal file.
+
+    Typical usage:
+        journal = LogJournal(default_journal_directory())
+        last = journal.previous_sessions()[-1:]   # the parts of the last session, for read_tail
+        journal.append(time.time(), logging.INFO, "Application", "MainThread", "started")
+        journal.close()
+    """
+
+    def __init__(self, directory: str, max_files: int = 10, max_file_bytes: int = 256 << 20,
+                 chunk_bytes: int = 4 << 20, index_every: int = 256):
+        """
+        Args:
+            directory: journal directory (created if needed).
+            max_files: journal files kept, across sessions; the oldest are deleted.
+            max_file_bytes: roll over to a new file once the current one reaches this size.
+            chunk_bytes: the file (and its mapping) grows in steps of this size.
+            index_every: write an index entry for every this many records.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_files = max(1, max_files)
+        self.max_file_bytes = max_file_bytes
+        self.chunk_bytes = max(chunk_bytes, mmap.ALLOCATIONGRANULARITY)
+        self.index_every = max(1, index_every)
+        self.written = 0
+        # files that existed before this session, oldest first
+        self._previous = sorted(self.directory.glob("journal-*.bin"))
+        self._stem = f"journal-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self._part = 0
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._index = None
+        self._size = 0
+        self._used = 0
+        self._count = 0
+        self.path: Optional[Path] = None
+        self._lock = threading.Lock()
+        with self._lock:
+            self._open_part()
+
+    def previous_files(self) -> List[Path]:
+        """Journal files of earlier sessions that still exist, oldest first."""
+        return [path for path in self._previous if path.exists()]
+
+    def previous_sessions(self) -> List[List[Path]]:
+        """previous_files() grouped by session (the parts a session rolled over to), oldest first."""
+        sessions: List[List[Path]] = []
+        for path in self.previous_files():
+            if sessions and _session_of(sessions[-1][0]) == _session_of(path):
+                sessions[-1].append(path)
+            else:
+                sessions.append([path])
+        return sessions
+
+    def append(self, created: float, level: int, name: str, thread: str, message: str,
+               extras: Optional[dict] = None) -> None:
+        name_b = name.encode("utf-8")[:0xFFFF]
+        thread_b = thread.encode("utf-8")[:0xFFFF]
+        message_b = message.encode("utf-8")
+        extras_b = json.dumps(extras, default=repr).encode("utf-8") if extras else b""
+        payload = b"".join((_FIELDS.pack(created, level, len(name_b), len(thread_b), len(message_b), len(extras_b)),
+                            name_b, thread_b, message_b, extras_b))
+        frame = _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            if self._map is None:
+                return
+            if self._used > MAGIC_SIZE and self._used + len(frame) > self.max_file_bytes:
+                self._close_part()
+                self._part += 1
+                self._open_part()
+            if self._used + len(frame) > self._size:
+                self._grow(len(frame))
+            if self._count % self.index_every == 0:
+                self._index.write(_INDEX.pack(created, self._used))
+            self._map[self._used:self._used + len(frame)] = frame
+            self._used += len(frame)
+            self._count += 1
+            self.written += 1
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+                self._index.flush()
+
+    def close(self) -> None:
+        """Write everything out and trim the file to its used size."""
+        with self._lock:
+            self._close_part()
+
+    # ---------------- internals -----------------
+    def _open_part(self) -> None:
+        self.path = self.directory / f"{self._stem}-{self._part:03d}.bin"
+        self._file = open(self.path, "w+b")
+        self._file.write(MAGIC)
+        self._size = self.chunk_bytes
+        self._file.truncate(self._size)
+        self._map = mmap.mmap(self._file.fileno(), self._size)
+        self._used = MAGIC_SIZE
+        self._count = 0
+        self._index = open(self.path.with_suffix(".idx"), "wb")
+        self._prune()
+
+    def _grow(self, needed: int) -> None:
+        self._map.flush()
+        self._map.close()
+        self._size += max(self.chunk_bytes, needed)
+        self._file.truncate(self._size)
+        self._map = mmap.mmap(self._file.fileno(), self._size)
+
+    def _close_part(self) -> None:
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        self._map = None
+        self._file.truncate(self._used)
+        self._file.close()
+        self._index.close()
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob("journal-*.bin"))
+        for old in files[:-self.max_files]:
+            if _written_by_other_process(old):
+                continue    # another running instance may still have it mapped
+            for path in (old, old.with_suffix(".idx")):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def _session_of(path: Path) -> str:
+    # journal-<YYYYmmdd>-<HHMMSS>-<pid>-<part>
+    return path.stem.rsplit("-", 1)[0]
+
+
+def _written_by_other_process(path: Path) -> bool:
+    """Whether ``path`` belongs to a session of another process that is still running."""
+    try:
+        pid = int(_session_of(path).rsplit("-", 1)[1])
+    except (IndexError, ValueError):
+        return False
+    if pid == os.getpid() or os.name == "nt":
+        # Windows refuses to delete a file that is still mapped, so removing it is safe to try
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True     # running, as another user
+    return True
+
+
+def read_tail(paths: Sequence[str], count: int) -> List[JournalRecord]:
+    """The last ``count`` records of a session stored in ``paths`` (its parts, oldest first)."""
+    records: List[JournalRecord] = []
+    for path in reversed(paths):
+        if len(records) >= count:
+            break
+        try:
+            with JournalReader(str(path)) as journal:
+                records[:0] = journal.tail(count - len(records))
+        except (OSError, ValueError):
+            continue    # pruned meanwhile, or empty
+    return records
+
+
+class JournalReader:
+    """Reader side: random access to a journal file through a read-only mapping.
+
+    Typical usage:
+        with JournalReader(path) as journal:
+            journal.tail(1000)                                   # -> [JournalRecord, ...]
+            for record in journal.records(start=t0, min_level=logging.WARNING): ...
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ) if size else None
+        if self._map is None or self._map[:MAGIC_SIZE] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a log journal")
+        self._times: List[float] = []
+        self._offsets: List[int] = []
+        index_path = self.path.with_suffix(".idx")
+        if index_path.exists():
+            data = index_path.read_bytes()
+            for created, offset in _INDEX.iter_unpack(data[:len(data) - len(data) % _INDEX.size]):
+                if offset >= size:
+                    break
+                self._times.append(created)
+                self._offsets.append(offset)
+        # after a crash the index can point past the last record that reached the file
+        while self._offsets and next(self._scan(self._offsets[-1]), None) is None:
+            self._times.pop()
+            self._offsets.pop()
+
+    def __enter__(self) -> "JournalReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __iter__(self) -> Iterator[JournalRecord]:
+        return self.records()
+
+    def records(self, start: Optional[float] = None, end: Optional[float] = None,
+                min_level: Optional[int] = None) -> Iterator[JournalRecord]:
+        """Records with ``start <= time < end`` and a level of at least ``min_level``, oldest first.
+
+        The index finds the first block that can hold ``start``; scanning starts there.
+        """
+        offset = MAGIC_SIZE
+        if start is not None and self._times:
+            block = bisect.bisect_left(self._times, start) - 1
+            if block >= 0:
+                offset = self._offsets[block]
+        for created, level, at, length in self._scan(offset):
+            if start is not None and created < start:
+                continue
+            if end is not None and created >= end:
+                return
+            if min_level is None or level >= min_level:
+                yield self._decode(at, length)
+
+    def tail(self, count: int) -> List[JournalRecord]:
+        """The last ``count`` records, oldest first; only the end of the file is read."""
+        if count <= 0:
+            return []
+        offset = MAGIC_SIZE
+        # index entries are every ``n`` records; step back far enough to cover ``count``
+        if len(self._offsets) > 1:
+            every = max(1, self._records_per_block())
+            block = len(self._offsets) - 1 - -(-count // every)
+            if block > 0:
+                offset = self._offsets[block]
+        frames = list(self._scan(offset))[-count:]
+        return [self._decode(at, length) for _, _, at, length in frames]
+
+    # ---------------- internals -----------------
+    def _records_per_block(self) -> int:
+        first, second = self._offsets[0], self._offsets[1]
+        return sum(1 for _ in self._scan(first, second))
+
+    def _scan(self, offset: int, stop: Optional[int] = None):
+        """(time, level, payload offset, payload length) of each intact record from ``offset``."""
+        data = self._map
+        size = len(data) if stop is None else min(stop, len(data))
+        frame_size = _FRAME.size
+        while offset + frame_size <= size:
+            length, crc = _FRAME.unpack_from(data, offset)
+            at = offset + frame_size
+            if length < _FIELDS.size or at + length > len(data) or zlib.crc32(data[at:at + length]) != crc:
+                return      # end of the written part (zeros) or a torn record
+            created, level = struct.unpack_from("<dH", data, at)
+            yield created, level, at, length
+            offset = at + length
+
+    def _decode(self, at: int, length: int) -> JournalRecord:
+        data = self._map
+        created, level, name_len, thread_len, message_len, extras_len = _FIELDS.unpack_from(data, at)
+        pos = at + _FIELDS.size
+        name = data[pos:pos + name_len].decode("utf-8", "replace")
+        pos += name_len
+        thread = data[pos:pos + thread_len].decode("utf-8", "replace")
+        pos += thread_len
+        message = data[pos:pos + message_len].decode("utf-8", "replace")
+        pos += message_len
+        extras = json.loads(data[pos:pos + extras_len]) if extras_len else None
+        return JournalRecord(created, level, logging.getLevelName(level), name, thread, message, extras)
+
+
+class JournalHandler(logging.Handler):
+    """Logging handler appending to a LogJournal (see Logger.add_journal_sink)."""
+
+    def __init__(self, journal: LogJournal, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.journal = journal
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+            if record.exc_info and record.exc_text is None:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            if record.exc_text:
+                message = f"{message}\n{record.exc_text}"
+            self.journal.append(record.created, record.levelno, record.name, record.threadName or "", message)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.journal.flush()
+
+    def close(self) -> None:
+        self.journal.close()
+        super().close()
+
+
+def main(argv: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Print a log journal as text.")
+    parser.add_argument("journal", help="journal file (.bin)")
+    parser.add_argument("--tail", type=int, default=0, help="only the last N records")
+    parser.add_argument("--level", default=None, help="lowest level shown, e.g. WARNING")
+    args = parser.parse_args(argv)
+    min_level = logging.getLevelName(args.level.upper()) if args.level else None
+    with JournalReader(args.journal) as journal:
+        if args.tail:
+            records = [r for r in journal.tail(args.tail) if min_level is None or r.level >= min_level]
+        else:
+            records = journal.records(min_level=min_level)
+        for record in records:
+            print(record)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,532 @@
+"""
+logstore.py
+
+Bounded in-memory store for the application log.
+
+Features:
+- Fixed-capacity ring buffer: memory stays flat however long the session runs
+- Every record gets a sequence number; looking one up by number is O(1), as long as it is
+  still in memory
+- Time range lookups bisect the buffer, whose timestamps never decrease (O(log n))
+- Optional spill: records pushed out of the ring are appended to rotating segment files on disk
+  (``log-000001.txt``, ...) by a background writer, keeping the newest ``max_segments`` files
+- merge() inserts records from another source (e.g. the backend process) at their place in time
+- Queue-compatible put() / get() / qsize() / empty(), so existing ``logger.logs`` users keep working
+- Records can be any object whose str() is the log line (e.g. a lazily formatted LogEntry); it is
+  only converted when read, exported or spilled
+- Columnar layout: record, time and level live in parallel arrays, with a per-level index of
+  sequence numbers, so query() narrows by time (bisect) and level (index) before looking at
+  any record; full-text search only scans what is left
+
+Design notes:
+- All methods are thread-safe (one lock; put() is a few list stores). Evicted records are only
+  queued under the lock; the spill writer thread formats and writes them in batches, so a log
+  call never waits for the disk. Readers that need the segments (exports) write the queue out
+  first; close() does too, records still queued when the process dies are lost.
+- Segments continue the numbering of files left by earlier sessions, which rotation counts
+  towards ``max_segments``; spill_segments() and the exports only read this session's.
+- Timestamps are clamped to be non-decreasing (a wall-clock step backwards would otherwise break
+  the time index), so a record's time is never earlier than its predecessor's.
+- export_to_file() writes the spilled segments first and then the ring. It never copies more
+  than the ring into memory.
+- A record's level is its ``levelno`` attribute (NOTSET for plain strings). The search text of a
+  record (its lower-cased message) is computed on the first search that reaches it and kept in
+  the ``_search`` column, so repeated searches over the same rows do no formatting.
+
+"""
+from __future__ import annotations
+
+import bisect
+import heapq
+import logging
+import os
+import queue
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from PySide6.QtCore import QStandardPaths
+
+DEFAULT_CAPACITY = 10_000
+
+
+def default_spill_directory(app_name: str = "Python-Desktop-Application") -> Path:
+    """Where spilled log segments go, inside the per-user app-data directory."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    return Path(base or Path.home()) / app_name / "logs"
+
+
+def _segment_number(path: Path) -> int:
+    return int(path.stem.split("-")[-1])
+
+
+def _spill_loop(store_ref: "weakref.ref[LogStore]", wakeup: threading.Event) -> None:
+    """Spill writer thread: writes a store's evicted records whenever there are some queued.
+
+    Holds the store only weakly, so an abandoned store can be collected (its finalizer wakes the
+    thread, which then exits).
+    """
+    while True:
+        wakeup.wait()
+        wakeup.clear()
+        store = store_ref()
+        if store is None:
+            return
+        try:
+            store._write_spill()
+        except OSError:
+            logging.getLogger(__name__).exception("Writing spilled log records failed")
+        del store
+
+
+class _SortedView:
+    """Read-only sequence over the ring's timestamps in record order, for bisect."""
+
+    def __init__(self, store: "LogStore"):
+        self._store = store
+
+    def __len__(self) -> int:
+        return self._store._next - self._store._first
+
+    def __getitem__(self, i: int) -> float:
+        store = self._store
+        return store._times[(store._first + i) % store.capacity]
+
+
+class _SeqIndex:
+    """Ascending sequence numbers of one level; evicted numbers are dropped from the front."""
+
+    __slots__ = ("seqs", "head")
+
+    def __init__(self):
+        self.seqs: List[int] = []
+        self.head = 0
+
+    def __len__(self) -> int:
+        return len(self.seqs) - self.head
+
+    def append(self, seq: int) -> None:
+        self.seqs.append(seq)
+
+    def drop_below(self, seq: int) -> None:
+        seqs = self.seqs
+        while self.head < len(seqs) and seqs[self.head] < seq:
+            self.head += 1
+        # compact once the dead prefix dominates, so the list does not grow forever
+        if self.head > 1024 and self.head * 2 > len(seqs):
+            del seqs[:self.head]
+            self.head = 0
+
+    def truncate_from(self, seq: int) -> None:
+        seqs = self.seqs
+        while len(seqs) > self.head and seqs[-1] >= seq:
+            seqs.pop()
+
+    def range(self, lo: int, hi: int) -> List[int]:
+        """Indexed sequence numbers with ``lo <= seq < hi``."""
+        seqs = self.seqs
+        start = bisect.bisect_left(seqs, lo, self.head)
+        return seqs[start:bisect.bisect_left(seqs, hi, start)]
+
+
+def _search_text(record: Any) -> str:
+    return str(getattr(record, "message", record)).lower()
+
+
+class LogStore:
+    """Ring buffer of log records with timestamps and sequence numbers.
+
+    Typical usage:
+        store = LogStore(capacity=50_000)
+        store.enable_spill("/var/log/app", segment_bytes=4 << 20, max_segments=10)
+        seq = store.put("12-01-2025 10:00:00 | INFO | started")
+        store[seq]                              # -> the line
+        store.between(t0, t1)                   # -> [(seq, time, line), ...]
+        store.query(min_level=logging.WARNING, text="timeout", limit=100)   # -> records
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._lines: List[Any] = [None] * capacity
+        self._times: List[float] = [0.0] * capacity
+        self._levels: List[int] = [0] * capacity
+        self._search: List[Optional[str]] = [None] * capacity
+        self._level_index: Dict[int, _SeqIndex] = {}
+        self._first = 0      # sequence number of the oldest record still in memory
+        self._next = 0       # sequence number the next record gets
+        self._last_time = 0.0
+        self._lock = threading.Lock()
+
+        self._spill_dir: Optional[Path] = None
+        self._segment_bytes = 0
+        self._max_segments = 0
+        self._segment = None
+        self._segment_written = 0
+        self._segment_index = 0
+        self._session_segment = 1   # index of the first segment this session wrote
+        self._spill_pending: List[Any] = []     # evicted, not yet written; guarded by _lock
+        self._spill_lock = threading.Lock()     # segment file state; taken before _lock, never inside it
+        self._spill_wakeup = threading.Event()
+        self._spill_thread: Optional[threading.Thread] = None
+        self.spilled = 0
+        self.dropped = 0
+
+    # ---------------- configuration -----------------
+    def enable_spill(self, directory: str, segment_bytes: int = 4 << 20, max_segments: int = 5) -> None:
+        """Append records evicted from the ring to rotating segment files in ``directory``.
+
+        Args:
+            segment_bytes: start a new segment once the current one reaches this size.
+            max_segments: number of segment files kept; the oldest is deleted on rotation.
+        """
+        self._write_spill()
+        spill_dir = Path(directory)
+        spill_dir.mkdir(parents=True, exist_ok=True)
+        existing = sorted(spill_dir.glob("log-*.txt"))
+        with self._spill_lock, self._lock:
+            self._close_segment()
+            self._spill_dir = spill_dir
+            self._segment_bytes = segment_bytes
+            self._max_segments = max(1, max_segments)
+            self._segment_index = _segment_number(existing[-1]) if existing else 0
+            self._session_segment = self._segment_index + 1
+
+    def disable_spill(self) -> None:
+        self._write_spill()
+        with self._spill_lock, self._lock:
+            self._close_segment()
+            self._spill_dir = None
+
+    def resize(self, capacity: int) -> None:
+        """Change the capacity, keeping the newest records (older ones are spilled / dropped)."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        with self._lock:
+            old = self.capacity
+            records = [(seq, self._times[seq % old], self._lines[seq % old], self._levels[seq % old])
+                       for seq in range(self._first, self._next)]
+            for seq, created, record, level in records[:max(0, len(records) - capacity)]:
+                self._evict(record)
+            kept = records[-capacity:] if records else []
+            self.capacity = capacity
+            self._lines = [None] * capacity
+            self._times = [0.0] * capacity
+            self._levels = [0] * capacity
+            self._search = [None] * capacity
+            self._first = kept[0][0] if kept else self._next
+            for seq, created, record, level in kept:
+                self._lines[seq % capacity] = record
+                self._times[seq % capacity] = created
+                self._levels[seq % capacity] = level
+            self._drop_index_below(self._first)
+
+    def close(self) -> None:
+        """Write out queued evicted records, then flush and close the current spill segment."""
+        self._write_spill()
+        with self._spill_lock:
+            self._close_segment()
+
+    # ---------------- writing -----------------
+    def put(self, line: Any, created: Optional[float] = None) -> int:
+        """Append a record (a line, or an object whose str() is the line) and return its sequence number."""
+        created = time.time() if created is None else created
+        with self._lock:
+            return self._put_locked(line, created)
+
+    def merge(self, items: Iterable[Tuple[float, Any]]) -> int:
+        """Insert (time, record) pairs from another source (e.g. a remote process) in time order.
+
+        Unlike put(), the records keep their place by time among the in-memory records; the
+        ones already stored after the earliest merged time are renumbered. Records older than
+        everything in memory go to the front of the ring. Returns the number merged.
+        """
+        items = sorted(items, key=lambda item: item[0])
+        if not items:
+            return 0
+        with self._lock:
+            capacity = self.capacity
+            at = self._first + bisect.bisect_right(_SortedView(self), items[0][0])
+            tail = [(self._times[seq % capacity], self._lines[seq % capacity]) for seq in range(at, self._next)]
+            for index in self._level_index.values():
+                index.truncate_from(at)
+            for seq in range(at, self._next):
+                self._lines[seq % capacity] = None
+            self._next = at
+            self._last_time = self._times[(at - 1) % capacity] if at > self._first else items[0][0]
+            for created, record in heapq.merge(tail, items, key=lambda item: item[0]):
+                self._put_locked(record, created)
+        return len(items)
+
+    # Queue compatibility: get() consumes the oldest record and returns it as put (it never blocks)
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        with self._lock:
+            if self._first == self._next:
+                raise queue.Empty
+            slot = self._first % self.capacity
+            line = self._lines[slot]
+            self._lines[slot] = None
+            self._search[slot] = None
+            self._first += 1
+            self._level_index[self._levels[slot]].drop_below(self._first)
+            return line
+
+    def qsize(self) -> int:
+        return len(self)
+
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    # ---------------- reading -----------------
+    def __len__(self) -> int:
+        return self._next - self._first
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.snapshot())
+
+    @property
+    def first_index(self) -> int:
+        """Sequence number of the oldest record still in memory."""
+        return self._first
+
+    @property
+    def next_index(self) -> int:
+        """Sequence number the next record will get (total records ever stored)."""
+        return self._next
+
+    def __getitem__(self, seq: int) -> str:
+        """Line with sequence number ``seq`` (IndexError once it left the ring)."""
+        with self._lock:
+            if not self._first <= seq < self._next:
+                raise IndexError(f"log record {seq} is not in memory")
+            return str(self._lines[seq % self.capacity])
+
+    def time_of(self, seq: int) -> float:
+        with self._lock:
+            if not self._first <= seq < self._next:
+                raise IndexError(f"log record {seq} is not in memory")
+            return self._times[seq % self.capacity]
+
+    def index_at(self, when: float) -> int:
+        """Sequence number of the first in-memory record at or after ``when``."""
+        with self._lock:
+            return self._first + bisect.bisect_left(_SortedView(self), when)
+
+    def between(self, start: float, end: float) -> List[Tuple[int, float, str]]:
+        """In-memory records with ``start <= time < end`` as (seq, time, line)."""
+        with self._lock:
+            view = _SortedView(self)
+            lo = self._first + bisect.bisect_left(view, start)
+            hi = self._first + bisect.bisect_left(view, end)
+            return list(self._iter_locked(lo, hi))
+
+    def snapshot(self, start: Optional[int] = None) -> List[str]:
+        """Lines in memory, oldest first (from sequence number ``start`` if given)."""
+        with self._lock:
+            lo = self._first if start is None else max(start, self._first)
+            return [line for _, _, line in self._iter_locked(lo, self._next)]
+
+    def level_counts(self) -> Dict[int, int]:
+        """Number of in-memory records per level."""
+        with self._lock:
+            return {level: len(index) for level, index in self._level_index.items() if len(index)}
+
+    def query(self, min_level: Optional[int] = None, levels: Optional[Iterable[int]] = None,
+              start: Optional[float] = None, end: Optional[float] = None, text: Optional[str] = None,
+              limit: Optional[int] = None, newest: bool = False) -> List[Any]:
+        """In-memory records matching every given filter, oldest first.
+
+        Args:
+            min_level: keep records at or above this level.
+            levels: keep records at exactly these levels.
+            start / end: keep records with ``start <= time < end``.
+            text: case-insensitive substring of the message.
+            limit: return at most this many records (the oldest ones, or the newest with ``newest``).
+            newest: with ``limit``, keep the newest matches instead of the oldest.
+        """
+        with self._lock:
+            seqs = self._select_locked(min_level, levels, start, end)
+            capacity = self.capacity
+            if text:
+                needle = text.lower()
+                if newest:
+                    seqs = reversed(seqs)
+                matched = []
+                for seq in seqs:
+                    slot = seq % capacity
+                    haystack = self._search[slot]
+                    if haystack is None:
+                        haystack = self._search[slot] = _search_text(self._lines[slot])
+                    if needle in haystack:
+                        matched.append(seq)
+                        if limit is not None and len(matched) >= limit:
+                            break
+                seqs = matched[::-1] if newest else matched
+            elif limit is not None:
+                seqs = seqs[-limit:] if newest else seqs[:limit]
+            return [self._lines[seq % capacity] for seq in seqs]
+
+    def iter_chunks(self, start: Optional[float] = None, end: Optional[float] = None,
+                    min_level: Optional[int] = None, max_level: Optional[int] = None,
+                    chunk: int = 1000) -> Iterator[List[Tuple[float, Any]]]:
+        """Yield the in-memory records in the range as lists of (time, record), ``chunk`` at a time.
+
+        The lock is only held while a chunk is copied, so writers are not blocked while the
+        caller handles it. Records evicted before their chunk is reached are skipped.
+        """
+        with self._lock:
+            view = _SortedView(self)
+            cursor = self._first if start is None else self._first + bisect.bisect_left(view, start)
+            hi = self._next if end is None else self._first + bisect.bisect_left(view, end)
+        low = float("-inf") if min_level is None else min_level
+        high = float("inf") if max_level is None else max_level
+        while True:
+            with self._lock:
+                cursor = max(cursor, self._first)
+                stop = min(cursor + chunk, hi)
+                capacity = self.capacity
+                out = [(self._times[seq % capacity], self._lines[seq % capacity]) for seq in range(cursor, stop)
+                       if low <= self._levels[seq % capacity] <= high]
+            if cursor >= stop:
+                return
+            cursor = stop
+            if out:
+                yield out
+
+    def spill_segments(self) -> List[Path]:
+        """This session's spilled segment files, oldest first (queued records are written out first)."""
+        self._write_spill()
+        with self._spill_lock:
+            if self._spill_dir is None:
+                return []
+            if self._segment is not None:
+                self._segment.flush()
+            return [path for path in self._segments() if _segment_number(path) >= self._session_segment]
+
+    def export_to_file(self, file_path: str) -> int:
+        """Write spilled segments, then the in-memory records, to ``file_path``. Returns lines written."""
+        segments = self.spill_segments()
+        with self._lock:
+            lines = [line for _, _, line in self._iter_locked(self._first, self._next)]
+        written = 0
+        with open(file_path, "w", encoding="utf-8") as out:
+            for segment in segments:
+                try:
+                    with open(segment, "r", encoding="utf-8") as f:
+                        for line in f:
+                            out.write(line)
+                            written += 1
+                except FileNotFoundError:
+                    continue    # rotated away meanwhile
+            for line in lines:
+                out.write(line + "\n")
+            written += len(lines)
+        return written
+
+    # ---------------- internals -----------------
+    def _put_locked(self, line: Any, created: float) -> int:
+        if created < self._last_time:
+            created = self._last_time
+        self._last_time = created
+        if self._next - self._first == self.capacity:
+            slot = self._first % self.capacity
+            self._evict(self._lines[slot])
+            self._first += 1
+            self._level_index[self._levels[slot]].drop_below(self._first)
+        seq = self._next
+        slot = seq % self.capacity
+        level = getattr(line, "levelno", logging.NOTSET)
+        self._lines[slot] = line
+        self._times[slot] = created
+        self._levels[slot] = level
+        self._search[slot] = None
+        index = self._level_index.get(level)
+        if index is None:
+            index = self._level_index[level] = _SeqIndex()
+        index.append(seq)
+        self._next = seq + 1
+        return seq
+
+    def _select_locked(self, min_level, levels, start, end):
+        """Sequence numbers inside the time range and level filter (a range when no level filter)."""
+        view = _SortedView(self)
+        lo = self._first if start is None else self._first + bisect.bisect_left(view, start)
+        hi = self._next if end is None else self._first + bisect.bisect_left(view, end)
+        if min_level is None and levels is None:
+            return range(lo, hi)
+        wanted = set(self._level_index) if levels is None else set(levels) & set(self._level_index)
+        if min_level is not None:
+            wanted = {level for level in wanted if level >= min_level}
+        parts = [self._level_index[level].range(lo, hi) for level in wanted]
+        parts = [part for part in parts if part]
+        if len(parts) == 1:
+            return parts[0]
+        return list(heapq.merge(*parts))
+
+    def _drop_index_below(self, seq: int) -> None:
+        for index in self._level_index.values():
+            index.drop_below(seq)
+
+    def _iter_locked(self, lo: int, hi: int) -> Iterator[Tuple[int, float, str]]:
+        capacity = self.capacity
+        for seq in range(lo, hi):
+            yield seq, self._times[seq % capacity], str(self._lines[seq % capacity])
+
+    def _segments(self) -> List[Path]:
+        return sorted(self._spill_dir.glob("log-*.txt"))
+
+    def _evict(self, record: Any) -> None:
+        # under _lock: only queue the record, the spill writer thread formats and writes it
+        if record is None:
+            return
+        if self._spill_dir is None:
+            self.dropped += 1
+            return
+        self._spill_pending.append(record)
+        if len(self._spill_pending) == 1:
+            if self._spill_thread is None:
+                self._spill_thread = threading.Thread(target=_spill_loop, args=(weakref.ref(self), self._spill_wakeup),
+                                                      name="LogStoreSpill", daemon=True)
+                self._spill_thread.start()
+                # wake the thread once more when the store goes away, so it can exit
+                weakref.finalize(self, self._spill_wakeup.set)
+            self._spill_wakeup.set()
+
+    def _write_spill(self) -> None:
+        """Append the queued evicted records to the segment files, rotating as needed."""
+        with self._spill_lock:
+            with self._lock:
+                records, self._spill_pending = self._spill_pending, []
+                spill_dir = self._spill_dir
+            if not records:
+                return
+            if spill_dir is None:
+                self.dropped += len(records)    # spill was disabled meanwhile
+                return
+            for record in records:
+                if self._segment is None or self._segment_written >= self._segment_bytes:
+                    self._rotate()
+                line = f"{record}\n"
+                self._segment.write(line)
+                self._segment_written += len(line)
+            self.spilled += len(records)
+
+    def _rotate(self) -> None:
+        self._close_segment()
+        self._segment_index += 1
+        path = self._spill_dir / f"log-{self._segment_index:06d}.txt"
+        self._segment = open(path, "a", encoding="utf-8")
+        self._segment_written = 0
+        for old in self._segments()[:-self._max_segments]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    def _close_segment(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
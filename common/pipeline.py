@@ -0,0 +1,197 @@
+"""
+pipeline.py
+
+Dependency-graph startup pipeline on top of the ThreadManager.
+
+Features:
+- Steps declare the steps they require; every step whose requirements are met starts at once,
+  so independent work (font files, palette, backend handshake) overlaps instead of queueing
+- Steps run on the ThreadManager pool by default, or on the GUI thread (``gui=True``) for work
+  Qt only allows there, such as registering fonts
+- wait() blocks only for the steps the caller needs next (e.g. what the splash needs), in a local
+  Qt event loop so the UI keeps painting
+- A progress callback reports each finished step, so the splash shows real progress
+- Every step is recorded as a phase of the StartupTimeline
+
+Design notes:
+- Scheduling happens on the GUI thread only (finished pool steps are delivered there through
+  ThreadManager.watch), so the pipeline needs no locking. start() and wait() must be called on
+  the GUI thread. Without a Qt application the steps simply run one after another.
+- A failing step fails every step that requires it; wait() re-raises the first error among the
+  steps it waits for.
+
+"""
+from __future__ import annotations
+
+import concurrent.futures
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QCoreApplication
+
+from common.diagnostics.startup import StartupTimeline
+from common.threadmanager import ThreadManager
+
+
+class StartupStep:
+    __slots__ = ("name", "fn", "requires", "gui", "future", "started")
+
+    def __init__(self, name: str, fn: Callable[[], Any], requires: Iterable[str], gui: bool):
+        self.name = name
+        self.fn = fn
+        self.requires = tuple(requires)
+        self.gui = gui
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.started = False
+
+
+class StartupPipeline:
+    """Runs startup steps as a dependency graph.
+
+    Typical usage (on the GUI thread):
+        pipeline = StartupPipeline(Threadmanager, progress=on_progress)
+        pipeline.add("config", load_config)
+        pipeline.add("palette", build_palette, requires=("config",))
+        pipeline.add("fonts", register_fonts, gui=True)
+        pipeline.start()
+        pipeline.wait("palette", "fonts")     # enough to show the splash
+        ...
+        pipeline.wait()                       # everything
+    """
+
+    def __init__(self, Threadmanager: ThreadManager,
+                 progress: Optional[Callable[[int, int, str], None]] = None):
+        """
+        Args:
+            Threadmanager: runs the pool steps and delivers their results on the GUI thread.
+            progress: called on the GUI thread as ``progress(finished, total, step_name)``.
+        """
+        self._Threadmanager = Threadmanager
+        self.progress = progress
+        self._steps: Dict[str, StartupStep] = {}
+        self._finished = 0
+        self._started = False
+
+    def add(self, name: str, fn: Callable[[], Any], requires: Iterable[str] = (), *, gui: bool = False) -> None:
+        """Add step ``name``; it runs ``fn()`` once every step in ``requires`` succeeded.
+
+        Steps may be added until start(); a step reads what it needs with result().
+        """
+        if self._started:
+            raise RuntimeError("Cannot add steps to a started pipeline")
+        if name in self._steps:
+            raise ValueError(f"Duplicate startup step: {name}")
+        self._steps[name] = StartupStep(name, fn, requires, gui)
+
+    def start(self) -> None:
+        """Check the graph and start every step that has no requirements."""
+        if self._started:
+            return
+        self._check_graph()
+        self._started = True
+        if QCoreApplication.instance() is None:
+            for step in self._ordered():
+                self._run_inline(step)
+            return
+        self._schedule()
+
+    def wait(self, *names: str, timeout: Optional[float] = None) -> None:
+        """Wait for the named steps (all steps by default) and raise the first error among them."""
+        self.start()
+        for name in names or list(self._steps):
+            self._Threadmanager.wait_future(self._steps[name].future, timeout=timeout)
+
+    def result(self, name: str) -> Any:
+        """Return value of a finished step (raises its error if it failed)."""
+        return self._steps[name].future.result(timeout=0)
+
+    def done(self, name: str) -> bool:
+        return self._steps[name].future.done()
+
+    @property
+    def steps(self) -> List[str]:
+        return list(self._steps)
+
+    @property
+    def finished(self) -> int:
+        """Number of steps that completed (or failed) so far."""
+        return self._finished
+
+    # ---------------- internals -----------------
+    def _check_graph(self) -> None:
+        for step in self._steps.values():
+            for dep in step.requires:
+                if dep not in self._steps:
+                    raise KeyError(f"Startup step '{step.name}' requires unknown step '{dep}'")
+        self._ordered()
+
+    def _ordered(self) -> List[StartupStep]:
+        """Steps in dependency order; raises ValueError on a cycle."""
+        ordered: List[StartupStep] = []
+        state: Dict[str, int] = {}
+
+        def visit(step: StartupStep) -> None:
+            if state.get(step.name) == 2:
+                return
+            if state.get(step.name) == 1:
+                raise ValueError(f"Startup steps form a cycle through '{step.name}'")
+            state[step.name] = 1
+            for dep in step.requires:
+                visit(self._steps[dep])
+            state[step.name] = 2
+            ordered.append(step)
+
+        for step in self._steps.values():
+            visit(step)
+        return ordered
+
+    def _schedule(self) -> None:
+        # GUI steps run inline, which can unlock further steps: repeat until nothing new starts
+        progressed = True
+        while progressed:
+            progressed = False
+            for step in self._steps.values():
+                if step.started or not all(self._steps[dep].future.done() for dep in step.requires):
+                    continue
+                step.started = True
+                progressed = True
+                failed = next((self._steps[dep] for dep in step.requires
+                               if self._steps[dep].future.exception() is not None), None)
+                if failed is not None:
+                    self._complete(step, exception=failed.future.exception())
+                elif step.gui:
+                    self._run_inline(step)
+                else:
+                    fut = self._Threadmanager.submit_blocking(self._run, step)
+                    self._Threadmanager.watch(fut, lambda f, s=step: self._delivered(s, f))
+
+    @staticmethod
+    def _run(step: StartupStep) -> Any:
+        with StartupTimeline().phase(step.name):
+            return step.fn()
+
+    def _run_inline(self, step: StartupStep) -> None:
+        step.started = True
+        try:
+            result = self._run(step)
+        except Exception as ex:
+            self._complete(step, exception=ex)
+        else:
+            self._complete(step, result=result)
+
+    def _delivered(self, step: StartupStep, fut: concurrent.futures.Future) -> None:
+        if fut.cancelled():
+            self._complete(step, exception=concurrent.futures.CancelledError())
+        elif fut.exception() is not None:
+            self._complete(step, exception=fut.exception())
+        else:
+            self._complete(step, result=fut.result())
+        self._schedule()
+
+    def _complete(self, step: StartupStep, result: Any = None, exception: Optional[BaseException] = None) -> None:
+        if exception is not None:
+            step.future.set_exception(exception)
+        else:
+            step.future.set_result(result)
+        self._finished += 1
+        if self.progress is not None:
+            self.progress(self._finished, len(self._steps), step.name)
@@ -0,0 +1,138 @@
+"""
+logview.py
+
+Bounded, virtualized log view for Logger.log_batch.
+
+Features:
+- LogListModel keeps the newest ``max_rows`` records. Each batch is one row insert (plus one
+  removal once full), not a relayout per line
+- Rows are formatted only when the view paints them, and only the visible ones are painted
+  (QListView with uniform item sizes)
+- LogView follows the tail while scrolled to the bottom and stays put while the user reads
+  older lines
+- Records are coloured by level (``level_colours``), debug lines can be hidden via min_level
+- apply_filter() refills the view from the Logger's indexed store (level + text), and later
+  batches are filtered the same way
+
+"""
+from __future__ import annotations
+
+import logging
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QPersistentModelIndex, Qt
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QAbstractItemView, QListView, QWidget
+
+from common.logger import Logger
+
+
+class LogListModel(QAbstractListModel):
+    """List model over the newest ``max_rows`` log records (LogEntry or plain strings)."""
+
+    def __init__(self, max_rows: int = 5000, min_level: int = logging.NOTSET, parent=None):
+        super().__init__(parent)
+        self.max_rows = max_rows
+        self.min_level = min_level
+        self.text = ""
+        self.level_colours: Dict[int, QColor] = {}
+        self._rows: deque = deque()
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        record = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(record)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.level_colours.get(getattr(record, "levelno", logging.NOTSET))
+        return None
+
+    def record(self, row: int) -> Any:
+        return self._rows[row]
+
+    def matches(self, record: Any) -> bool:
+        if getattr(record, "levelno", logging.NOTSET) < self.min_level:
+            return False
+        return not self.text or self.text in str(getattr(record, "message", record)).lower()
+
+    def set_records(self, records: List[Any]) -> None:
+        """Replace all rows (the newest ``max_rows`` of ``records`` are kept)."""
+        self.beginResetModel()
+        self._rows = deque(records[-self.max_rows:])
+        self.endResetModel()
+
+    def append_records(self, records: List[Any]) -> None:
+        """Append a batch (slot for Logger.log_batch); the oldest rows go once max_rows is reached."""
+        records = [r for r in records if self.matches(r)]
+        if not records:
+            return
+        records = records[-self.max_rows:]
+        overflow = len(self._rows) + len(records) - self.max_rows
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._rows.popleft()
+            self.endRemoveRows()
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self._rows.extend(records)
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._rows.clear()
+        self.endResetModel()
+
+
+class LogView(QListView):
+    """Read-only list view showing Logger output through a LogListModel.
+
+    Typical usage:
+        view = LogView(max_rows=10_000)
+        view.attach(Logger())
+    """
+
+    def __init__(self, max_rows: int = 5000, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.log_model = LogListModel(max_rows, parent=self)
+        self.setModel(self.log_model)
+        # uniform rows let the view compute its geometry without measuring every line
+        self.setUniformItemSizes(True)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setWordWrap(False)
+        self._follow = True
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+    def attach(self, logger: Logger) -> None:
+        """Show what the logger already holds (e.g. the restored last session), then follow it."""
+        self.append_records(logger.query(limit=self.log_model.max_rows, newest=True))
+        logger.log_batch.connect(self.append_records)
+
+    def append_records(self, records: List[Any]) -> None:
+        self.log_model.append_records(records)
+        if self._follow:
+            self.scrollToBottom()
+
+    def apply_filter(self, logger: Logger, min_level: int = logging.NOTSET, text: str = "") -> None:
+        """Show only records at or above ``min_level`` whose message contains ``text`` (any case).
+
+        The rows are reloaded from ``logger.logs`` through its level and time indexes.
+        """
+        model = self.log_model
+        model.min_level = min_level
+        model.text = text.lower()
+        query_level = None if min_level <= logging.NOTSET else min_level
+        model.set_records(logger.query(min_level=query_level, text=text or None,
+                                       limit=model.max_rows, newest=True))
+        self._follow = True
+        self.scrollToBottom()
+
+    def _on_scrolled(self, value: int) -> None:
+        self._follow = value >= self.verticalScrollBar().maximum()
@@ -1,6 +1,7 @@
 import socket
 import json
 from common.tcpinterface.aes import AESCipher
+from common.diagnostics.tracing import Tracer
 
 
 class BackendClient:
@@ -17,19 +18,25 @@ class BackendClient:
         self._cipher = AESCipher(secret_key)
 
     def call(self, func_name, *args, **kwargs):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(self.timeout)
-                s.connect((self.host, self.port))
+        with Tracer().span(f"rpc:{func_name}") as span:
+            try:
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                    s.settimeout(self.timeout)
+                    s.connect((self.host, self.port))
 
-                # 🔐 Encrypt request
-                request = {"function": func_name, "args": args, "kwargs": kwargs}
-                enc_request = self._cipher.encrypt(request)
-                s.sendall(enc_request.encode("utf-8"))
+                    # 🔐 Encrypt request
+                    request = {"function": func_name, "args": args, "kwargs": kwargs}
+                    trace = span.context()
+                    if trace:
+                        # lets the server run the function as a child of this span
+                        request["trace"] = trace
+                    enc_request = self._cipher.encrypt(request)
+                    s.sendall(enc_request.encode("utf-8"))
 
-                # 🔐 Decrypt response
-                response = s.recv(8192).decode("utf-8")
-                return self._cipher.decrypt(response)
+                    # 🔐 Decrypt response
+                    response = s.recv(8192).decode("utf-8")
+                    return self._cipher.decrypt(response)
 
-        except Exception as e:
-            return {"status": "error", "message": f"TCP backend comm failure: {str(e)}"}
+            except Exception as e:
+                span.set("error", str(e))
+                return {"status": "error", "message": f"TCP backend comm failure: {str(e)}"}
@@ -2,9 +2,12 @@ import socket
 import threading
 import json
 import inspect
+import logging
 
 from common.logger import Logger
 from common.tcpinterface.aes import AESCipher
+from common.tcpinterface.logforward import LOG_PULL_FUNCTION, LogForwarder
+from common.diagnostics.tracing import Tracer
 
 
 class BackendServer:
@@ -20,6 +23,7 @@ class BackendServer:
         self._running = False
         self._functions = {}
         self._logger = Logger()
+        self._log_forwarder = None
         if secret_key is None:
             raise ValueError("Secret key required for AES encryption")
         self._cipher = AESCipher(secret_key)
@@ -38,8 +42,27 @@ class BackendServer:
                 key = f"{prefix}.{name}" if prefix else name
                 self._functions[key] = method
 
+    def enable_log_forwarding(self, level=logging.INFO, capacity=10_000):
+        """
+        Let clients pull this process's log records (see logforward.BackendLogCollector).
+        Records below ``level`` are never buffered; the newest ``capacity`` are kept.
+        """
+        if self._log_forwarder is None:
+            self._log_forwarder = LogForwarder(level, capacity)
+            # the Logger's records, and plain logging from SDK modules (the Logger does not propagate)
+            self._logger.add_sink(self._log_forwarder)
+            logging.getLogger().addHandler(self._log_forwarder)
+        self._log_forwarder.setLevel(level)
+        return self._log_forwarder
+
+    def disable_log_forwarding(self):
+        if self._log_forwarder is not None:
+            logging.getLogger().removeHandler(self._log_forwarder)
+            self._logger.remove_sink(self._log_forwarder)
+            self._log_forwarder = None
+
     def _handle_client(self, conn, addr):
-        self._logger.debug(f"Backend server connection from {addr[0]}:{addr[1]}")
+        announced = False
         with conn:
             while True:
                 try:
@@ -49,24 +72,15 @@ class BackendServer:
 
                     # 🔐 Decrypt request
                     request = self._cipher.decrypt(data)
-                    func_name = request.get("function")
-                    args = request.get("args", [])
-                    kwargs = request.get("kwargs", {})
-                    self._logger.debug(f"Backend server exec function: {func_name}")
-
-                    if func_name in self._functions:
-                        try:
-                            result = self._functions[func_name](*args, **kwargs)
-                            response = {"status": "ok", "result": result}
-                        except Exception as e:
-                            response = {"status": "error", "message": str(e)}
+                    if request.get("function") == LOG_PULL_FUNCTION and self._log_forwarder is not None:
+                        # answered quietly: logging the poll would forward its own lines on the next poll
+                        response = {"status": "ok", "result": self._log_forwarder.pull(**request.get("kwargs", {}))}
                     else:
-                        response = {
-                            "status": "error",
-                            "message": f"Unknown function '{func_name}'",
-                        }
-
-                    self._logger.debug(f"Backend server exec response: {response}")
+                        if not announced:
+                            # the log collector connects on every poll, so only connections making other calls are logged
+                            self._logger.debug(f"Backend server connection from {addr[0]}:{addr[1]}")
+                            announced = True
+                        response = self._dispatch(request)
 
                     # 🔐 Encrypt response
                     enc_response = self._cipher.encrypt(response)
@@ -80,6 +94,30 @@ class BackendServer:
                         pass
                     break
 
+    def _dispatch(self, request):
+        """Run the requested function and return the response dict."""
+        func_name = request.get("function")
+        args = request.get("args", [])
+        kwargs = request.get("kwargs", {})
+        self._logger.debug(f"Backend server exec function: {func_name}")
+
+        if func_name in self._functions:
+            with Tracer().remote_span(f"dispatch:{func_name}", request.get("trace")) as span:
+                try:
+                    result = self._functions[func_name](*args, **kwargs)
+                    response = {"status": "ok", "result": result}
+                except Exception as e:
+                    span.set("error", str(e))
+                    response = {"status": "error", "message": str(e)}
+        else:
+            response = {
+                "status": "error",
+                "message": f"Unknown function '{func_name}'",
+            }
+
+        self._logger.debug(f"Backend server exec response: {response}")
+        return response
+
     def start(self):
         """Start the server in a background thread"""
         self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -0,0 +1,198 @@
+"""
+logforward.py
+
+Forwarding of backend log records to the frontend Logger over the BackendServer channel.
+
+Features:
+- LogForwarder (backend side) is a logging handler buffering the backend's records (Logger
+  output and plain ``logging`` from SDK code) in a bounded buffer, filtered by level at the source
+- The frontend pulls batches with the reserved ``logs.pull`` call, so records travel over the
+  same AES-encrypted request / response channel as every other call
+- BackendLogCollector (frontend side) polls on the Threadmanager timer wheel, corrects the
+  backend's clock offset and merges the records by time into the frontend Logger store
+
+Design notes:
+- A pull answer is kept under ``max_bytes`` of record JSON (long messages are cut), so it fits
+  the channel's single 8 KB read; while more records are waiting the collector pulls again,
+  up to ``max_pulls`` times per tick.
+- Each record has a sequence number; a collector that falls behind the buffer is told how many
+  records it missed.
+- The server answers ``logs.pull`` without logging or tracing it, otherwise every poll would
+  produce records that the next poll forwards.
+- A collector talking to a backend inside its own process (main.py runs both) stops on the
+  first answer, since those records already are in the Logger.
+
+"""
+from __future__ import annotations
+
+import collections
+import itertools
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from common.logger import LogEntry, Logger
+
+LOG_PULL_FUNCTION = "logs.pull"
+_PROCESS = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LogForwarder(logging.Handler):
+    """Buffers log records for BackendLogCollector (see BackendServer.enable_log_forwarding)."""
+
+    def __init__(self, level: int = logging.INFO, capacity: int = 10_000, max_message: int = 1000):
+        super().__init__(level)
+        self.max_message = max_message
+        self.process = _PROCESS     # host:pid, lets a collector recognise its own process
+        self._records: collections.deque = collections.deque(maxlen=capacity)
+        self._next = 0
+        self._records_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+            if record.exc_info and record.exc_text is None:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            if record.exc_text:
+                message = f"{message}\n{record.exc_text}"
+            fields = {"created": record.created, "level": record.levelno, "level_name": record.levelname,
+                      "name": record.name, "thread": record.threadName, "message": message[:self.max_message]}
+            with self._records_lock:
+                self._records.append((self._next, fields))
+                self._next += 1
+        except Exception:
+            self.handleError(record)
+
+    def pull(self, after: int = -1, min_level: int = logging.NOTSET, max_bytes: int = 4096) -> Dict[str, Any]:
+        """Records with a sequence number above ``after`` and a level of at least ``min_level``.
+
+        Returns {"records", "next" (pass as ``after`` next time), "more", "missed", "time", "process"}.
+        """
+        with self._records_lock:
+            first = self._records[0][0] if self._records else self._next
+            start = max(after + 1, first)
+            pending = list(itertools.islice(self._records, start - first, None))
+        missed = max(0, first - (after + 1)) if after >= 0 else 0
+        records: List[dict] = []
+        size = 0
+        last = start - 1
+        for seq, fields in pending:
+            if fields["level"] >= min_level:
+                cost = len(json.dumps(fields))
+                if records and size + cost > max_bytes:
+                    break
+                if cost > max_bytes:
+                    fields, cost = _shortened(fields, cost, max_bytes)
+                records.append(fields)
+                size += cost
+            last = seq
+        return {"records": records, "next": last, "more": last < pending[-1][0] if pending else False,
+                "missed": missed, "time": time.time(), "process": self.process}
+
+
+def _shortened(fields: dict, cost: int, max_bytes: int):
+    """``fields`` with the message cut so its JSON takes at most ``max_bytes`` (where possible), and its new cost.
+
+    Escaping makes the JSON of a message longer than the message (newlines, quotes, non-ASCII),
+    so the cut is searched on the encoded length.
+    """
+    message = fields["message"]
+    budget = max_bytes - (cost - len(json.dumps(message)))
+    low, high = 0, len(message)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if len(json.dumps(message[:middle])) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    fields = dict(fields, message=message[:low])
+    return fields, len(json.dumps(fields))
+
+
+class BackendLogCollector:
+    """Polls a BackendServer for its log records and merges them into the frontend Logger.
+
+    Typical usage:
+        collector = BackendLogCollector(AppCntxt.backend, AppCntxt.logger, min_level=logging.INFO)
+        collector.start(AppCntxt.threader)
+    """
+
+    def __init__(self, client, logger: Optional[Logger] = None, min_level: int = logging.INFO,
+                 interval: float = 0.5, prefix: str = "[backend] ", max_pulls: int = 8):
+        """
+        Args:
+            client: BackendClient connected to the backend.
+            min_level: lowest level forwarded (filtered on the backend).
+            interval: seconds between polls.
+            prefix: put in front of each forwarded message, so backend lines stand out.
+            max_pulls: pulls per poll while the backend has more records waiting.
+        """
+        self._client = client
+        self._logger = logger or Logger()
+        self.min_level = min_level
+        self.interval = interval
+        self.prefix = prefix
+        self.max_pulls = max_pulls
+        self.clock_offset = 0.0     # seconds to add to backend times
+        self.received = 0
+        self.missed = 0
+        self._after = -1
+        self._job = None
+        self._failing = False
+
+    def start(self, Threadmanager) -> "BackendLogCollector":
+        self._job = Threadmanager.every(self.interval, self.poll, key=("backend logs", id(self)))
+        return self
+
+    def stop(self) -> None:
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+
+    def poll(self) -> int:
+        """Pull what the backend has logged since the last poll and merge it. Returns records merged."""
+        entries: List[LogEntry] = []
+        for _ in range(self.max_pulls):
+            sent = time.time()
+            reply = self._client.call(LOG_PULL_FUNCTION, after=self._after, min_level=self.min_level)
+            if reply.get("status") != "ok":
+                self._on_error(reply.get("message", ""))
+                break
+            if self._failing:
+                self._failing = False
+                self._logger.info("Backend log forwarding resumed")
+            result = reply["result"]
+            if result.get("process") == _PROCESS:
+                # backend running inside this process: its records are in the Logger already
+                self.stop()
+                break
+            # the backend stamped its answer half way through the round trip
+            self.clock_offset = (sent + time.time()) / 2 - result["time"]
+            for fields in result["records"]:
+                entry = LogEntry.from_dict(fields)
+                entry.created += self.clock_offset
+                entry.msg = f"{self.prefix}{entry.msg}"
+                entry.name = f"backend:{entry.name}"
+                entries.append(entry)
+            self._after = result["next"]
+            self.missed += result["missed"]
+            if result["missed"]:
+                self._logger.warning("Backend log forwarding missed %d record(s)", result["missed"])
+            if not result["more"]:
+                break
+        if entries:
+            self.received += len(entries)
+            self._logger.merge_records(entries)
+        return len(entries)
+
+    def _on_error(self, message: str) -> None:
+        if message.startswith("Unknown function"):
+            self._logger.info("Backend does not forward logs; log collection stopped")
+            self.stop()
+        elif not self._failing:
+            self._failing = True
+            self._logger.debug("Backend log forwarding unavailable: %s", message)
@@ -6,6 +6,7 @@ import logging
 import time
 import asyncio
 import re
+from typing import Optional
 from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtWidgets import (
     QApplication, QWidget, QMainWindow, QFileDialog, QVBoxLayout, QHBoxLayout,
@@ -18,16 +19,21 @@ from common import threadmanager, AppData, initialise_context
 from common.appearance.stylemanager import StyleManager
 from common.configuration.parser import ConfigurationManager, SettingItem
 from common.qwidgets.titlebar import CustomTitleBar
+from common.qwidgets.logview import LogView
 from common.tester.tester import Ui_TesterWindow
 from common.appearance.fontmanager import FontManager
 from common.appearance.iconmanager import IconManager
 from common.logger import Logger
+from common.logexport import start_export
 from common.tcpinterface.backendserver import BackendServer
 from common.tcpinterface.backendclient import BackendClient
 from common.tcpinterface.aes import AESCipher
 from common import AppCntxt
 from common.tester.qss_editor import QssEditorWidget
 from common.appearance.qssmanager import QSSManager
+from common.diagnostics.profiler import SamplingProfiler
+from common.diagnostics.stalls import StallDetector
+from common.diagnostics.startup import StartupTimeline
 
 
 
@@ -55,6 +61,8 @@ class ColourSwatch(QWidget):
 class MainWindow(QMainWindow):
     # Signal to update UI safely from other threads
     update_status_signal = Signal(QLabel, str)
+    log_export_progress_signal = Signal(int)
+    icon_rendered_signal = Signal(int, str, object)  # generation, icon name, QImage (None if missing)
 
     def __init__(self):
         super().__init__()
@@ -102,10 +110,15 @@ class MainWindow(QMainWindow):
 
         # --- Icon Tab State ---
         self._icon_label_map: dict[str, QLabel] = {}
-        self._icon_notifier_connected = False
         self._loading_total = 0
         self._loaded_count = 0
-        self._icon_load_generation = 0  # Generation counter to discard old async results
+        self._icon_load_generation = 0
+        self._icon_load_group = None  # ThreadManager task group of the current icon load
+        # Type-ahead: reload the grid once typing pauses for 300 ms
+        self._icon_search_timer = QTimer(self)
+        self._icon_search_timer.setSingleShot(True)
+        self._icon_search_timer.setInterval(300)
+        self._icon_search_timer.timeout.connect(self.update_icon_display)
 
         self.setup_tabs()
         self.setup_logger_ui(sub_splitter) # Pass splitter to add logger
@@ -220,16 +233,33 @@ class MainWindow(QMainWindow):
         self.ui.main_tw.addTab(self.data_tab, "Data/Signals")
         self.setup_data_tab()
 
+        # Diagnostics Tab
+        self.diagnostics_tab = QWidget()
+        self.diagnostics_layout = QVBoxLayout(self.diagnostics_tab)
+        self.ui.main_tw.addTab(self.diagnostics_tab, "Diagnostics")
+        self.setup_diagnostics_tab()
+
 
 
     def setup_logger_ui(self, parent_splitter):
         logger_group = QGroupBox("Logs")
         logger_layout = QVBoxLayout(logger_group)
 
-        self.log_display = QTextEdit()
+        self.log_display = LogView(max_rows=10000)
         self.log_display.setFont(self._font_manager.get_font('log'))
         # self.log_display.setMaximumWidth(600)
-        # self.log_display.setReadOnly(True)
+
+        filter_layout = QHBoxLayout()
+        self.log_filter_level = QComboBox()
+        self.log_filter_level.addItems(["ALL", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"])
+        self.log_filter_text = QLineEdit()
+        self.log_filter_text.setPlaceholderText("Search logs...")
+        self.log_filter_level.currentTextChanged.connect(self.apply_log_filter)
+        self.log_filter_text.textChanged.connect(self.apply_log_filter)
+        filter_layout.addWidget(QLabel("Show:"))
+        filter_layout.addWidget(self.log_filter_level)
+        filter_layout.addWidget(self.log_filter_text)
+        logger_layout.addLayout(filter_layout)
         logger_layout.addWidget(self.log_display)
 
         controls_layout = QHBoxLayout()
@@ -248,13 +278,27 @@ class MainWindow(QMainWindow):
             btn.clicked.connect(lambda checked=False, l=level: getattr(self._logger, l)(f"This is a {l} message."))
             controls_layout.addWidget(btn)
 
+        self.log_export_progress = QProgressBar()
+        self.log_export_progress.setRange(0, 100)
+        self.log_export_progress.setMaximumWidth(120)
+        self.log_export_progress.setVisible(False)
+        self.log_export_progress_signal.connect(self.log_export_progress.setValue)
+        controls_layout.addWidget(self.log_export_progress)
+
         export_btn = QPushButton("Export")
         export_btn.clicked.connect(self.export_logs)
         controls_layout.addWidget(export_btn)
         logger_layout.addLayout(controls_layout)
 
         parent_splitter.addWidget(logger_group)
-        self._logger.log_updated.connect(lambda msg: self.log_display.append(msg))
+        # the tester shows debug output too; lines arrive in batches, so log storms stay cheap
+        self._logger.set_emit_level(logging.DEBUG)
+        self.log_display.attach(self._logger)
+
+    def apply_log_filter(self, *_):
+        level_str = self.log_filter_level.currentText()
+        min_level = logging.NOTSET if level_str == "ALL" else logging.getLevelName(level_str)
+        self.log_display.apply_filter(self._logger, min_level, self.log_filter_text.text())
 
     def on_log_level_changed(self, level_str: str):
         level = logging.getLevelName(level_str)
@@ -262,9 +306,28 @@ class MainWindow(QMainWindow):
         self._logger.info(f"Log level changed to {level_str}")
 
     def export_logs(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Save Log File", "", "Log Files (*.log)")
-        if path:
-            self._logger.export_to_file(path)
+        """Export the logs shown by the level filter in the background; the file name picks the format."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Log File", "",
+            "Log Files (*.log);;Compressed Log Files (*.log.gz *.log.zst);;JSON Lines (*.jsonl *.jsonl.gz *.jsonl.zst)")
+        if not path:
+            return
+        level_str = self.log_filter_level.currentText()
+        min_level = None if level_str == "ALL" else logging.getLevelName(level_str)
+        self.log_export_progress.setValue(0)
+        self.log_export_progress.setVisible(True)
+        future = start_export(AppCntxt.threader, self._logger.logs, path, min_level=min_level,
+                              progress=self.log_export_progress_signal.emit)
+        AppCntxt.threader.watch(future, lambda f: self._on_logs_exported(f, path))
+
+    def _on_logs_exported(self, future, path: str):
+        self.log_export_progress.setVisible(False)
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self._logger.error("Log export to %s failed: %s", path, future.exception())
+        else:
+            self._logger.info("Exported %d log records to %s", future.result(), path)
 
     def setup_tcp_server_tab(self):
         self.server_host_input = QLineEdit("127.0.0.1")
@@ -416,10 +479,11 @@ class MainWindow(QMainWindow):
             return "Finished."
 
         future = AppCntxt.threader.submit_blocking(sample_fn)
-        future.add_done_callback(
+        # watch() delivers completion on the GUI thread, so the label can be touched directly
+        AppCntxt.threader.watch(
+            future,
             lambda f: (
                 self.blocking_status_label.setText(f"Status: {f.result()}"),
-                # Use QTimer to reset the label after a delay to avoid another thread
                 QTimer.singleShot(3000, lambda: self.blocking_status_label.setText("Status: Idle"))
             )
         )
@@ -506,6 +570,118 @@ class MainWindow(QMainWindow):
 
         self.data_layout.addStretch()
 
+    def setup_diagnostics_tab(self):
+        """Sets up the UI for the in-app diagnostics tools."""
+        # --- Sampling Profiler Section ---
+        profiler_group = QGroupBox("Sampling Profiler")
+        profiler_layout = QFormLayout(profiler_group)
+
+        self.profiler_rate_spinbox = QSpinBox()
+        self.profiler_rate_spinbox.setRange(10, 1000)
+        self.profiler_rate_spinbox.setValue(200)
+        self.profiler_rate_spinbox.setSuffix(" Hz")
+        self.profiler_toggle_btn = QPushButton("Start Profiler")
+        self.profiler_toggle_btn.clicked.connect(self.toggle_profiler)
+        save_profile_btn = QPushButton("Save Collapsed Stacks...")
+        save_profile_btn.clicked.connect(self.save_profile)
+        self.profiler_status_label = QLabel("Status: Idle.")
+        self.profiler_top_display = QTextEdit()
+        self.profiler_top_display.setReadOnly(True)
+
+        profiler_layout.addRow("Sample Rate:", self.profiler_rate_spinbox)
+        profiler_layout.addRow(self.profiler_toggle_btn)
+        profiler_layout.addRow(save_profile_btn)
+        profiler_layout.addRow(self.profiler_status_label)
+        profiler_layout.addRow("Hottest Frames:", self.profiler_top_display)
+        self.diagnostics_layout.addWidget(profiler_group)
+
+        # --- GUI Stall Detector Section ---
+        stall_group = QGroupBox("GUI Stall Detector")
+        stall_layout = QFormLayout(stall_group)
+
+        self._stall_detector = None
+        self.stall_threshold_spinbox = QSpinBox()
+        self.stall_threshold_spinbox.setRange(20, 5000)
+        self.stall_threshold_spinbox.setValue(100)
+        self.stall_threshold_spinbox.setSuffix(" ms")
+        self.stall_toggle_btn = QPushButton("Start Detector")
+        self.stall_toggle_btn.clicked.connect(self.toggle_stall_detector)
+        simulate_stall_btn = QPushButton("Block GUI Thread (300 ms)")
+        simulate_stall_btn.clicked.connect(lambda: time.sleep(0.3))
+        refresh_stalls_btn = QPushButton("Refresh Report")
+        refresh_stalls_btn.clicked.connect(self.refresh_stall_report)
+        self.stall_report_display = QTextEdit()
+        self.stall_report_display.setReadOnly(True)
+
+        stall_layout.addRow("Threshold:", self.stall_threshold_spinbox)
+        stall_layout.addRow(self.stall_toggle_btn)
+        stall_layout.addRow(simulate_stall_btn)
+        stall_layout.addRow(refresh_stalls_btn)
+        stall_layout.addRow("Worst Call Sites:", self.stall_report_display)
+        self.diagnostics_layout.addWidget(stall_group)
+
+        # --- Startup Timeline Section ---
+        startup_group = QGroupBox("Startup Timeline")
+        startup_layout = QFormLayout(startup_group)
+
+        refresh_startup_btn = QPushButton("Refresh Timeline")
+        refresh_startup_btn.clicked.connect(self.refresh_startup_timeline)
+        self.startup_timeline_display = QTextEdit()
+        self.startup_timeline_display.setReadOnly(True)
+        self.startup_timeline_display.setFont(self._font_manager.get_font('log'))
+
+        startup_layout.addRow(refresh_startup_btn)
+        startup_layout.addRow("Phases (ms):", self.startup_timeline_display)
+        self.diagnostics_layout.addWidget(startup_group)
+        self.refresh_startup_timeline()
+
+        self.diagnostics_layout.addStretch()
+
+    def toggle_profiler(self):
+        """Starts or stops the sampling profiler and shows the hottest frames."""
+        profiler = SamplingProfiler()
+        if profiler.running:
+            samples = profiler.stop()
+            self.profiler_toggle_btn.setText("Start Profiler")
+            self.profiler_status_label.setText(f"Status: Stopped, {samples} samples over {profiler.elapsed:.1f}s.")
+            self.profiler_top_display.setPlainText(
+                "\n".join(f"{count:>6}  {frame}" for frame, count in profiler.top(30)))
+        else:
+            profiler.clear()
+            profiler.start(hz=self.profiler_rate_spinbox.value())
+            self.profiler_toggle_btn.setText("Stop Profiler")
+            self.profiler_status_label.setText("Status: Sampling...")
+
+    def toggle_stall_detector(self):
+        """Starts or stops the GUI stall detector with the chosen threshold."""
+        if self._stall_detector is not None and self._stall_detector.running:
+            self._stall_detector.stop()
+            self.stall_toggle_btn.setText("Start Detector")
+            self.refresh_stall_report()
+            return
+        if self._stall_detector is None:
+            self._stall_detector = StallDetector(parent=self)
+        self._stall_detector.threshold_ms = self.stall_threshold_spinbox.value()
+        self._stall_detector.start()
+        self.stall_toggle_btn.setText("Stop Detector")
+
+    def refresh_stall_report(self):
+        """Shows the call sites that blocked the GUI thread the longest."""
+        if self._stall_detector is not None:
+            self.stall_report_display.setPlainText(self._stall_detector.format_report(20))
+
+    def refresh_startup_timeline(self):
+        """Shows the startup phases with their wall / CPU time and budgets."""
+        self.startup_timeline_display.setPlainText(StartupTimeline().report())
+
+    def save_profile(self):
+        """Writes the collected samples as flamegraph collapsed stacks."""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Collapsed Stacks", "profile.folded",
+                                                   "Collapsed Stacks (*.folded *.txt)")
+        if file_path:
+            count = SamplingProfiler().write_collapsed(file_path)
+            self._logger.info(f"Wrote {count} collapsed stacks to {file_path}")
+
     def test_set_progress(self):
         """Calls the global progress update method in AppData."""
         value = self.progress_value_spinbox.value()
@@ -759,7 +935,7 @@ class MainWindow(QMainWindow):
         # --- Search and Refresh Controls ---
         self.icon_search_input = QLineEdit()
         self.icon_search_input.setPlaceholderText("Search icons...")
-        # Search is now triggered by the button, not textChanged
+        # Type-ahead is debounced; the button still searches immediately
         self.search_icons_btn = QPushButton("Search")
         self.refresh_icons_btn = QPushButton("Refresh List")
 
@@ -795,18 +971,13 @@ class MainWindow(QMainWindow):
 
         # --- Connect signals ---
         self.search_icons_btn.clicked.connect(self.update_icon_display)
+        self.icon_search_input.textChanged.connect(lambda _text: self._icon_search_timer.start())
         self.refresh_icons_btn.clicked.connect(self.refresh_icons)
         load_icon_btn.clicked.connect(self.load_new_icons)
         self.icon_color_combo.currentTextChanged.connect(self.update_icon_display)
         # self.icon_size_input.valueChanged.connect(self.update_icon_display)
 
-        # Connect the notifier from IconManager ONCE.
-        if not self._icon_notifier_connected:
-            try:
-                IconManager._notifier.icon_loaded.connect(self._on_icon_loaded)
-                self._icon_notifier_connected = True
-            except Exception as e:
-                self._logger.error(f"Failed to connect icon notifier: {e}")
+        self.icon_rendered_signal.connect(self._on_icon_loaded)
 
         self.update_icon_display()
 
@@ -817,9 +988,14 @@ class MainWindow(QMainWindow):
         self.update_icon_display()
 
     def update_icon_display(self):
-        # Increment generation to invalidate results from previous loads
+        self._icon_search_timer.stop()  # a pending type-ahead reload would only repeat this one
+        # Cancel icon loads of the previous search; queued renders are dropped without running
+        if self._icon_load_group is not None:
+            self._icon_load_group.cancel()
+        self._icon_load_group = AppCntxt.threader.task_group("icon-load", abandonable=True)
+        # Renders already running cannot be cancelled; the generation makes their results stale
         self._icon_load_generation += 1
-        current_generation = self._icon_load_generation
+        generation = self._icon_load_generation
 
         # Clear existing grid and state
         self.clear_layout(self.icon_grid_layout)
@@ -872,33 +1048,39 @@ class MainWindow(QMainWindow):
             # Map the icon name to its label for async update
             self._icon_label_map[name] = icon_label
 
-            # Request the icon, IconManager will load it in the background
-            try:
-                IconManager.get_pixmap(name, color, size, async_load=True)
-            except FileNotFoundError:
-                self._loading_total -= 1 # Decrement total if file is missing
+            # Request the icon; it is rendered on a worker and delivered via icon_rendered_signal
+            self._icon_load_group.submit_blocking(self._render_icon, generation, name, color, size)
 
         if self._loading_total <= 0:
             self.loading_label.setText("No icons found.")
 
-    def _on_icon_loaded(self, name: str, image: QImage):
-        """Slot connected to IconManager's notifier. Receives QImage from worker thread."""
-        # Discard signal if it's from a previous, obsolete loading operation
-        if self._icon_load_generation != getattr(self, '_icon_load_generation', 0):
+    def _render_icon(self, generation: int, name: str, color: str, size: int):
+        """Worker: render one icon and hand it to the GUI thread."""
+        try:
+            image = IconManager.load_image(name, color, size)
+        except FileNotFoundError:
+            image = None
+        self.icon_rendered_signal.emit(generation, name, image)
+
+    def _on_icon_loaded(self, generation: int, name: str, image: Optional[QImage]):
+        """Slot connected to icon_rendered_signal. Receives QImage from worker thread."""
+        # Discard results of a previous, obsolete loading operation
+        if generation != self._icon_load_generation:
             return
 
-        if name in self._icon_label_map:
+        if image is None:
+            self._loading_total -= 1  # Decrement total if file is missing
+        elif name in self._icon_label_map:
             label = self._icon_label_map[name]
             # Convert thread-safe QImage to QPixmap in the main GUI thread
             pixmap = QPixmap.fromImage(image)
             if not pixmap.isNull():
                 label.setPixmap(pixmap.scaled(label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
-
             self._loaded_count += 1
-            self.loading_label.setText(f"Loading {self._loaded_count}/{self._loading_total} icons...")
 
-            if self._loaded_count >= self._loading_total:
-                self.loading_label.hide()
+        self.loading_label.setText(f"Loading {self._loaded_count}/{self._loading_total} icons...")
+        if self._loaded_count >= self._loading_total:
+            self.loading_label.hide()
 
     def load_new_icons(self):
         files, _ = QFileDialog.getOpenFileNames(self, "Select SVG Icon(s)", "", "SVG Files (*.svg)")
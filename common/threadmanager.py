@@ -9,36 +9,70 @@ Features:
 - Uses a ThreadPoolExecutor for blocking/CPU tasks
 - Uses a token-based Semaphore to limit concurrent worker threads ("tokens")
 - Safe scheduling from GUI/main thread (both sync and async callables)
-- Emits simple events via callback registration
-- Graceful startup / shutdown
+- Multi-subscriber event bus with per-subscriber delivery context and bounded queues
+- Task groups with bulk cancel, per-task deadlines and cooperative cancel tokens
+- Qt bridge: future completion delivered as a queued signal on the GUI thread
+- Keyed single-flight submission (submit_once) with optional result TTL
+- Keyed debounce / throttle / token-bucket rate limiting that coalesce bursts into the latest call
+- Chunked parallel map / imap_unordered / reduce with bounded in-flight work (thread or process lane)
+- Periodic (every) and one-shot (at) jobs on a single timer wheel, with jitter, skipped missed
+  runs and coalescing of identical periodic jobs
+- Graceful startup / shutdown with drain / cancel / persist policies and progress reporting
+- Tracing hooks: jobs, coroutines, token waits and GUI deliveries become child spans of the
+  submitting span (see common.diagnostics.tracing)
 
 Design notes:
 - This is intended to be embedded in a PySide/Qt desktop app where the GUI runs on the main thread
   and the Threadmanager handles async / threaded work safely.
-- You may expand the event system into a full signal/slot system or use libraries like pyee.
+- Event subscribers choose where they run ("caller", "loop", "gui" or "pool"); non-caller
+  subscribers get a bounded queue so a slow subscriber never stalls the emitting thread.
 
 """
 from __future__ import annotations
 
 import asyncio
 import concurrent.futures
+import functools
 import inspect
 import logging
+import math
+import multiprocessing
+import queue
+import random
 import threading
 import time
+from collections import deque
 from contextlib import contextmanager
-from typing import Any, Callable, Coroutine, Dict, Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
 
+from PySide6.QtCore import QCoreApplication, QEventLoop, QObject, Qt, QThread, QTimer, Signal
+
+from common.diagnostics.tracing import Tracer
 from common.logger import Logger
 
 logger = Logger()
 logger._logger.addHandler(logging.NullHandler())
+tracer = Tracer()
+
+
+SHUTDOWN_POLICIES = ("drain", "cancel", "persist")
+# how long shutdown() waits for the loop to stop once the drain deadline has passed
+_STOP_GRACE = 0.5
 
 
 class ThreadmanagerError(RuntimeError):
     pass
 
 
+class TaskCancelledError(ThreadmanagerError):
+    """Raised inside a task (or from its future) when its CancelToken was cancelled."""
+
+
+class DeadlineExceededError(TaskCancelledError):
+    """Raised when a task did not finish before its deadline."""
+
+
 class _SingletonMeta:
     """Tiny singleton helper via attribute on the function module-level."""
 
@@ -77,7 +111,8 @@ class Token:
     def __enter__(self) -> "Token":
         # This is a blocking acquire
         logger.debug("Acquiring token (blocking)")
-        self._Threadmanager._token_semaphore.acquire()
+        with tracer.span("token.wait"):
+            self._Threadmanager._token_semaphore.acquire()
         logger.debug("Token acquired (blocking)")
         return self
 
@@ -95,6 +130,528 @@ class Token:
         self.release()
 
 
+class CancelToken:
+    """Cooperative cancellation flag handed to blocking functions.
+
+    A blocking function opts in by declaring a ``cancel_token`` parameter; it should then
+    poll ``cancel_token.cancelled`` (or call ``raise_if_cancelled()``) between units of work
+    and use ``cancel_token.sleep()`` instead of ``time.sleep()``.
+
+    Tokens can be chained: cancelling a parent cancels all of its children, and a child
+    never outlives its parent's deadline.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, parent: Optional["CancelToken"] = None):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[["CancelToken"], None]] = []
+        self._reason: Optional[str] = None
+        self._deadline = time.monotonic() + timeout if timeout is not None else None
+        if parent is not None:
+            if parent.deadline is not None and (self._deadline is None or parent.deadline < self._deadline):
+                self._deadline = parent.deadline
+            parent.add_callback(lambda p: self.cancel(p.reason or "cancelled"))
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Absolute deadline on the time.monotonic() clock, or None."""
+        return self._deadline
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._reason
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            self.cancel("deadline")
+            return True
+        return False
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the deadline (None when there is no deadline)."""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for cb in callbacks:
+            try:
+                cb(self)
+            except Exception:
+                logger.exception("CancelToken callback raised")
+
+    def add_callback(self, callback: Callable[["CancelToken"], None]) -> None:
+        """Call ``callback(token)`` once the token is cancelled (immediately if it already is)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            if self._reason == "deadline":
+                raise DeadlineExceededError("Task deadline exceeded")
+            raise TaskCancelledError(f"Task cancelled ({self._reason})")
+
+    def sleep(self, seconds: float) -> bool:
+        """Sleep up to ``seconds`` but wake early on cancel. Returns True if cancelled."""
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        return self._event.wait(seconds) or self.cancelled
+
+
+class TaskGroup:
+    """A set of related jobs that can be cancelled together.
+
+    Typical usage:
+        group = Threadmanager.task_group("icon-load")
+        for name in names:
+            group.submit_blocking(render, name)
+        ...
+        group.cancel()   # queued jobs never start, running ones see cancel_token.cancelled
+
+    Every job gets a child of the group token, so a group timeout acts as a deadline for
+    all of its jobs, and each job can carry a tighter deadline of its own. An ``abandonable``
+    group's jobs are cancelled rather than drained when the ThreadManager shuts down.
+    """
+
+    def __init__(self, Threadmanager: "ThreadManager", name: str = "", timeout: Optional[float] = None,
+                 abandonable: bool = False):
+        self._Threadmanager = Threadmanager
+        self.name = name
+        self.abandonable = abandonable
+        self._token = CancelToken(timeout=timeout)
+        self._futures: Set[concurrent.futures.Future] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def token(self) -> CancelToken:
+        return self._token
+
+    @property
+    def cancelled(self) -> bool:
+        return self._token.cancelled
+
+    def submit_blocking(self, fn: Callable[..., Any], *args, **kwargs) -> concurrent.futures.Future:
+        """Submit a blocking function as a member of this group."""
+        return self.submit_cancellable(fn, args, kwargs)
+
+    def submit_cancellable(self, fn: Callable[..., Any], args: tuple = (), kwargs: Optional[dict] = None, *,
+                           timeout: Optional[float] = None) -> concurrent.futures.Future:
+        """Like ThreadManager.submit_cancellable, with the job bound to this group."""
+        fut = self._Threadmanager.submit_cancellable(fn, args, kwargs, timeout=timeout, parent_token=self._token,
+                                                     abandonable=self.abandonable)
+        self._track(fut)
+        return fut
+
+    def run_async(self, coro: Coroutine, *, timeout: Optional[float] = None) -> concurrent.futures.Future:
+        """Schedule a coroutine as a member of this group."""
+        fut = self._Threadmanager.run_async(coro, timeout=timeout, parent_token=self._token,
+                                            abandonable=self.abandonable)
+        self._track(fut)
+        return fut
+
+    def _track(self, fut: concurrent.futures.Future) -> None:
+        with self._lock:
+            self._futures.add(fut)
+        fut.add_done_callback(self._discard)
+
+    def _discard(self, fut: concurrent.futures.Future) -> None:
+        with self._lock:
+            self._futures.discard(fut)
+
+    def pending(self) -> int:
+        """Number of jobs that have not finished yet."""
+        with self._lock:
+            return len(self._futures)
+
+    def cancel(self, reason: str = "cancelled") -> int:
+        """Cancel every outstanding job. Returns how many jobs were still outstanding."""
+        with self._lock:
+            outstanding = len(self._futures)
+        self._token.cancel(reason)
+        if outstanding:
+            logger.debug("Task group %r cancelled %s job(s)", self.name, outstanding)
+        return outstanding
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until all jobs are done. Returns False on timeout."""
+        with self._lock:
+            futures = list(self._futures)
+        _, not_done = concurrent.futures.wait(futures, timeout=timeout)
+        return not not_done
+
+
+class FutureWatcher(QObject):
+    """Bridges a concurrent.futures.Future to Qt.
+
+    ``finished(future)`` is always delivered as a queued signal on the GUI thread (the thread
+    of the QCoreApplication), whichever thread completes the future. A watcher created for
+    an already finished future still emits asynchronously, so connecting right after
+    construction never misses the signal. Watchers are one-shot and delete themselves after
+    delivering.
+    """
+    finished = Signal(object)
+    _completed = Signal()
+
+    # Keep watchers alive until they delivered, even if the caller drops its reference
+    _pending: Set["FutureWatcher"] = set()
+    _pending_lock = threading.Lock()
+
+    def __init__(self, future: concurrent.futures.Future,
+                 callback: Optional[Callable[[concurrent.futures.Future], None]] = None):
+        super().__init__()
+        app = QCoreApplication.instance()
+        if app is not None and self.thread() is not app.thread():
+            self.moveToThread(app.thread())
+        self._future = future
+        self._span = tracer.current() if tracer.enabled else None
+        self._done_at: Optional[int] = None
+        if callback is not None:
+            self.finished.connect(callback)
+        self._completed.connect(self._deliver, Qt.ConnectionType.QueuedConnection)
+        with FutureWatcher._pending_lock:
+            FutureWatcher._pending.add(self)
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: concurrent.futures.Future) -> None:
+        self._done_at = time.perf_counter_ns()
+        self._completed.emit()
+
+    @property
+    def future(self) -> concurrent.futures.Future:
+        return self._future
+
+    def _deliver(self) -> None:
+        with FutureWatcher._pending_lock:
+            FutureWatcher._pending.discard(self)
+        # queued_ms is how long the GUI event loop took to get to the completed future
+        with tracer.child("gui.future_delivered", self._span, self._done_at):
+            self.finished.emit(self._future)
+        self.deleteLater()
+
+
+class _GuiInvoker(QObject):
+    """Runs callables on the GUI thread via a queued signal."""
+    invoke = Signal(object)
+
+    _instance: Optional["_GuiInvoker"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        super().__init__()
+        self.invoke.connect(self._run, Qt.ConnectionType.QueuedConnection)
+
+    @staticmethod
+    def _run(fn: Callable[[], None]) -> None:
+        fn()
+
+    @classmethod
+    def get(cls) -> Optional["_GuiInvoker"]:
+        app = QCoreApplication.instance()
+        if app is None:
+            return None
+        with cls._instance_lock:
+            if cls._instance is None:
+                invoker = cls()
+                if invoker.thread() is not app.thread():
+                    invoker.moveToThread(app.thread())
+                cls._instance = invoker
+            return cls._instance
+
+
+class Subscription:
+    """One subscriber of a ThreadManager event (see ThreadManager.on).
+
+    Subscribers outside the "caller" context own a bounded queue of pending events that is
+    drained in their delivery context; ``dropped`` counts events lost to the queue policy.
+    """
+
+    CONTEXTS = ("caller", "loop", "gui", "pool")
+    POLICIES = ("drop_oldest", "drop_newest", "coalesce")
+
+    def __init__(self, Threadmanager: "ThreadManager", name: str, callback: Callable[..., None], *,
+                 context: str = "caller", max_queue: int = 1000, policy: str = "drop_oldest"):
+        if context not in self.CONTEXTS:
+            raise ValueError(f"Unknown delivery context {context!r}; expected one of {self.CONTEXTS}")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown queue policy {policy!r}; expected one of {self.POLICIES}")
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        self._Threadmanager = Threadmanager
+        self.name = name
+        self.callback = callback
+        self.context = context
+        self.max_queue = max_queue
+        self.policy = policy
+        self.active = True
+        self.dropped = 0
+        self._queue: deque = deque()
+        self._scheduled = False
+        self._lock = threading.Lock()
+
+    def cancel(self) -> None:
+        """Unsubscribe; events still queued are discarded."""
+        self._Threadmanager.off(self.name, self)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    def deliver(self, args: tuple, kwargs: dict) -> None:
+        if not self.active:
+            return
+        if self.context == "caller":
+            self._invoke(args, kwargs)
+            return
+        with self._lock:
+            if self.policy == "coalesce":
+                self.dropped += len(self._queue)
+                self._queue.clear()
+            elif len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                if self.policy == "drop_newest":
+                    return
+                self._queue.popleft()
+            self._queue.append((args, kwargs))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._schedule()
+
+    def _schedule(self) -> None:
+        tm = self._Threadmanager
+        try:
+            if self.context == "loop" and tm._loop is not None:
+                tm._loop.call_soon_threadsafe(self._drain)
+                return
+            if self.context == "pool" and tm._executor is not None:
+                tm._executor.submit(self._drain)
+                return
+            if self.context == "gui":
+                invoker = _GuiInvoker.get()
+                if invoker is not None:
+                    invoker.invoke.emit(self._drain)
+                    return
+        except RuntimeError:
+            pass
+        # Target context is gone (not started / shut down): deliver in the emitting thread
+        self._drain()
+
+    def _drain(self) -> None:
+        # Bounded batch per turn so a busy event cannot monopolise the GUI thread or loop
+        for _ in range(self.max_queue):
+            with self._lock:
+                if not self._queue or not self.active:
+                    self._queue.clear()
+                    self._scheduled = False
+                    return
+                args, kwargs = self._queue.popleft()
+            self._invoke(args, kwargs)
+        with self._lock:
+            if not self._queue:
+                self._scheduled = False
+                return
+        self._schedule()
+
+    def _invoke(self, args: tuple, kwargs: dict) -> None:
+        try:
+            self.callback(*args, **kwargs)
+        except Exception:
+            logger.exception("Event callback %r raised", self.name)
+
+
+class _Coalescer:
+    """Per-name state for debounce / throttle / rate_limit.
+
+    Only the latest pending call is kept; every caller coalesced into it shares ``future``.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: int = 1):
+        self.call: Optional[Tuple[Callable[..., Any], tuple, dict]] = None
+        self.future: Optional[concurrent.futures.Future] = None
+        self.handle: Optional[asyncio.TimerHandle] = None
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        if self.rate > 0:
+            self.tokens = min(float(self.burst), self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = max(self.updated, now)
+
+    def wait_time(self) -> float:
+        """Seconds until one token is available."""
+        return max(0.0, (1.0 - self.tokens) / self.rate) if self.rate > 0 else 0.0
+
+
+class PendingJob:
+    """Book-keeping for one job submitted through the ThreadManager, used by shutdown().
+
+    ``fn`` / ``args`` / ``kwargs`` are the call as submitted (``fn`` is None for coroutines),
+    so a persist handler can record jobs that never got to run.
+    """
+
+    __slots__ = ("future", "fn", "args", "kwargs", "abandonable", "started", "_runner")
+
+    def __init__(self, fn: Optional[Callable[..., Any]], args: tuple = (), kwargs: Optional[dict] = None,
+                 abandonable: bool = False, runner: Optional[Callable[[], Any]] = None):
+        self.future: Optional[concurrent.futures.Future] = None
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.abandonable = abandonable
+        # coroutines are handed to the loop straight away, so they count as started
+        self.started = fn is None
+        self._runner = runner
+
+    def run(self) -> Any:
+        self.started = True
+        if self._runner is not None:
+            return self._runner()
+        return self.fn(*self.args, **self.kwargs)
+
+    def cancel(self, reason: str) -> bool:
+        """Cancel the job (through its CancelToken when it has one). False if it is already running."""
+        token = getattr(self.future, "cancel_token", None)
+        if token is not None:
+            token.cancel(reason)
+        return self.future.cancel()
+
+
+@dataclass
+class ShutdownReport:
+    """What ThreadManager.shutdown() did with the jobs it found outstanding."""
+    policy: str
+    total: int = 0
+    completed: int = 0
+    cancelled: int = 0
+    persisted: int = 0
+    # still running when shutdown returned; their threads are left to finish on their own
+    abandoned: int = 0
+    timed_out: int = 0
+    elapsed: float = 0.0
+
+
+class ScheduledJob:
+    """Handle for a job registered with ThreadManager.every() or ThreadManager.at().
+
+    ``runs`` counts started runs, ``skipped`` counts runs dropped because the previous run was
+    still in progress or the loop fell behind; ``future`` is the latest run's future.
+    """
+
+    def __init__(self, Threadmanager: "ThreadManager", fn: Callable[..., Any], args: tuple, kwargs: dict,
+                 interval: Optional[float], jitter: float, key: Optional[Hashable]):
+        self._Threadmanager = Threadmanager
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.interval = interval
+        self.jitter = jitter
+        self.key = key
+        self.active = True
+        self.runs = 0
+        self.skipped = 0
+        self.future: Optional[concurrent.futures.Future] = None
+        # nominal (un-jittered) monotonic time of the next run, and its tick on the wheel
+        self.next_run = 0.0
+        self.due_tick = 0
+        self._refs = 1
+
+    def cancel(self) -> None:
+        """Stop the job. A periodic job shared by several every() callers stops once all cancelled."""
+        self._Threadmanager._cancel_scheduled(self)
+
+
+class _TimerWheel:
+    """Hashed timer wheel keyed on absolute tick numbers.
+
+    Jobs hash into ``slots`` buckets by due tick, so adding is O(1) and cancelling is a flag
+    (dead entries are dropped when their bucket comes round). Only the loop thread touches it;
+    the ThreadManager keeps a single TimerHandle armed for the next tick that has work.
+    """
+
+    def __init__(self, resolution: float = 0.02, slots: int = 256):
+        self.resolution = resolution
+        self.slots: List[List[ScheduledJob]] = [[] for _ in range(slots)]
+        self.origin = time.monotonic()
+        self.tick = 0
+        self.size = 0
+
+    def time_of(self, tick: int) -> float:
+        return self.origin + tick * self.resolution
+
+    def add(self, job: ScheduledJob, when: float) -> None:
+        job.due_tick = max(self.tick + 1, math.ceil((when - self.origin) / self.resolution))
+        self.slots[job.due_tick % len(self.slots)].append(job)
+        self.size += 1
+
+    def expire(self, now: float) -> List[ScheduledJob]:
+        """Advance to ``now`` and return the jobs that came due, earliest first."""
+        target = int((now - self.origin) / self.resolution + 1e-9)
+        if target <= self.tick:
+            return []
+        n = len(self.slots)
+        due = []
+        for t in range(self.tick + 1, self.tick + 1 + min(target - self.tick, n)):
+            bucket = self.slots[t % n]
+            if not bucket:
+                continue
+            keep = []
+            for job in bucket:
+                if job.active and job.due_tick > target:
+                    keep.append(job)
+                    continue
+                self.size -= 1
+                if job.active:
+                    due.append(job)
+            self.slots[t % n] = keep
+        self.tick = target
+        due.sort(key=lambda j: j.due_tick)
+        return due
+
+    def next_due(self) -> Optional[float]:
+        """Monotonic time of the earliest live entry, or None when the wheel is empty."""
+        n = len(self.slots)
+        best = None
+        for t in range(self.tick + 1, self.tick + 1 + n):
+            for job in self.slots[t % n]:
+                if job.active and (best is None or job.due_tick < best):
+                    best = job.due_tick
+            if best is not None and best <= t:
+                break
+        if best is None:
+            # only cancelled entries left
+            self.slots = [[] for _ in range(n)]
+            self.size = 0
+            return None
+        return self.time_of(best)
+
+
+def _run_chunk(fn: Callable[[Any], Any], chunk: List[Tuple[int, Any]]) -> List[Tuple[int, Any]]:
+    """Worker side of ThreadManager.map: apply fn to one chunk (module level so it pickles)."""
+    return [(i, fn(item)) for i, item in chunk]
+
+
+def _reduce_chunk(mapper: Optional[Callable[[Any], Any]], reducer: Callable[[Any, Any], Any],
+                  chunk: List[Tuple[int, Any]]) -> List[Tuple[int, Any]]:
+    """Worker side of ThreadManager.reduce: fold one chunk into a single partial result."""
+    values = (mapper(item) if mapper is not None else item for _, item in chunk)
+    return [(chunk[0][0], functools.reduce(reducer, values))]
+
+
 class ThreadManager:
     """Threadmanager manager.
 
@@ -107,6 +664,11 @@ class ThreadManager:
     or schedule blocking call:
         Threadmanager.submit_blocking(my_blocking_fn, arg1, kw=val)
 
+    Cancellation and deadlines:
+        group = Threadmanager.task_group("search", timeout=10)
+        group.submit_blocking(fn_with_cancel_token, arg1)
+        group.cancel()
+
     Token-based concurrency control:
         with Threadmanager.token():
             # do synchronous work with reserved token
@@ -126,6 +688,8 @@ class ThreadManager:
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._loop_thread: Optional[threading.Thread] = None
         self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # created lazily by the first lane="process" map / reduce
+        self._process_executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
         self._started = threading.Event()
         self._shutdown = threading.Event()
 
@@ -133,8 +697,31 @@ class ThreadManager:
         self._max_tokens = max_tokens
         self._token_semaphore = threading.Semaphore(max_tokens)
 
-        # lightweight event/callback registry
-        self._callbacks: Dict[str, Callable[..., None]] = {}
+        # event bus: name -> subscribers (copy-on-write lists, so emit() never takes the lock)
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._subscribers_lock = threading.Lock()
+
+        # single-flight registry: key -> (shared future, ttl, expiry on the monotonic clock or None)
+        self._once: Dict[Hashable, Tuple[concurrent.futures.Future, float, Optional[float]]] = {}
+        self._once_lock = threading.Lock()
+        self._once_sweep_at = 64
+
+        # debounce / throttle / rate-limit state, keyed by name
+        self._limiters: Dict[str, _Coalescer] = {}
+        self._limit_lock = threading.Lock()
+
+        # outstanding jobs (future -> PendingJob) for shutdown policies
+        self._jobs: Dict[concurrent.futures.Future, PendingJob] = {}
+        self._jobs_lock = threading.Lock()
+        self._closing = False
+        self._persist_handler: Optional[Callable[[List[PendingJob]], None]] = None
+
+        # periodic / scheduled jobs: one timer wheel per loop, coalescing key -> periodic job
+        self._wheel = _TimerWheel()
+        self._wheel_handle: Optional[asyncio.TimerHandle] = None
+        self._wheel_at: Optional[float] = None
+        self._periodic: Dict[Hashable, ScheduledJob] = {}
+        self._scheduled_lock = threading.Lock()
 
         # Lock for internal state
         self._state_lock = threading.RLock()
@@ -196,33 +783,186 @@ class ThreadManager:
     def is_running(self) -> bool:
         return self._started.is_set() and not self._shutdown.is_set()
 
-    def shutdown(self, wait: bool = True) -> None:
+    def shutdown(self, wait: bool = True, *, policy: str = "drain", timeout: float = 5.0,
+                 progress: Optional[Callable[[int, int], None]] = None) -> ShutdownReport:
+        """Stop the loop and the workers, settling outstanding jobs according to ``policy``.
+
+        Policies:
+            "drain": let outstanding jobs finish, for at most ``timeout`` seconds.
+            "cancel": cancel everything now without waiting; running jobs only see their
+                cancel_token.
+            "persist": hand jobs that have not started to the persist handler
+                (see set_persist_handler), then drain the running ones.
+
+        Jobs submitted with ``abandonable=True`` are cancelled and never waited for under every
+        policy, so they cannot hold up exit. Jobs still running at the deadline are reported as
+        timed out and left to finish on their own rather than joined.
+
+        Args:
+            wait: when False nothing is drained, as if ``timeout`` were 0.
+            policy: one of SHUTDOWN_POLICIES.
+            timeout: drain deadline in seconds.
+            progress: optional ``progress(settled, total)`` callback, called from this thread
+                while draining (e.g. to drive a splash screen).
+        """
+        if policy not in SHUTDOWN_POLICIES:
+            raise ValueError(f"policy must be one of {SHUTDOWN_POLICIES}, got {policy!r}")
+
         with self._state_lock:
+            report = ShutdownReport(policy)
             if not self._started.is_set() or self._loop is None:
-                return
+                return report
 
-            logger.debug("Shutting down Threadmanager")
+            started_at = time.monotonic()
+            deadline = started_at + (timeout if wait else 0.0)
+            logger.debug("Shutting down Threadmanager (policy=%s, timeout=%s)", policy, timeout)
 
-            try:
-                fut = asyncio.run_coroutine_threadsafe(self._async_shutdown(), self._loop)
-                try:
-                    fut.result(timeout=0.01)  # shorter timeout
-                except concurrent.futures.TimeoutError:
-                    pass
-            except RuntimeError:
-                pass
+            with self._jobs_lock:
+                self._closing = True
+                jobs = list(self._jobs.values())
+            for name in list(self._limiters):
+                self.cancel_pending(name)
 
-            if self._executor:
-                self._executor.shutdown(wait=wait)
-                self._executor = None
+            report.total = len(jobs)
+            to_drain = self._settle_outstanding(jobs, policy, report)
+            self._drain([job.future for job in to_drain], report, deadline, progress)
 
-            if self._loop_thread:
-                self._loop_thread.join(timeout=5.0)
-                self._loop_thread = None
+            grace = max(deadline - time.monotonic(), _STOP_GRACE)
+            self._stop_loop(grace)
+            # Only join the workers when nothing is left running; cancel_futures drops the rest
+            self._stop_workers(wait and not (report.timed_out or report.abandoned), grace)
 
             self._loop = None
             self._started.clear()
-            logger.debug("Threadmanager shutdown complete")
+            with self._jobs_lock:
+                self._jobs.clear()
+                self._closing = False
+
+            report.elapsed = time.monotonic() - started_at
+            logger.debug("Threadmanager shutdown complete in %.3fs (%s/%s completed, %s cancelled, "
+                         "%s persisted, %s abandoned, %s timed out)", report.elapsed, report.completed,
+                         report.total, report.cancelled, report.persisted, report.abandoned, report.timed_out)
+            return report
+
+    def _settle_outstanding(self, jobs: List[PendingJob], policy: str, report: ShutdownReport) -> List[PendingJob]:
+        """Cancel or persist ``jobs`` as ``policy`` says; returns the ones left to drain."""
+        persist = policy == "persist" and self._persist_handler is not None
+        if policy == "persist" and not persist:
+            logger.warning("Shutdown policy 'persist' without a persist handler, draining instead")
+
+        to_drain, to_persist = [], []
+        for job in jobs:
+            if job.abandonable or policy == "cancel":
+                # never waited for: queued ones are dropped, running ones see their token
+                if job.cancel("shutdown") or job.future.cancelled():
+                    report.cancelled += 1
+                elif not job.future.done():
+                    report.abandoned += 1
+                else:
+                    report.completed += 1
+            elif persist and not job.started and job.future.cancel():
+                to_persist.append(job)
+            else:
+                to_drain.append(job)
+
+        if to_persist:
+            report.persisted = len(to_persist)
+            try:
+                self._persist_handler(to_persist)
+            except Exception:
+                logger.exception("Threadmanager persist handler failed; %s job(s) lost", len(to_persist))
+        return to_drain
+
+    def _stop_loop(self, grace: float) -> None:
+        try:
+            fut = asyncio.run_coroutine_threadsafe(self._async_shutdown(), self._loop)
+            try:
+                fut.result(timeout=grace)
+            except concurrent.futures.TimeoutError:
+                logger.warning("Threadmanager loop tasks did not finish cancelling within %.2fs", grace)
+            # stopped from outside the coroutine so its result reaches us before the loop exits
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        except RuntimeError:
+            pass
+
+    def _stop_workers(self, join: bool, grace: float) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=join, cancel_futures=True)
+            self._executor = None
+
+        if self._process_executor:
+            self._process_executor.shutdown(wait=join, cancel_futures=True)
+            self._process_executor = None
+
+        if self._loop_thread:
+            self._loop_thread.join(timeout=grace)
+            self._loop_thread = None
+
+    @staticmethod
+    def _drain(futures: List[concurrent.futures.Future], report: ShutdownReport, deadline: float,
+               progress: Optional[Callable[[int, int], None]]) -> None:
+        """Wait for ``futures`` until ``deadline``, reporting progress, and fill in ``report``."""
+        settled = report.total - len(futures)
+        pending = set(futures)
+        while True:
+            done = {f for f in pending if f.done()}
+            pending -= done
+            settled += len(done)
+            if progress is not None:
+                try:
+                    progress(settled, report.total)
+                except Exception:
+                    logger.exception("Shutdown progress callback raised")
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
+            concurrent.futures.wait(pending, timeout=remaining, return_when=concurrent.futures.FIRST_COMPLETED)
+
+        for f in futures:
+            ThreadManager._count_drained(f, f in pending, report)
+        if report.timed_out:
+            logger.warning("Threadmanager shutdown: %s job(s) still running after the deadline", report.timed_out)
+
+    @staticmethod
+    def _count_drained(f: concurrent.futures.Future, overdue: bool, report: ShutdownReport) -> None:
+        if overdue:
+            # past the deadline: stop waiting, but still ask it to stop
+            token = getattr(f, "cancel_token", None)
+            if token is not None:
+                token.cancel("shutdown deadline")
+            if f.cancel():
+                report.cancelled += 1
+            else:
+                report.timed_out += 1
+        elif f.cancelled():
+            report.cancelled += 1
+        else:
+            report.completed += 1
+
+    def set_persist_handler(self, handler: Optional[Callable[[List[PendingJob]], None]]) -> None:
+        """Register ``handler(jobs)`` to store jobs that never started when shutting down with
+        policy="persist" (e.g. into a durable queue so they resume on the next start)."""
+        self._persist_handler = handler
+
+    def outstanding(self) -> int:
+        """Number of submitted jobs that have not finished yet."""
+        with self._jobs_lock:
+            return len(self._jobs)
+
+    def _track_job(self, job: PendingJob, fut: concurrent.futures.Future) -> concurrent.futures.Future:
+        job.future = fut
+        with self._jobs_lock:
+            self._jobs[fut] = job
+        fut.add_done_callback(self._untrack_job)
+        return fut
+
+    def _untrack_job(self, fut: concurrent.futures.Future) -> None:
+        with self._jobs_lock:
+            self._jobs.pop(fut, None)
+
+    def _check_open(self) -> None:
+        if self._closing:
+            raise ThreadmanagerError("Threadmanager is shutting down")
 
     async def _async_shutdown(self) -> None:
         # Cancel tasks except the current one
@@ -237,37 +977,612 @@ class ThreadManager:
         except Exception:
             pass
 
+        if self._wheel_handle is not None:
+            self._wheel_handle.cancel()
+        self._wheel, self._wheel_handle, self._wheel_at = _TimerWheel(), None, None
+        with self._scheduled_lock:
+            for job in self._periodic.values():
+                job.active = False
+            self._periodic.clear()
+
         self._shutdown.set()
-        self._loop.stop()
 
     # ---------------- scheduling -----------------
-    def run_async(self, coro: Coroutine) -> concurrent.futures.Future:
+    def run_async(self, coro: Coroutine, *, timeout: Optional[float] = None,
+                  parent_token: Optional[CancelToken] = None, abandonable: bool = False) -> concurrent.futures.Future:
         """Schedule a coroutine to run on the Threadmanager event loop from any thread.
 
         Returns a concurrent.futures.Future that can be waited on from the caller thread.
+        Cancelling the future cancels the underlying asyncio task.
+
+        Args:
+            timeout: optional deadline in seconds; the coroutine is cancelled and the future
+                fails with DeadlineExceededError once it passes.
+            parent_token: optional CancelToken (e.g. a TaskGroup token) that cancels the task.
+            abandonable: the task may be cancelled outright at shutdown instead of drained.
         """
+        logger.debug("Scheduling coroutine on Threadmanager loop")
+        return self._run_async(coro, timeout, parent_token, abandonable)
+
+    def _run_async(self, coro: Coroutine, timeout: Optional[float], parent_token: Optional[CancelToken],
+                   abandonable: bool) -> concurrent.futures.Future:
+        """run_async() without the log line, for internal callers that submit on every tick."""
         if not self._started.is_set() or self._loop is None:
             raise ThreadmanagerError("Threadmanager not started. Call start() before scheduling tasks.")
+        self._check_open()
 
         if not inspect.iscoroutine(coro):
             raise TypeError("run_async expects a coroutine object")
 
-        logger.debug("Scheduling coroutine on Threadmanager loop")
-        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+        token = None
+        if timeout is not None or parent_token is not None:
+            token = CancelToken(timeout=timeout, parent=parent_token)
+            coro = self._guard_coroutine(coro, token)
+
+        if tracer.enabled:
+            coro = tracer.bind_coroutine(coro, f"async:{getattr(coro, '__qualname__', 'coroutine')}")
+        fut = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        if token is not None:
+            fut.cancel_token = token
+            token.add_callback(lambda t: fut.cancel())
+        return self._track_job(PendingJob(None, abandonable=abandonable), fut)
+
+    @staticmethod
+    async def _guard_coroutine(coro: Coroutine, token: CancelToken) -> Any:
+        if token.cancelled:
+            coro.close()
+            token.raise_if_cancelled()
+        try:
+            return await asyncio.wait_for(coro, token.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError("Task deadline exceeded") from None
 
     def submit_blocking(self, fn: Callable[..., Any], *args, **kwargs) -> concurrent.futures.Future:
         """Submit a blocking function to the thread pool executor.
 
         If the Threadmanager is not started we start it automatically.
         """
+        logger.debug("Submitting blocking function to executor: %s", fn)
+        return self._submit_job(PendingJob(fn, args, kwargs))
+
+    def _submit_job(self, job: PendingJob) -> concurrent.futures.Future:
+        self._check_open()
         if not self._started.is_set():
             self.start()
 
         if self._executor is None:
             raise ThreadmanagerError("ThreadPoolExecutor is not available")
 
+        run = job.run
+        if tracer.enabled:
+            run = tracer.bind(run, f"job:{getattr(job.fn, '__qualname__', type(job.fn).__name__)}")
+        return self._track_job(job, self._executor.submit(run))
+
+    def submit_cancellable(self, fn: Callable[..., Any], args: tuple = (), kwargs: Optional[dict] = None, *,
+                           timeout: Optional[float] = None, parent_token: Optional[CancelToken] = None,
+                           abandonable: bool = False) -> concurrent.futures.Future:
+        """Submit a blocking function with cooperative cancellation and an optional deadline.
+
+        If ``fn`` declares a ``cancel_token`` parameter it receives the job's CancelToken, which
+        is also exposed as ``future.cancel_token``. Jobs cancelled (or past their deadline)
+        before a worker picks them up never run; running jobs are expected to poll the token.
+
+        Args:
+            fn: the blocking callable.
+            args / kwargs: arguments for ``fn`` (passed explicitly so they cannot clash with ours).
+            timeout: optional deadline in seconds from now.
+            parent_token: optional CancelToken (e.g. a TaskGroup token) that cancels this job.
+            abandonable: the job is safe to drop, so shutdown cancels it instead of waiting for it.
+        """
         logger.debug("Submitting blocking function to executor: %s", fn)
-        return self._executor.submit(fn, *args, **kwargs)
+        return self._submit_cancellable(fn, args, kwargs, timeout, parent_token, abandonable)
+
+    def _submit_cancellable(self, fn: Callable[..., Any], args: tuple, kwargs: Optional[dict],
+                            timeout: Optional[float], parent_token: Optional[CancelToken],
+                            abandonable: bool) -> concurrent.futures.Future:
+        """submit_cancellable() without the log line, for internal callers that submit on every tick."""
+        call_kwargs = dict(kwargs or {})
+        token = CancelToken(timeout=timeout, parent=parent_token)
+        if self._accepts_cancel_token(fn):
+            call_kwargs["cancel_token"] = token
+
+        def _run() -> Any:
+            token.raise_if_cancelled()
+            return fn(*args, **call_kwargs)
+
+        fut = self._submit_job(PendingJob(fn, args, dict(kwargs or {}), abandonable, runner=_run))
+        fut.cancel_token = token
+        # Queued jobs are dropped from the executor as soon as the token fires
+        token.add_callback(lambda t: fut.cancel())
+        if token.deadline is not None:
+            self._arm_deadline(token, fut)
+        return fut
+
+    def _arm_deadline(self, token: CancelToken, fut: concurrent.futures.Future) -> None:
+        """Fire the token at its deadline on the loop, so waiters are not held up by a queued job."""
+        loop = self._loop
+        if loop is None:
+            return
+
+        def _schedule() -> None:
+            handle = loop.call_later(token.remaining() or 0.0, lambda: token.cancelled)
+
+            def _disarm(_f: concurrent.futures.Future) -> None:
+                try:
+                    loop.call_soon_threadsafe(handle.cancel)
+                except RuntimeError:
+                    pass
+
+            fut.add_done_callback(_disarm)
+
+        try:
+            loop.call_soon_threadsafe(_schedule)
+        except RuntimeError:
+            pass
+
+    @staticmethod
+    def _accepts_cancel_token(fn: Callable[..., Any]) -> bool:
+        try:
+            return "cancel_token" in inspect.signature(fn).parameters
+        except (TypeError, ValueError):
+            return False
+
+    def task_group(self, name: str = "", timeout: Optional[float] = None, abandonable: bool = False) -> TaskGroup:
+        """Create a TaskGroup bound to this Threadmanager (see TaskGroup)."""
+        return TaskGroup(self, name=name, timeout=timeout, abandonable=abandonable)
+
+    # ---------------- parallel map / reduce -----------------
+    def map(self, fn: Callable[[Any], Any], iterable: Iterable[Any], *, chunksize: int = 1,
+            max_in_flight: Optional[int] = None, lane: str = "thread") -> Iterator[Any]:
+        """Parallel ``map(fn, iterable)`` returning an iterator of results in input order.
+
+        The input is consumed lazily in chunks of ``chunksize`` items and at most
+        ``max_in_flight`` chunks are queued, running or finished but waiting for an earlier
+        chunk (default: 2 x workers), so memory stays bounded for large or endless inputs.
+        Idle workers pull the next chunk from the shared queue, which balances uneven item
+        costs; keep chunks small for that.
+
+        Args:
+            lane: "thread" (shared thread pool; right for I/O and GIL-releasing work such as
+                Qt rendering) or "process" (a process pool for pure-Python CPU work; ``fn``
+                and the items must be picklable).
+
+        The first exception raised by ``fn`` propagates and cancels the remaining chunks.
+
+        Example:
+            images = list(Threadmanager.map(render_icon, names, chunksize=8))
+        """
+        # finished chunks waiting for an earlier one, by chunk number; they count against
+        # max_in_flight, so a slow head chunk stops new submissions instead of piling up results
+        pending: Dict[int, List[Tuple[int, Any]]] = {}
+        next_chunk = 0
+        for results in self._iter_completed(functools.partial(_run_chunk, fn), iterable,
+                                            chunksize, max_in_flight, lane, held=pending.__len__):
+            pending[results[0][0] // chunksize] = results
+            while next_chunk in pending:
+                for _, result in pending.pop(next_chunk):
+                    yield result
+                next_chunk += 1
+
+    def imap_unordered(self, fn: Callable[[Any], Any], iterable: Iterable[Any], *, chunksize: int = 1,
+                       max_in_flight: Optional[int] = None, lane: str = "thread") -> Iterator[Any]:
+        """Like map() but yields each result as soon as it is ready, in completion order."""
+        for results in self._iter_completed(functools.partial(_run_chunk, fn), iterable,
+                                            chunksize, max_in_flight, lane):
+            for _, result in results:
+                yield result
+
+    def reduce(self, reducer: Callable[[Any, Any], Any], iterable: Iterable[Any], initial: Any, *,
+               mapper: Optional[Callable[[Any], Any]] = None, chunksize: int = 16,
+               max_in_flight: Optional[int] = None, lane: str = "thread") -> Any:
+        """Parallel map-reduce: ``reducer(... reducer(initial, mapper(x0)) ..., mapper(xn))``.
+
+        Each chunk is mapped and folded on a worker; the caller only combines one partial
+        result per chunk, in completion order. ``reducer`` must therefore be associative and
+        commutative (sum, max, set union, merging dicts of counts, ...).
+
+        Example:
+            errors = Threadmanager.reduce(operator.add, settings.items(), 0, mapper=count_invalid)
+        """
+        result = initial
+        for results in self._iter_completed(functools.partial(_reduce_chunk, mapper, reducer), iterable,
+                                            chunksize, max_in_flight, lane):
+            for _, partial in results:
+                result = reducer(result, partial)
+        return result
+
+    def _iter_completed(self, run_chunk: Callable[[List[Tuple[int, Any]]], List[Tuple[int, Any]]],
+                        iterable: Iterable[Any], chunksize: int, max_in_flight: Optional[int],
+                        lane: str, held: Callable[[], int] = lambda: 0) -> Iterator[List[Tuple[int, Any]]]:
+        """Feed chunks of (index, item) to ``lane`` with bounded in-flight work; yield each chunk's
+        results as it completes.
+
+        ``held()`` is the number of finished chunks the caller still buffers; they count against
+        the in-flight limit.
+        """
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+        executor = self._lane_executor(lane)
+        limit = max_in_flight or 2 * self._max_workers
+        items = enumerate(iterable)
+        in_flight: Set[concurrent.futures.Future] = set()
+        # fed by done callbacks, which (unlike concurrent.futures.wait) also fire for futures
+        # cancelled in the queue, e.g. by shutdown()
+        completed: "queue.SimpleQueue[concurrent.futures.Future]" = queue.SimpleQueue()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) + held() < limit:
+                    chunk = [pair for _, pair in zip(range(chunksize), items)]
+                    if not chunk:
+                        exhausted = True
+                        break
+                    fut = self._submit_chunk(executor, lane, run_chunk, chunk)
+                    in_flight.add(fut)
+                    fut.add_done_callback(completed.put)
+                if not in_flight:
+                    return
+                fut = completed.get()
+                in_flight.discard(fut)
+                yield fut.result()
+        finally:
+            for fut in in_flight:
+                fut.cancel()
+
+    def _submit_chunk(self, executor: concurrent.futures.Executor, lane: str,
+                      run_chunk: Callable[..., Any], chunk: List[Tuple[int, Any]]) -> concurrent.futures.Future:
+        """Submit one chunk as a tracked job, so shutdown() policies and reports cover it."""
+        job = PendingJob(run_chunk, (chunk,))
+        if lane == "thread":
+            return self._submit_job(job)
+        self._check_open()
+        return self._track_job(job, executor.submit(run_chunk, chunk))
+
+    def _lane_executor(self, lane: str) -> concurrent.futures.Executor:
+        if lane == "thread":
+            if not self._started.is_set():
+                self.start()
+            if self._executor is None:
+                raise ThreadmanagerError("ThreadPoolExecutor is not available")
+            return self._executor
+        if lane == "process":
+            with self._state_lock:
+                if self._process_executor is None:
+                    # spawn: forking a process that runs Qt and several threads is unsafe
+                    self._process_executor = concurrent.futures.ProcessPoolExecutor(
+                        mp_context=multiprocessing.get_context("spawn"))
+                return self._process_executor
+        raise ValueError(f"Unknown lane {lane!r}; expected 'thread' or 'process'")
+
+    # ---------------- single-flight -----------------
+    def submit_once(self, key: Hashable, fn: Callable[..., Any], args: tuple = (), kwargs: Optional[dict] = None, *,
+                    ttl: float = 0.0) -> concurrent.futures.Future:
+        """Run ``fn`` once per ``key`` no matter how many callers ask for it concurrently.
+
+        While a job for ``key`` is in flight every further submission gets the same future.
+        With ``ttl > 0`` a successful result keeps being shared for ``ttl`` seconds after it
+        completed; failures and cancellations are never cached. Coroutine functions run on the
+        Threadmanager loop, anything else on the thread pool.
+
+        The returned future is shared: callers must not cancel it on behalf of others.
+
+        Example:
+            fut = Threadmanager.submit_once(("icon", name, colour, size), render, (name, colour, size), ttl=5)
+        """
+        kwargs = kwargs or {}
+        now = time.monotonic()
+        with self._once_lock:
+            entry = self._once.get(key)
+            if entry is not None:
+                if self._once_valid(entry, now):
+                    logger.debug("submit_once: joined existing job for %r", key)
+                    return entry[0]
+                del self._once[key]
+
+            if inspect.iscoroutinefunction(fn):
+                fut = self.run_async(fn(*args, **kwargs))
+            else:
+                fut = self.submit_blocking(fn, *args, **kwargs)
+            self._once[key] = (fut, ttl, None)
+            if len(self._once) >= self._once_sweep_at:
+                self._sweep_once(now)
+
+        fut.add_done_callback(lambda f: self._once_done(key, f, ttl))
+        return fut
+
+    @staticmethod
+    def _once_valid(entry: Tuple[concurrent.futures.Future, float, Optional[float]], now: float) -> bool:
+        fut, ttl, expiry = entry
+        if not fut.done():
+            return True
+        if ttl <= 0 or fut.cancelled() or fut.exception() is not None:
+            return False
+        # expiry is None while the done-callback has not run yet: the result is brand new
+        return expiry is None or now < expiry
+
+    def _once_done(self, key: Hashable, fut: concurrent.futures.Future, ttl: float) -> None:
+        with self._once_lock:
+            entry = self._once.get(key)
+            if entry is None or entry[0] is not fut:
+                return
+            if ttl > 0 and not fut.cancelled() and fut.exception() is None:
+                self._once[key] = (fut, ttl, time.monotonic() + ttl)
+            else:
+                del self._once[key]
+
+    def _sweep_once(self, now: float) -> None:
+        """Drop expired cached results (caller holds _once_lock)."""
+        expired = [k for k, entry in self._once.items() if not self._once_valid(entry, now)]
+        for k in expired:
+            del self._once[k]
+        self._once_sweep_at = max(64, 2 * len(self._once))
+
+    def forget_once(self, key: Optional[Hashable] = None) -> None:
+        """Drop the cached result for ``key`` (or all keys) so the next submit_once runs again."""
+        with self._once_lock:
+            if key is None:
+                self._once = {k: v for k, v in self._once.items() if not v[0].done()}
+            else:
+                entry = self._once.get(key)
+                if entry is not None and entry[0].done():
+                    del self._once[key]
+
+    # ---------------- debounce / throttle / rate limit -----------------
+    def debounce(self, name: str, fn: Callable[..., Any], args: tuple = (), kwargs: Optional[dict] = None, *,
+                 delay: float = 0.25) -> concurrent.futures.Future:
+        """Run ``fn`` once calls for ``name`` have been quiet for ``delay`` seconds.
+
+        Each call replaces the pending one (latest arguments win) and restarts the timer.
+        All callers of one burst get the same future, resolved with the result of the call
+        that finally runs. Coroutine functions run on the loop, others on the thread pool.
+
+        Example (type-ahead):
+            search_edit.textChanged.connect(lambda t: Threadmanager.debounce("search", search, (t,), delay=0.3))
+        """
+        loop = self._require_loop()
+        with self._limit_lock:
+            c = self._limiters.get(name)
+            if c is None or c.rate > 0:
+                c = self._limiters[name] = _Coalescer()
+            c.call = (fn, args, kwargs or {})
+            if c.future is None:
+                c.future = concurrent.futures.Future()
+            fut = c.future
+
+        def _rearm() -> None:
+            with self._limit_lock:
+                if c.handle is not None:
+                    c.handle.cancel()
+                c.handle = loop.call_later(delay, self._fire_limiter, name, c)
+
+        loop.call_soon_threadsafe(_rearm)
+        return fut
+
+    def throttle(self, name: str, fn: Callable[..., Any], args: tuple = (), kwargs: Optional[dict] = None, *,
+                 interval: float = 0.25) -> concurrent.futures.Future:
+        """Run ``fn`` at most once per ``interval`` seconds for ``name``.
+
+        The first call of a burst runs immediately; later calls in the same interval collapse
+        into one trailing call with the latest arguments.
+        """
+        return self.rate_limit(name, fn, args, kwargs, rate=1.0 / interval, burst=1)
+
+    def rate_limit(self, name: str, fn: Callable[..., Any], args: tuple = (), kwargs: Optional[dict] = None, *,
+                   rate: float, burst: int = 1) -> concurrent.futures.Future:
+        """Token-bucket limiter: up to ``burst`` immediate calls, refilled at ``rate`` calls/second.
+
+        Calls that find the bucket empty do not queue up: they collapse into a single pending
+        call (latest arguments win) that runs as soon as a token is available.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        loop = self._require_loop()
+        now = time.monotonic()
+        with self._limit_lock:
+            c = self._limiters.get(name)
+            if c is None or c.rate != rate or c.burst != burst:
+                c = self._limiters[name] = _Coalescer(rate=rate, burst=burst)
+            c.refill(now)
+            if c.call is None and c.tokens >= 1.0:
+                c.tokens -= 1.0
+                run_now = True
+            else:
+                run_now = False
+                c.call = (fn, args, kwargs or {})
+                if c.future is None:
+                    c.future = concurrent.futures.Future()
+                fut = c.future
+
+        if run_now:
+            fut = concurrent.futures.Future()
+            self._dispatch(fn, args, kwargs or {}, fut)
+            return fut
+
+        def _arm() -> None:
+            with self._limit_lock:
+                if c.handle is None and c.call is not None:
+                    c.handle = loop.call_later(c.wait_time(), self._fire_limiter, name, c)
+
+        loop.call_soon_threadsafe(_arm)
+        return fut
+
+    def cancel_pending(self, name: str) -> bool:
+        """Drop the pending (not yet started) call for ``name``. Returns True if one was dropped."""
+        with self._limit_lock:
+            c = self._limiters.get(name)
+            if c is None or c.call is None:
+                return False
+            fut, c.call, c.future = c.future, None, None
+            handle, c.handle = c.handle, None
+        if handle is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(handle.cancel)
+        if fut is not None:
+            fut.cancel()
+        return True
+
+    def _fire_limiter(self, name: str, c: _Coalescer) -> None:
+        """Timer callback (loop thread): run the pending call of a limiter if it is due."""
+        with self._limit_lock:
+            c.handle = None
+            if c.call is None:
+                return
+            if c.rate > 0:
+                c.refill(time.monotonic())
+                if c.tokens < 1.0:
+                    c.handle = self._loop.call_later(c.wait_time(), self._fire_limiter, name, c)
+                    return
+                c.tokens -= 1.0
+            (fn, args, kwargs), fut = c.call, c.future
+            c.call, c.future = None, None
+        logger.debug("Running coalesced call %r", name)
+        self._dispatch(fn, args, kwargs, fut)
+
+    def _dispatch(self, fn: Callable[..., Any], args: tuple, kwargs: dict, fut: concurrent.futures.Future) -> None:
+        """Run a coroutine function on the loop or a plain callable on the pool, resolving ``fut``."""
+        if not fut.set_running_or_notify_cancel():
+            return
+        try:
+            if inspect.iscoroutinefunction(fn):
+                inner = self.run_async(fn(*args, **kwargs))
+            else:
+                inner = self.submit_blocking(fn, *args, **kwargs)
+        except Exception as ex:
+            fut.set_exception(ex)
+            return
+
+        def _copy(src: concurrent.futures.Future) -> None:
+            if src.cancelled():
+                fut.set_exception(concurrent.futures.CancelledError())
+            elif src.exception() is not None:
+                fut.set_exception(src.exception())
+            else:
+                fut.set_result(src.result())
+
+        inner.add_done_callback(_copy)
+
+    def _require_loop(self) -> asyncio.AbstractEventLoop:
+        if not self._started.is_set() or self._loop is None:
+            raise ThreadmanagerError("Threadmanager not started. Call start() before scheduling tasks.")
+        return self._loop
+
+    # ---------------- periodic / scheduled jobs -----------------
+    def every(self, interval: float, fn: Callable[..., Any], args: tuple = (), kwargs: Optional[dict] = None, *,
+              jitter: float = 0.0, delay: Optional[float] = None, key: Optional[Hashable] = None) -> ScheduledJob:
+        """Run ``fn(*args, **kwargs)`` every ``interval`` seconds.
+
+        All periodic and scheduled jobs share one timer wheel on the loop instead of a sleeping
+        coroutine each. Coroutine functions run on the loop, anything else on the pool (receiving
+        a ``cancel_token`` if it declares one). Runs are abandonable at shutdown.
+
+        A run is skipped (not queued) while the previous one is still in progress, and when the
+        loop falls behind the missed runs are skipped rather than fired back to back.
+
+        Identical registrations (same fn, arguments and interval, or the same ``key``) are
+        coalesced: the existing job is returned and stays active until every caller cancelled it.
+
+        Args:
+            interval: seconds between runs.
+            fn / args / kwargs: the job.
+            jitter: up to this many seconds are added at random to each run, so many pollers
+                started together do not fire in lockstep.
+            delay: seconds before the first run (default: one interval).
+            key: explicit coalescing key (default: derived from fn, arguments and interval).
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        kwargs = dict(kwargs or {})
+        if key is None:
+            key = (fn, args, tuple(sorted(kwargs.items())), interval)
+        try:
+            hash(key)
+        except TypeError:
+            key = None  # unhashable arguments: no coalescing
+
+        with self._scheduled_lock:
+            job = self._periodic.get(key) if key is not None else None
+            if job is not None and job.active:
+                job._refs += 1
+                return job
+            job = ScheduledJob(self, fn, args, kwargs, interval, jitter, key)
+            if key is not None:
+                self._periodic[key] = job
+        self._schedule_job(job, interval if delay is None else delay)
+        return job
+
+    def at(self, when: Any, fn: Callable[..., Any], args: tuple = (), kwargs: Optional[dict] = None, *,
+           jitter: float = 0.0) -> ScheduledJob:
+        """Run ``fn(*args, **kwargs)`` once at ``when`` (a datetime or a time.time() timestamp).
+
+        Times in the past run on the next tick.
+        """
+        timestamp = when.timestamp() if hasattr(when, "timestamp") else float(when)
+        job = ScheduledJob(self, fn, args, dict(kwargs or {}), None, jitter, None)
+        self._schedule_job(job, timestamp - time.time())
+        return job
+
+    def _schedule_job(self, job: ScheduledJob, delay: float) -> None:
+        loop = self._require_loop()
+        job.next_run = time.monotonic() + max(0.0, delay)
+        loop.call_soon_threadsafe(self._wheel_add, job, job.next_run + random.uniform(0.0, job.jitter))
+
+    def _cancel_scheduled(self, job: ScheduledJob) -> None:
+        with self._scheduled_lock:
+            job._refs -= 1
+            if job._refs > 0:
+                return
+            job.active = False
+            if job.key is not None and self._periodic.get(job.key) is job:
+                del self._periodic[job.key]
+
+    def _wheel_add(self, job: ScheduledJob, when: float) -> None:
+        # loop thread only
+        if not job.active:
+            return
+        self._wheel.add(job, when)
+        if self._wheel_at is None or when < self._wheel_at:
+            self._arm_wheel()
+
+    def _arm_wheel(self) -> None:
+        if self._wheel_handle is not None:
+            self._wheel_handle.cancel()
+            self._wheel_handle = None
+        self._wheel_at = self._wheel.next_due()
+        if self._wheel_at is not None:
+            # asyncio's loop clock is time.monotonic(), the wheel's clock
+            self._wheel_handle = self._loop.call_at(self._wheel_at, self._run_wheel)
+
+    def _run_wheel(self) -> None:
+        self._wheel_handle = None
+        now = time.monotonic()
+        for job in self._wheel.expire(now):
+            self._fire_scheduled(job, now)
+        self._arm_wheel()
+
+    def _fire_scheduled(self, job: ScheduledJob, now: float) -> None:
+        if job.future is not None and not job.future.done():
+            job.skipped += 1  # still busy with the previous run
+        else:
+            try:
+                # runs are counted on the job instead of logged: a poller fires many times a second
+                if inspect.iscoroutinefunction(job.fn):
+                    job.future = self._run_async(job.fn(*job.args, **job.kwargs), None, None, True)
+                else:
+                    job.future = self._submit_cancellable(job.fn, job.args, job.kwargs, None, None, True)
+                job.runs += 1
+            except ThreadmanagerError:
+                job.active = False  # shutting down
+                return
+
+        if job.interval is None:
+            job.active = False
+            return
+        next_run = job.next_run + job.interval
+        if next_run <= now:
+            missed = int((now - next_run) / job.interval) + 1
+            job.skipped += missed
+            next_run += missed * job.interval
+        job.next_run = next_run
+        self._wheel.add(job, next_run + random.uniform(0.0, job.jitter))
 
     # ---------------- tokens -----------------
     @contextmanager
@@ -319,28 +1634,57 @@ class ThreadManager:
         return Token(self)
 
     # ---------------- events / callbacks -----------------
-    def on(self, name: str, callback: Callable[..., None]) -> None:
-        """Register a callback for a named event. Overwrites existing callback with same name.
+    def on(self, name: str, callback: Callable[..., None], *, context: str = "caller",
+           max_queue: int = 1000, policy: str = "drop_oldest") -> Subscription:
+        """Subscribe a callback to a named event. Any number of callbacks may subscribe.
+
+        Args:
+            context: where the callback runs -
+                "caller": synchronously in the thread that calls emit() (no queue);
+                "loop":   on the Threadmanager event loop thread;
+                "gui":    on the Qt GUI thread (queued);
+                "pool":   on a thread pool worker.
+            max_queue: bound of the subscriber's pending-event queue (non-caller contexts).
+            policy: what to do when the queue is full -
+                "drop_oldest": discard the oldest pending event;
+                "drop_newest": discard the incoming event;
+                "coalesce":    keep only the latest event (ideal for progress / state updates).
+
+        Returns a Subscription; call its cancel() (or off()) to unsubscribe.
 
         Example events might be: 'initialise_done', 'task_complete'
         """
         if not callable(callback):
             raise TypeError("callback must be callable")
-        self._callbacks[name] = callback
+        sub = Subscription(self, name, callback, context=context, max_queue=max_queue, policy=policy)
+        with self._subscribers_lock:
+            self._subscribers[name] = self._subscribers.get(name, []) + [sub]
+        return sub
+
+    def off(self, name: str, callback: Optional[Callable[..., None]] = None) -> int:
+        """Unsubscribe ``callback`` (or every subscriber) from ``name``. Returns how many were removed."""
+        with self._subscribers_lock:
+            subs = self._subscribers.get(name, [])
+            removed = [sub for sub in subs if callback is None or sub.callback == callback or sub is callback]
+            remaining = [sub for sub in subs if sub not in removed]
+            if remaining:
+                self._subscribers[name] = remaining
+            else:
+                self._subscribers.pop(name, None)
+        for sub in removed:
+            sub.active = False
+        return len(removed)
 
     def emit(self, name: str, *args, **kwargs) -> None:
-        """Emit an event by calling the registered callback. Called from any thread.
+        """Emit an event to every subscriber. Safe to call from any thread.
 
-        If a callback was registered it will be invoked in the thread that calls emit().
-        If you need the callback executed on the Threadmanager loop, schedule it with run_async.
+        "caller" subscribers run before emit() returns; all others are queued and delivered
+        in their own context, so emit() never waits for them.
         """
-        cb = self._callbacks.get(name)
-        if cb:
-            try:
-                cb(*args, **kwargs)
-            except Exception:
-                logger.exception("Event callback %r raised", name)
+        for sub in self._subscribers.get(name, ()):
+            sub.deliver(args, kwargs)
 
+    # ---------------- utility helpers -----------------
     # ---------------- utility helpers -----------------
     def run_coroutine_blocking(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
         """Convenience: schedule a coroutine on the Threadmanager loop and block until it's done.
@@ -350,6 +1694,54 @@ class ThreadManager:
         fut = self.run_async(coro)
         return fut.result(timeout=timeout)
 
+    # ---------------- Qt integration -----------------
+    def watch(self, future: concurrent.futures.Future,
+              callback: Optional[Callable[[concurrent.futures.Future], None]] = None) -> FutureWatcher:
+        """Return a FutureWatcher whose ``finished(future)`` signal fires on the GUI thread.
+
+        Example:
+            fut = Threadmanager.submit_blocking(load)
+            Threadmanager.watch(fut, lambda f: label.setText(str(f.result())))
+        """
+        return FutureWatcher(future, callback)
+
+    def wait_future(self, future: concurrent.futures.Future, timeout: Optional[float] = None) -> Any:
+        """Wait for a future from the GUI thread without busy-polling, then return its result.
+
+        A local QEventLoop keeps the UI responsive (paints, progress updates) while the
+        thread sleeps in the native event dispatcher; it quits as soon as the future completes.
+        Without a Qt application this simply blocks on ``future.result()``.
+
+        Raises concurrent.futures.TimeoutError if ``timeout`` elapses first.
+        """
+        app = QCoreApplication.instance()
+        if app is None or QThread.currentThread() is not app.thread():
+            return future.result(timeout=timeout)
+
+        if not future.done():
+            loop = QEventLoop()
+            watcher = FutureWatcher(future)
+            watcher.finished.connect(loop.quit)
+            if timeout is not None:
+                timer = QTimer(loop)
+                timer.setSingleShot(True)
+                timer.timeout.connect(loop.quit)
+                timer.start(int(timeout * 1000))
+            if not future.done():
+                loop.exec()
+            if not future.done():
+                raise concurrent.futures.TimeoutError()
+        return future.result()
+
+    @staticmethod
+    def as_awaitable(future: concurrent.futures.Future) -> "asyncio.Future":
+        """Wrap a Threadmanager future so it can be awaited from another asyncio loop.
+
+        Use this from coroutines running on a Qt-integrated event loop (e.g. PySide6.QtAsyncio)
+        to await background work without blocking the GUI thread.
+        """
+        return asyncio.wrap_future(future, loop=asyncio.get_running_loop())
+
 
 # ---------------- example usage -----------------
 if __name__ == "__main__":
@@ -1,11 +1,13 @@
-import asyncio
+import concurrent.futures
 import hashlib
+import logging
+import os
 import sys
-import time
+import threading
 
 from PySide6.QtWidgets import QApplication
 
-from common import initialise_context, AppCntxt, AppData
+from common import build_startup_pipeline, AppCntxt, AppData
 from common import threadmanager
 from common.tcpinterface.backendclient import BackendClient
 from common.configuration.parser import ConfigurationManager
@@ -13,24 +15,47 @@ from common.appearance.fontmanager import FontManager
 from common.logger import Logger
 from common.appearance.stylemanager import StyleManager
 from common.qwidgets.popup.popup_c import Popup
+from common.diagnostics.stalls import StallDetector
+from common.diagnostics.startup import StartupTimeline
+from common.tcpinterface.logforward import BackendLogCollector
 from frontend.mainwindow.mainwindow_c import MainWindow
 from frontend.splash.splash_c import Splash
 
 
 def run():
-    app = QApplication(sys.argv)
-    initialise_context()
+    timeline = StartupTimeline()
+    with timeline.phase("qapplication"):
+        app = QApplication(sys.argv)
+    with timeline.phase("initialise_context"):
+        pipeline = build_startup_pipeline(progress=_on_startup_progress)
+        # The handshake only needs the client, so it overlaps palette and font setup
+        pipeline.add("backend initialise", _initialise_backend, requires=("backend client",))
+        pipeline.start()
+        # The splash needs the palette and fonts; the rest keeps running behind it
+        pipeline.wait("style", "fonts")
     AppCntxt.logger.info("Welcome!")
 
-    splash = Splash(AppCntxt.name, f"Version {AppCntxt.version}")
-    splash.show()
-    AppCntxt.data.set_progress(5, "Initialising application...")
-    QApplication.processEvents()
-    status, error = _initialise_app()
+    # Watch the GUI thread for stalls (APP_STALL_MS=0 turns the detector off)
+    stall_ms = int(os.environ.get("APP_STALL_MS", 250))
+    if stall_ms > 0:
+        AppCntxt.stalls = StallDetector(stall_ms, parent=app)
+        AppCntxt.stalls.start()
+
+    with timeline.phase("splash"):
+        splash = Splash(AppCntxt.name, f"Version {AppCntxt.version}")
+        splash.show()
+        _on_startup_progress(pipeline.finished, len(pipeline.steps), "splash")
+        QApplication.processEvents()
+    status, error = _initialise_app(pipeline)
     if status:
-        window = MainWindow()
-        window.window_closing.connect(_on_app_closing)
-        window.show()
+        with timeline.phase("main window"):
+            window = MainWindow()
+            window.window_closing.connect(_on_app_closing)
+            window.show()
+        timeline.mark("window shown")
+        # Deferred background jobs (and leftovers from the last session) start after the UI is up
+        AppCntxt.jobs.start(delay=5.0)
+        _log_startup_timeline(timeline)
         AppCntxt.logger.info("Ready")
 
     if not status:
@@ -41,25 +66,39 @@ def run():
     splash.close()
     app.exec()
 
-def _initialise_app():
-    def initialise_backend():
-        with AppCntxt.threader.token():
-            result = AppCntxt.backend.call("sdk.initialise")
-        if result['status'] == 'ok': return True, result['result']
-        elif result['status'] == 'error': return False, result['message']
-        return False, None
+def _on_startup_progress(finished, total, step):
+    # the pipeline takes the splash to 90%, the main window does the rest
+    value = 5 + int(85 * finished / total)
+    AppCntxt.data.set_progress(value, f"({value}%)  Loaded {step}...")
+
+def _log_startup_timeline(timeline):
+    AppCntxt.logger.info("Startup timeline (ms):\n" + timeline.report())
+    for phase in timeline.over_budget():
+        AppCntxt.logger.warning("Startup phase '%s' took %.0f ms (budget %.0f ms)",
+                                phase.name, phase.wall_ms, phase.budget_ms)
+    path = os.environ.get("APP_STARTUP_TIMELINE")
+    if path:
+        timeline.write_json(path)
+
+def _initialise_backend():
+    with AppCntxt.threader.token():
+        result = AppCntxt.backend.call("sdk.initialise")
+    if result['status'] == 'ok': return True, result['result']
+    elif result['status'] == 'error': return False, result['message']
+    return False, None
+
+def _initialise_app(pipeline):
     api_reply = False
     error = None
-    fb = AppCntxt.threader.submit_blocking(initialise_backend)
-    AppCntxt.data.set_progress(10, "Connecting to backend...")
-    while fb.running():
-        # time.sleep(0.01)
-        QApplication.processEvents()
-    if fb.result()[0]:
+    # Wait in a local Qt event loop (no busy polling); the UI keeps painting meanwhile
+    pipeline.wait()
+    ok, reply = pipeline.result("backend initialise")
+    if ok:
         AppCntxt.logger.info("Backend initialisation is success")
         api_reply = True
+        _start_backend_logs()
     else:
-        error = fb.result()[1]
+        error = reply
         AppCntxt.logger.critical(f"Backend init failure: error: {error}")
         if 'WinError 10061' in error:
             AppCntxt.logger.critical(message:=f"Check if the backend is running. Address: {AppCntxt.backend.host}:{AppCntxt.backend.port}")
@@ -67,45 +106,73 @@ def _initialise_app():
     # _backend_worker_demo()
     return api_reply, error
 
+def _start_backend_logs():
+    # Backend records at or above APP_BACKEND_LOGS (default INFO; 0 turns it off) show up in the log panel
+    level_name = os.environ.get("APP_BACKEND_LOGS", "INFO").upper()
+    if level_name in ("0", "OFF"):
+        return
+    level = logging.getLevelName(level_name)
+    AppCntxt.backend_logs = BackendLogCollector(AppCntxt.backend, AppCntxt.logger,
+                                                min_level=level if isinstance(level, int) else logging.INFO)
+    AppCntxt.backend_logs.start(AppCntxt.threader)
+
 def _on_app_closing():
     splash = Splash(AppCntxt.name, f"Version {AppCntxt.version}")
     splash.show()
     AppData().set_progress(value=20, message=f"({20}%)  Cleaning up...")
-    def cleanup():
-        with AppCntxt.threader.token():
-            time.sleep(1)
-        return True
-    fb = AppCntxt.threader.submit_blocking(cleanup)
-    time.sleep(0.1)
-    while fb.running():
-        time.sleep(0.001)
-        QApplication.processEvents()
 
-    AppData().set_progress(value=95, message=f"({95}%)  Cleaning up...")
-    fb.result()
-    QApplication.processEvents()
+    def on_progress(settled, total):
+        value = 20 + int(75 * settled / total) if total else 95
+        AppData().set_progress(value=value, message=f"({value}%)  Finishing {total - settled} task(s)...")
 
+    if AppCntxt.backend_logs is not None:
+        AppCntxt.backend_logs.stop()
     if AppCntxt.threader is not None:
-        AppCntxt.threader.shutdown()
+        # Abandonable work (icon loads, previews) is dropped, queued durable jobs are stored for
+        # the next start, everything else gets 3s to finish. The drain runs on its own thread
+        # (the pool is what it stops) while the GUI thread keeps painting the splash.
+        shutdown = concurrent.futures.Future()
+        threading.Thread(target=_run_shutdown, args=(shutdown, on_progress), name="ThreadmanagerShutdown",
+                         daemon=True).start()
+        AppCntxt.threader.wait_future(shutdown)
+    if AppCntxt.jobs is not None:
+        AppCntxt.jobs.close()
+    AppData().set_progress(value=95, message=f"({95}%)  Cleaning up...")
+    if AppCntxt.stalls is not None:
+        AppCntxt.stalls.stop()
+        if AppCntxt.stalls.report():
+            AppCntxt.logger.info("GUI stalls this session:\n" + AppCntxt.stalls.format_report())
     splash.close()
     AppCntxt.logger.info("Goodbye!")
+    AppCntxt.logger.logs.close()
+    # the console / file writer runs in the background: make sure everything is out before exiting
+    AppCntxt.logger.flush()
     sys.exit(0)
 
+def _run_shutdown(future, progress):
+    try:
+        future.set_result(AppCntxt.threader.shutdown(policy="persist", timeout=3.0, progress=progress))
+    except BaseException as ex:
+        future.set_exception(ex)
+
 def _backend_worker_demo():
     def on_log_update(data):
         AppCntxt.logger.info(data)
 
-    AppCntxt.threader.on("backend_log_update", on_log_update)
-
-    async def non_blocking_work(n):
-        with AppCntxt.threader.token():
-            for i in range(n):
-                QApplication.processEvents()
-                AppCntxt.threader.emit('backend_log_update', f"Non blocking delay {str(i)}")
-                await asyncio.sleep(0.1)
-                # time.sleep(1)
-    f = AppCntxt.threader.run_async(non_blocking_work(100))
-    # f.result() # For waiting
+    # Delivered on the GUI thread through a small coalescing queue, so the emitting
+    # coroutine never waits for (or re-enters) the UI
+    AppCntxt.threader.on("backend_log_update", on_log_update, context="gui", max_queue=100)
+
+    # A poller is a periodic job on the ThreadManager timer wheel, not a sleeping coroutine
+    counter = iter(range(100))
+
+    async def non_blocking_work():
+        i = next(counter, None)
+        if i is None:
+            poller.cancel()
+            return
+        AppCntxt.threader.emit('backend_log_update', f"Non blocking delay {str(i)}")
+    poller = AppCntxt.threader.every(0.1, non_blocking_work)
 
     # def blocking_work(n):
     #     with ApplicationContext.thread_manager.token():
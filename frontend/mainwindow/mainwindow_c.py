@@ -1,3 +1,5 @@
+import logging
+
 from PySide6.QtCore import Qt, QPoint, QRect, Signal
 from PySide6.QtGui import QMouseEvent
 from PySide6.QtWidgets import (
@@ -24,7 +26,7 @@ class MainWindow(QMainWindow):
 
         self._config = ConfigurationManager()
         self._logger = Logger()
-        self._logger.log_updated.connect(self._on_log_updated)
+        self._logger.log_batch.connect(self._on_log_updated)
 
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
@@ -121,9 +123,12 @@ class MainWindow(QMainWindow):
         self.setPalette(AppCntxt.styler.get_palette())
         self.setFont(AppCntxt.font.get_font('p'))
 
-    def _on_log_updated(self, log_text):
-        if 'DEBUG' not in log_text:
-            self.ui.statusbar.showMessage(log_text.split('| ')[-1])
+    def _on_log_updated(self, records):
+        # one status bar update per batch: only the newest non-debug record is shown
+        for record in reversed(records):
+            if record.levelno > logging.DEBUG:
+                self.ui.statusbar.showMessage(record.message)
+                break
 
     def closeEvent(self, event):
         self.destroy()
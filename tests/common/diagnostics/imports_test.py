@@ -0,0 +1,40 @@
+import pytest
+
+from common.diagnostics.imports import audit, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:        80 |        200 | io
+import time:        50 |         50 |     common.logger
+"""
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_parse_importtime():
+    costs = parse_importtime(IMPORTTIME_OUTPUT)
+    assert [(c.module, c.self_us, c.cumulative_us, c.depth) for c in costs] == [
+        ("_io", 120, 120, 1), ("io", 80, 200, 0), ("common.logger", 50, 50, 2)]
+
+
+@pytest.mark.parametrize("module", ["common", "common.tcpinterface.backendserver", "backend.sdkmanager"])
+def test_headless_entry_points_do_not_load_gui_modules(module):
+    report = audit(module)
+    assert report.total_us > 0
+    assert report.heavy() == [], report.format_report()
+
+
+def test_importing_common_does_not_load_qt_or_crypto():
+    modules = audit("common").modules()
+    assert not [m for m in modules if m.startswith(("PySide6", "Crypto"))]
+
+
+def test_lazy_attributes_resolve_on_access():
+    import common
+    from common.logger import Logger
+    assert common.Logger is Logger
+    assert "StyleManager" in dir(common)
+    with pytest.raises(AttributeError):
+        common.NoSuchThing
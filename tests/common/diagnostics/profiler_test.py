@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from common.diagnostics.profiler import SamplingProfiler
+from common.threadmanager import ThreadManager
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def profiler():
+    p = SamplingProfiler()
+    p.clear()
+    yield p
+    p.stop()
+    p.clear()
+
+
+@pytest.fixture
+def manager():
+    tm = ThreadManager(max_workers=2, max_tokens=2)
+    tm.start()
+    yield tm
+    tm.shutdown()
+
+
+def busy_worker(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def busy_gui(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_samples_gui_and_pool_threads(profiler, manager):
+    profiler.start(hz=500)
+    fut = manager.submit_blocking(busy_worker, 0.2)
+    busy_gui(0.2)
+    fut.result(timeout=2)
+    assert profiler.stop() > 10
+
+    stacks = profiler.collapsed()
+    assert any(s.startswith("MainThread;") and s.endswith("busy_gui (profiler_test.py)") for s in stacks)
+    # pool workers are folded into one root per executor
+    assert any(s.startswith("ThreadPoolExecutor-") and "_" not in s.split(";")[0] and "busy_worker" in s
+               for s in stacks)
+    assert profiler.top(5)
+
+
+def test_thread_filter(profiler, manager):
+    profiler.start(hz=500, threads=("ThreadPoolExecutor",))
+    busy_gui(0.05)
+    profiler.stop()
+    assert not [s for s in profiler.collapsed() if s.startswith("MainThread")]
+
+
+def test_write_collapsed(profiler, tmp_path):
+    profiler.start(hz=500, include_lines=True)
+    busy_gui(0.1)
+    profiler.stop()
+    path = tmp_path / "profile.folded"
+    assert profiler.write_collapsed(str(path)) == len(profiler.collapsed())
+    for line in path.read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0 and ";" in stack
+    assert "busy_gui (profiler_test.py:" in path.read_text()
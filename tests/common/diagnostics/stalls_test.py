@@ -0,0 +1,60 @@
+import time
+
+import pytest
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from common.diagnostics.stalls import StallDetector
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def detector(qapp):
+    d = StallDetector(threshold_ms=50)
+    d.start()
+    yield d
+    d.stop()
+
+
+def pump_events(qapp, seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        qapp.processEvents()
+        time.sleep(0.002)
+
+
+def slow_handler():
+    time.sleep(0.25)
+
+
+def quick_handler():
+    time.sleep(0.01)
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_detects_and_ranks_stalls(qapp, detector):
+    QTimer.singleShot(0, slow_handler)
+    QTimer.singleShot(0, quick_handler)
+    pump_events(qapp, 0.5)
+
+    report = detector.report()
+    assert len(report) == 1
+    site = report[0]
+    assert site.site.endswith("slow_handler") and "stalls_test.py" in site.site
+    assert site.count == 1
+    assert 150 <= site.max_ms < 1000
+    assert any("slow_handler" in frame for frame in site.stack)
+    assert "slow_handler" in detector.format_report()
+
+
+def test_idle_event_loop_is_not_a_stall(qapp, detector):
+    pump_events(qapp, 0.2)
+    assert detector.report() == []
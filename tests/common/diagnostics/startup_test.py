@@ -0,0 +1,115 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from common.diagnostics import startup
+from common.diagnostics.startup import StartupTimeline
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# Runs initialise_context() in a fresh interpreter (its own QApplication, cold imports) and prints
+# the timeline as JSON
+STARTUP_SCRIPT = """
+import json, sys
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from common import initialise_context, AppCntxt
+from common.diagnostics.startup import StartupTimeline
+timeline = StartupTimeline()
+with timeline.phase("initialise_context"):
+    initialise_context()
+AppCntxt.threader.shutdown()
+sys.stdout.write(json.dumps(timeline.as_dict()))
+"""
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def timeline():
+    t = StartupTimeline()
+    budgets = t.budgets
+    t.reset()
+    t.budgets = {}
+    yield t
+    t.reset()
+    t.budgets = budgets
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Deterministic timeline clock: phases take exactly what the test advances it by."""
+    fake = FakeClock()
+    monkeypatch.setattr(startup, "_wall_clock", fake)
+    monkeypatch.setattr(startup, "_cpu_clock", lambda: 0.0)
+    return fake
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_phases_record_wall_cpu_and_nesting(timeline):
+    with timeline.phase("outer"):
+        with timeline.phase("sleep"):
+            time.sleep(0.05)
+    timeline.mark("done")
+
+    outer, sleep = timeline.phases()
+    assert (outer.depth, sleep.depth) == (0, 1)
+    assert sleep.wall_ms >= 45
+    # sleeping burns no CPU
+    assert sleep.cpu_ms < sleep.wall_ms / 2
+    assert outer.wall_ms >= sleep.wall_ms
+    assert timeline.marks()[0][0] == "done"
+    assert "  sleep" in timeline.report()
+
+
+def test_budgets_flag_slow_phases(timeline, clock, tmp_path):
+    budgets = tmp_path / "budgets.json"
+    budgets.write_text(json.dumps({"slow": 10, "fast": 1000}))
+    timeline.load_budgets(str(budgets))
+
+    with timeline.phase("slow"):
+        clock.advance(0.011)
+    with timeline.phase("fast"):
+        clock.advance(0.999)
+
+    slow, fast = timeline.phases()
+    assert slow.wall_ms == pytest.approx(11) and fast.wall_ms == pytest.approx(999)
+    assert [p.name for p in timeline.over_budget()] == ["slow"]
+    assert "OVER" in timeline.report()
+
+
+def test_initialise_context_records_phases(tmp_path):
+    # keep the child's app data and QSettings out of the developer's home
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", XDG_DATA_HOME=str(tmp_path / "data"),
+               XDG_CONFIG_HOME=str(tmp_path / "config"), XDG_CACHE_HOME=str(tmp_path / "cache"))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    result = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+
+    phases = json.loads(result.stdout)["phases"]
+    assert {"logger", "threadmanager", "configuration", "fonts", "initialise_context"} <= {p["name"] for p in phases}
+    if not os.environ.get("APP_STARTUP_BENCHMARK"):
+        return  # wall-clock budgets are only checked as a benchmark, on a known machine
+    over = [f"{p['name']}: {p['wall_ms']:.0f} ms > {p['budget_ms']:.0f} ms"
+            for p in phases if p["budget_ms"] is not None and p["wall_ms"] > p["budget_ms"]]
+    assert not over, "startup phases over budget (config/startup_budgets.json):\n" + "\n".join(over)
@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+import json
+import socket
+
+import pytest
+
+from common.diagnostics.tracing import Tracer
+from common.tcpinterface.backendclient import BackendClient
+from common.tcpinterface.backendserver import BackendServer
+from common.threadmanager import ThreadManager
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def tracer():
+    t = Tracer()
+    t.clear()
+    t.enable()
+    yield t
+    t.disable()
+    t.clear()
+
+
+@pytest.fixture
+def manager():
+    tm = ThreadManager(max_workers=2, max_tokens=2)
+    tm.start()
+    yield tm
+    tm.shutdown()
+
+
+def by_name(tracer):
+    return {span.name: span for span in tracer.spans()}
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_disabled_tracer_records_nothing():
+    t = Tracer()
+    t.disable()
+    t.clear()
+    fn = print
+    assert t.bind(fn, "x") is fn
+    with t.span("ignored"):
+        pass
+    assert t.spans() == []
+
+
+def test_nested_spans(tracer):
+    with tracer.span("outer"):
+        with tracer.span("inner", item=3):
+            pass
+    spans = by_name(tracer)
+    assert spans["inner"].parent_id == spans["outer"].span_id
+    assert spans["inner"].trace_id == spans["outer"].trace_id
+    assert spans["inner"].attrs["item"] == 3
+
+
+def test_propagates_through_threadmanager(tracer, manager):
+    async def fetch():
+        with tracer.span("in-coroutine"):
+            await asyncio.sleep(0)
+
+    def work():
+        with tracer.span("in-worker"):
+            pass
+
+    with tracer.span("click"):
+        manager.submit_blocking(work).result(timeout=2)
+        manager.run_async(fetch()).result(timeout=2)
+
+    spans = by_name(tracer)
+    click = spans["click"]
+    job = spans["job:test_propagates_through_threadmanager.<locals>.work"]
+    assert job.parent_id == click.span_id and "queued_ms" in job.attrs
+    assert spans["in-worker"].parent_id == job.span_id
+    assert spans["in-coroutine"].trace_id == click.trace_id
+    assert job.tid != click.tid
+
+
+def test_backend_call_continues_trace_on_server(tracer):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    key = hashlib.sha256(b"test key").digest()
+    server = BackendServer(port=port, secret_key=key)
+    server.register_function(lambda x: x * 2, name="double")
+    server.start()
+    try:
+        with tracer.span("click"):
+            assert BackendClient(port=port, secret_key=key).call("double", 21)["result"] == 42
+    finally:
+        server.stop()
+
+    spans = by_name(tracer)
+    assert spans["dispatch:double"].parent_id == spans["rpc:double"].span_id
+    assert spans["dispatch:double"].trace_id == spans["click"].trace_id
+
+
+def test_export_chrome_trace(tracer, manager, tmp_path):
+    with tracer.span("click"):
+        manager.submit_blocking(lambda: None).result(timeout=2)
+    path = tmp_path / "trace.json"
+    assert tracer.export_chrome_trace(str(path)) == 2
+
+    events = json.loads(path.read_text())["traceEvents"]
+    complete = [e for e in events if e["ph"] == "X"]
+    assert {e["name"] for e in complete} == {"click", "job:test_export_chrome_trace.<locals>.<lambda>"}
+    assert all(e["dur"] >= 0 for e in complete)
+    assert any(e["ph"] == "s" for e in events) and any(e["ph"] == "f" for e in events)
+    assert any(e["ph"] == "M" and e["args"]["name"] == "MainThread" for e in events)
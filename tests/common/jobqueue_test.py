@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pytest
+
+from common.jobqueue import JobQueue
+from common.threadmanager import ThreadManager
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def manager():
+    tm = ThreadManager(max_workers=2, max_tokens=2)
+    tm.start()
+    yield tm
+    tm.shutdown()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.sqlite3")
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_enqueue_runs_and_removes_job(manager, db_path):
+    done = []
+    queue = JobQueue(manager, db_path)
+    queue.register("add", lambda a, b=0: done.append(a + b))
+    queue.start()
+    queue.enqueue("add", (1,), {"b": 2})
+    assert wait_until(lambda: queue.pending() == 0)
+    assert done == [3]
+    queue.close()
+
+
+def test_retries_with_backoff_until_success(manager, db_path):
+    attempts = []
+
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise IOError("offline")
+
+    queue = JobQueue(manager, db_path, base_delay=0.05)
+    queue.register("flaky", flaky)
+    queue.start()
+    queue.enqueue("flaky")
+    assert wait_until(lambda: queue.pending() == 0)
+    assert len(attempts) == 3
+    assert attempts[2] - attempts[1] >= 0.04
+    queue.close()
+
+
+def test_gives_up_after_max_attempts(manager, db_path):
+    def broken():
+        raise ValueError("nope")
+
+    queue = JobQueue(manager, db_path, base_delay=0.01)
+    queue.register("broken", broken)
+    queue.start()
+    queue.enqueue("broken", max_attempts=2)
+    assert wait_until(lambda: queue.failed())
+    assert queue.failed()[0]["attempts"] == 2
+    assert "ValueError" in queue.failed()[0]["error"]
+    assert queue.pending() == 0
+    queue.close()
+
+
+def test_idempotency_key(manager, db_path):
+    queue = JobQueue(manager, db_path)
+    first = queue.enqueue("later", key="sync")
+    assert queue.enqueue("later", key="sync") == first
+    assert queue.pending() == 1
+    queue.close()
+
+
+def test_idempotency_key_requeues_failed_job(manager, db_path):
+    calls = []
+
+    def fails_once():
+        calls.append(1)
+        if len(calls) == 1:
+            raise IOError("offline")
+
+    queue = JobQueue(manager, db_path)
+    queue.register("sync", fails_once)
+    queue.start()
+    first = queue.enqueue("sync", key="sync", max_attempts=1)
+    assert wait_until(lambda: queue.failed())
+    assert queue.enqueue("sync", key="sync", max_attempts=1) == first
+    assert wait_until(lambda: queue.pending() == 0)
+    assert len(calls) == 2 and queue.failed() == []
+    queue.close()
+
+
+def test_interrupted_job_resumes_on_next_start(manager, db_path):
+    started = threading.Event()
+    ran = []
+
+    def hang(payload, cancel_token):
+        started.set()
+        cancel_token.sleep(5)
+
+    queue = JobQueue(manager, db_path)
+    queue.register("work", hang)
+    queue.start()
+    queue.enqueue("work", ("payload",))
+    assert started.wait(2)
+    queue.close()  # the app goes away mid-job
+
+    queue = JobQueue(manager, db_path)
+    queue.register("work", ran.append)
+    queue.start()
+    assert wait_until(lambda: queue.pending() == 0)
+    assert ran == ["payload"]
+    queue.close()
+
+
+def test_persist_policy_stores_queued_jobs(db_path):
+    tm = ThreadManager(max_workers=1, max_tokens=1)
+    tm.start()
+    ran = []
+    queue = JobQueue(tm, db_path)
+    queue.register("sync", ran.append)
+    tm.set_persist_handler(queue.persist_pending)
+
+    running, release = threading.Event(), threading.Event()
+    tm.submit_blocking(lambda: running.set() or release.wait(2))
+    tm.submit_blocking(ran.append, "queued")
+    assert running.wait(2)
+    # progress is first reported after queued jobs were persisted, while draining the running one
+    report = tm.shutdown(policy="persist", timeout=2, progress=lambda settled, total: release.set())
+    queue.close()
+    assert report.persisted == 1 and ran == []
+
+    tm.start()
+    queue = JobQueue(tm, db_path)
+    queue.register("sync", ran.append)
+    queue.start()
+    assert wait_until(lambda: queue.pending() == 0)
+    assert ran == ["queued"]
+    queue.close()
+    tm.shutdown()
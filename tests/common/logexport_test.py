@@ -0,0 +1,65 @@
+import gzip
+import json
+import logging
+import os
+
+import pytest
+
+from common.logexport import ExportCancelled, export_logs, guess_options
+from common.logger import LogEntry
+from common.logstore import LogStore
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def store(tmp_path):
+    s = LogStore(capacity=5)
+    s.enable_spill(str(tmp_path / "spill"), segment_bytes=1 << 20)
+    for i in range(10):
+        level = logging.WARNING if i % 2 else logging.INFO
+        entry = LogEntry(level, logging.getLevelName(level), "record %d", (i,))
+        entry.created = 1_700_000_000.0 + i * 10
+        s.put(entry, entry.created)
+    yield s
+    s.close()
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_guess_options():
+    assert guess_options("a.log") == ("text", None)
+    assert guess_options("a.JSONL.gz") == ("jsonl", "gzip")
+    assert guess_options("a.log.zst") == ("text", "zstd")
+
+
+def test_text_export_covers_spilled_and_ring_records(store, tmp_path):
+    out = tmp_path / "all.log"
+    percents = []
+    assert export_logs(store, str(out), progress=percents.append, chunk=3) == 10
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert [line.split(" | ")[-1] for line in lines] == [f"record {i}" for i in range(10)]
+    assert percents == sorted(percents) and percents[-1] == 100
+
+
+def test_range_selection_and_gzip_json_lines(store, tmp_path):
+    out = tmp_path / "warnings.jsonl.gz"
+    # records 3..8 by time; warnings only; both spilled (3) and in-memory (5, 7) records qualify
+    written = export_logs(store, str(out), start=1_700_000_030.0, end=1_700_000_090.0, min_level=logging.WARNING)
+    with gzip.open(out, "rt", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert written == len(rows) == 3
+    assert [row["message"] for row in rows] == ["record 3", "record 5", "record 7"]
+    assert rows[-1]["level"] == logging.WARNING and rows[-1]["thread"] == "MainThread"
+
+
+def test_cancelled_export_leaves_no_file(store, tmp_path):
+    class Token:
+        cancelled = True
+
+    out = tmp_path / "cancelled.log"
+    with pytest.raises(ExportCancelled):
+        export_logs(store, str(out), cancel_token=Token())
+    assert os.listdir(tmp_path) == ["spill"]
@@ -0,0 +1,38 @@
+from common.logfilter import LogThrottle
+
+SITE = ("module.py", 10)
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_repeats_collapse_into_one_summary():
+    throttle = LogThrottle(window=5.0, rate=None)
+    assert throttle.admit(SITE, 30, "WARNING", "key", "Unknown colour key: x", now=0.0) == 0
+    for t in range(1, 4):
+        assert throttle.admit(SITE, 30, "WARNING", "key", "Unknown colour key: x", now=float(t)) is None
+    assert throttle.due(now=4.0) == []
+    # sweeps run at most every window / 4 seconds
+    assert throttle.due(now=6.0) == [(30, "WARNING", "Unknown colour key: x (x 4)")]
+    # the window is over: the message is logged again
+    assert throttle.admit(SITE, 30, "WARNING", "key", "Unknown colour key: x", now=6.5) == 0
+    assert throttle.suppressed == 3
+
+
+def test_call_site_bucket_limits_rate_and_reports_drops():
+    throttle = LogThrottle(window=0, rate=1.0, burst=2)
+    other = ("module.py", 20)
+    assert [throttle.admit(SITE, 20, "INFO", i, "m", now=0.0) for i in range(4)] == [0, 0, None, None]
+    # other call sites have their own bucket
+    assert throttle.admit(other, 20, "INFO", "k", "m", now=0.0) == 0
+    # one token is back after a second; the line reports the two dropped ones
+    assert throttle.admit(SITE, 20, "INFO", "k", "m", now=1.0) == 2
+    assert throttle.suppressed_by_site() == {SITE: 2}
+
+
+def test_force_ends_open_windows():
+    throttle = LogThrottle(window=60.0, rate=None)
+    throttle.admit(SITE, 20, "INFO", "a", "once", now=0.0)
+    throttle.admit(SITE, 20, "INFO", "b", lambda: "twice", now=0.0)
+    throttle.admit(SITE, 20, "INFO", "b", lambda: "twice", now=1.0)
+    assert throttle.due(now=2.0, force=True) == [(20, "INFO", "twice (x 2)")]
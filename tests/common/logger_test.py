@@ -1,3 +1,6 @@
+import os
+import tempfile
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 from common.logger import Logger  # Replace with actual module name
@@ -62,4 +65,180 @@ class TestLogger(unittest.TestCase):
             content = f.read()
             self.assertIn("Export test message", content)
 
-        os.remove(test_file)
\ No newline at end of file
+        os.remove(test_file)
+
+    def test_disabled_level_skips_storage_and_formatting(self):
+        logger = Logger(level=logging.INFO)
+
+        class Expensive:
+            def __str__(self):
+                raise AssertionError("formatted a disabled record")
+
+        self.assertIsNone(logger.debug("value: %s", Expensive()))
+        self.assertTrue(logger.logs.empty())
+        self.assertIsNotNone(logger.info("kept"))
+        self.assertEqual(logger.logs.qsize(), 1)
+
+    def test_percent_args_are_applied_to_stored_record(self):
+        logger = Logger()
+        entry = logger.info("%d jobs in %.1fs", 3, 0.25)
+        self.assertEqual(entry.message, "3 jobs in 0.2s")
+        self.assertTrue(str(entry).endswith("| INFO | 3 jobs in 0.2s"))
+        self.assertEqual(logger.logs[0], str(entry))
+
+    def test_signal_is_only_emitted_at_emit_level_with_listeners(self):
+        logger = Logger()
+        mock_slot = MagicMock()
+        logger.warning("nobody listens")
+        logger.log_updated.connect(mock_slot)
+        logger.set_emit_level(logging.WARNING)
+        logger.info("below %s", "warning")
+        logger.set_emit_level(logging.INFO)
+        logger.info("shown %s", 1)
+        mock_slot.assert_called_once()
+        self.assertTrue(mock_slot.call_args[0][0].endswith("| INFO | shown 1"))
+
+    def test_slow_sink_does_not_block_the_caller(self):
+        logger = Logger()
+
+        class SlowHandler(logging.Handler):
+            def __init__(self):
+                super().__init__()
+                self.messages = []
+
+            def emit(self, record):
+                time.sleep(0.1)
+                self.messages.append(record.getMessage())
+
+        sink = logger.add_sink(SlowHandler())
+        try:
+            started = time.perf_counter()
+            for i in range(3):
+                logger.warning("slow %d", i)
+            self.assertLess(time.perf_counter() - started, 0.1)
+            self.assertTrue(logger.flush())
+            self.assertEqual(sink.messages, ["slow 0", "slow 1", "slow 2"])
+        finally:
+            logger.remove_sink(sink)
+
+    def test_rotating_file_sink(self):
+        logger = Logger()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "app.log")
+            sink = logger.add_file_sink(path, max_bytes=200, backup_count=2)
+            try:
+                for i in range(10):
+                    logger.warning("rotating line %d", i)
+                logger.flush()
+            finally:
+                logger.remove_sink(sink)
+            self.assertTrue(os.path.exists(path + ".1"))
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("rotating line 9", f.read())
+
+    def test_log_batch_delivers_records_in_one_list(self):
+        from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+        QCoreApplication.instance() or QCoreApplication([])
+        logger = Logger()
+        logger.set_batch_interval(20)
+        batches = []
+        logger.log_batch.connect(batches.append)
+        try:
+            logger.info("first")
+            logger.debug("hidden")
+            logger.warning("second %d", 2)
+            loop = QEventLoop()
+            QTimer.singleShot(150, loop.quit)
+            loop.exec()
+        finally:
+            logger.log_batch.disconnect(batches.append)
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([r.message for r in batches[0]], ["first", "second 2"])
+
+    def test_records_are_structured_and_queryable(self):
+        logger = Logger()
+        logger.info("plain")
+        entry = logger.error("disk %s full", "C:", extra={"volume": "C:"})
+        self.assertEqual((entry.levelno, entry.name, entry.extras), (logging.ERROR, "Application", {"volume": "C:"}))
+        self.assertEqual(entry.thread, "MainThread")
+        self.assertEqual(entry.to_dict()["message"], "disk C: full")
+        self.assertEqual(logger.query(min_level=logging.WARNING), [entry])
+        self.assertEqual(logger.query(text="DISK"), [entry])
+
+    def test_log_function_samples_truncates_and_skips_disabled_levels(self):
+        logger = Logger()
+
+        def raw(value):
+            return value
+
+        logger.set_level(logging.INFO)
+        self.assertIs(logger.log_function(level=logging.DEBUG)(raw), raw)
+
+        sampled = logger.log_function(level=logging.INFO, sample=3, max_arg_chars=10)(raw)
+        for _ in range(6):
+            sampled("x" * 50)
+        lines = logger.logs.snapshot()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("raw('xxxxxx...) -> 'xxxxxx... [", lines[0])
+        self.assertTrue(lines[0].endswith(" ms]"))
+
+    def test_throttle_collapses_repeats_and_limits_call_sites(self):
+        from common.logfilter import LogThrottle
+        logger = Logger()
+        logger.set_throttle(LogThrottle(window=60.0, rate=1.0, burst=3))
+        for _ in range(5):
+            logger.warning("Failed to resolve colour '%s'", "accent")
+        for i in range(5):
+            logger.info("busy %d", i)
+        logger.flush()
+        self.assertEqual(logger.logs.snapshot()[-1].split(" | ", 2)[1:],
+                         ["WARNING", "Failed to resolve colour 'accent' (x 5)"])
+        messages = [entry.message for entry in logger.query()]
+        self.assertEqual(messages.count("Failed to resolve colour 'accent'"), 1)
+        self.assertEqual([m for m in messages if m.startswith("busy")], ["busy 0", "busy 1", "busy 2"])
+        self.assertEqual(logger.throttle.suppressed, 6)
+        # call sites are the lines of this test, not of the Logger
+        self.assertEqual({os.path.basename(file) for file, _ in logger.throttle.suppressed_by_site()},
+                         {os.path.basename(__file__)})
+
+    def test_exception_logs_error_with_traceback(self):
+        logger = Logger()
+        with patch.object(logger._logger, "log") as log:
+            try:
+                raise ValueError("bad value")
+            except ValueError:
+                entry = logger.exception("Parsing %s failed", "config")
+        self.assertEqual((entry.levelno, entry.message), (logging.ERROR, "Parsing config failed"))
+        self.assertTrue(log.call_args.kwargs["exc_info"])
+
+    def test_set_level_keeps_sink_levels(self):
+        logger = Logger()
+        sink = logger.add_sink(logging.NullHandler(logging.ERROR))
+        try:
+            logger.set_level(logging.DEBUG)
+            self.assertEqual(sink.level, logging.ERROR)
+            self.assertEqual(logger.level, logging.DEBUG)
+        finally:
+            logger.remove_sink(sink)
+
+    def test_equal_entries_hash_alike(self):
+        from common.logger import LogEntry
+        first = LogEntry(logging.INFO, "INFO", "ready %d", (1,))
+        second = LogEntry.from_dict(first.to_dict())
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(hash(first), hash(str(first)))
+
+    def test_journal_sink_and_restore(self):
+        logger = Logger()
+        with tempfile.TemporaryDirectory() as folder:
+            sink = logger.add_journal_sink(folder)
+            try:
+                logger.warning("journaled %d", 1)
+                logger.flush()
+            finally:
+                logger.remove_sink(sink)
+            Logger._instance = None
+            restored = Logger()
+            self.assertEqual(restored.restore_from_journal(str(sink.journal.path), count=10), 1)
+            self.assertEqual(restored.query()[-1].message, "journaled 1")
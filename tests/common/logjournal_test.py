@@ -0,0 +1,84 @@
+import logging
+import os
+
+import pytest
+
+from common.logjournal import JournalReader, LogJournal, main, read_tail
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def journal(tmp_path):
+    j = LogJournal(str(tmp_path), chunk_bytes=1, index_every=4)
+    yield j
+    j.close()
+
+
+def fill(journal, count):
+    for i in range(count):
+        level = logging.WARNING if i % 3 == 0 else logging.INFO
+        journal.append(1000.0 + i, level, "Application", "MainThread", f"line {i}",
+                       {"i": i} if i == 7 else None)
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_records_round_trip_with_time_and_level_selection(journal):
+    fill(journal, 20)
+    journal.close()
+    with JournalReader(journal.path) as reader:
+        records = list(reader)
+        assert [r.message for r in records] == [f"line {i}" for i in range(20)]
+        assert records[7].extras == {"i": 7} and records[0].level_name == "WARNING"
+        selected = reader.records(start=1005.0, end=1013.0, min_level=logging.WARNING)
+        assert [r.message for r in selected] == ["line 6", "line 9", "line 12"]
+        assert [r.message for r in reader.tail(3)] == ["line 17", "line 18", "line 19"]
+        assert len(reader.tail(50)) == 20
+
+
+def test_unclosed_journal_is_readable_up_to_the_last_intact_record(journal):
+    fill(journal, 10)
+    journal.flush()
+    # a crash leaves the file at its grown size (zeros after the last record), never trimmed
+    with JournalReader(journal.path) as reader:
+        assert [r.message for r in reader.tail(2)] == ["line 8", "line 9"]
+    journal.close()
+    data = bytearray(journal.path.read_bytes())
+    data[-3] ^= 0xFF     # tear the last record
+    journal.path.write_bytes(bytes(data))
+    with JournalReader(journal.path) as reader:
+        assert [r.message for r in reader.tail(2)] == ["line 7", "line 8"]
+
+
+def test_roll_over_and_previous_sessions(tmp_path, capsys):
+    first = LogJournal(str(tmp_path), max_file_bytes=1, chunk_bytes=1, max_files=3)
+    fill(first, 5)
+    first.close()
+    files = sorted(tmp_path.glob("journal-*.bin"))
+    # every record after the first rolled over to a new part; only the newest 3 files are kept
+    assert len(files) == 3
+
+    second = LogJournal(str(tmp_path))
+    try:
+        assert second.previous_files() == files
+        # the tail of a rolled-over session is read across its parts
+        assert second.previous_sessions() == [files]
+        assert [r.message for r in read_tail(files, 2)] == ["line 3", "line 4"]
+    finally:
+        second.close()
+    assert main([str(files[-1]), "--tail", "1"]) == 0
+    assert capsys.readouterr().out.strip().endswith("| INFO | line 4")
+
+
+def test_prune_keeps_files_of_other_running_instances(tmp_path):
+    # a journal of a process that is still running (our parent) and one of a process that is gone
+    running = tmp_path / f"journal-20000101-000000-{os.getppid()}-000.bin"
+    gone = tmp_path / "journal-20000101-000001-999999999-000.bin"
+    for path in (running, gone):
+        path.write_bytes(b"PDALOGJ1")
+    journal = LogJournal(str(tmp_path), max_files=1)
+    journal.close()
+    assert running.exists() and not gone.exists()
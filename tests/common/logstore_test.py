@@ -0,0 +1,127 @@
+import queue
+import time
+
+import pytest
+
+from common.logstore import LogStore
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def store():
+    s = LogStore(capacity=4)
+    yield s
+    s.close()
+
+
+def fill(store, count, start=0):
+    return [store.put(f"line {i}", created=1000.0 + i) for i in range(start, start + count)]
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_ring_keeps_newest_records_with_stable_indexes(store):
+    seqs = fill(store, 6)
+    assert seqs == list(range(6))
+    assert len(store) == 4
+    assert store.first_index == 2
+    assert store[5] == "line 5"
+    assert store.snapshot() == ["line 2", "line 3", "line 4", "line 5"]
+    assert store.dropped == 2
+    with pytest.raises(IndexError):
+        store[1]
+
+
+def test_time_range_lookup(store):
+    fill(store, 6)
+    assert [line for _, _, line in store.between(1003.0, 1005.0)] == ["line 3", "line 4"]
+    assert store.index_at(1004.5) == 5
+    # a clock stepping backwards is clamped so the time index stays ordered
+    seq = store.put("late", created=900.0)
+    assert store.time_of(seq) == 1005.0
+
+
+def test_spill_rotates_segments_and_export_includes_them(store, tmp_path):
+    store.enable_spill(str(tmp_path / "logs"), segment_bytes=20, max_segments=2)
+    fill(store, 12)
+    segments = store.spill_segments()
+    assert segments == sorted((tmp_path / "logs").glob("log-*.txt"))
+    assert len(segments) == 2
+    assert store.spilled == 8
+
+    out = tmp_path / "export.txt"
+    written = store.export_to_file(str(out))
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert written == len(lines)
+    # the oldest segments were rotated away; the newest spilled lines and the ring remain, in order
+    assert lines[-4:] == ["line 8", "line 9", "line 10", "line 11"]
+    assert lines == sorted(lines, key=lambda line: int(line.split()[1]))
+
+
+def test_spill_writes_in_background_and_exports_only_this_session(store, tmp_path):
+    spill_dir = tmp_path / "logs"
+    spill_dir.mkdir()
+    (spill_dir / "log-000007.txt").write_text("earlier session\n", encoding="utf-8")
+    store.enable_spill(str(spill_dir))
+    fill(store, 6)
+    # put() only queues the evicted records; the spill thread writes them
+    deadline = time.monotonic() + 2
+    while store.spilled < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store.spilled == 2
+
+    segments = store.spill_segments()
+    assert [path.name for path in segments] == ["log-000008.txt"]
+    assert segments[0].read_text(encoding="utf-8") == "line 0\nline 1\n"
+    out = tmp_path / "export.txt"
+    store.export_to_file(str(out))
+    assert "earlier session" not in out.read_text(encoding="utf-8")
+
+
+def test_resize_and_queue_compatibility(store):
+    fill(store, 4)
+    store.resize(2)
+    assert store.snapshot() == ["line 2", "line 3"]
+    assert store.get() == "line 2"
+    assert store.qsize() == 1
+    store.get()
+    assert store.empty()
+    with pytest.raises(queue.Empty):
+        store.get()
+
+
+class Record:
+    def __init__(self, levelno, message):
+        self.levelno = levelno
+        self.message = message
+
+    def __str__(self):
+        return f"{self.levelno} | {self.message}"
+
+
+def test_query_filters_by_level_time_and_text():
+    store = LogStore(capacity=5)
+    levels = [10, 20, 30, 20, 40, 20, 30]
+    for i, level in enumerate(levels):
+        store.put(Record(level, f"Message {i}"), created=1000.0 + i)
+    # records 0 and 1 were evicted; the level index follows
+    assert store.level_counts() == {20: 2, 30: 2, 40: 1}
+    assert [r.message for r in store.query(min_level=30)] == ["Message 2", "Message 4", "Message 6"]
+    assert [r.message for r in store.query(levels=[20], start=1004.0)] == ["Message 5"]
+    assert [r.message for r in store.query(text="message 3")] == ["Message 3"]
+    assert [r.message for r in store.query(min_level=20, limit=2, newest=True)] == ["Message 5", "Message 6"]
+    assert [r.message for r in store.query(text="MESSAGE", limit=1, newest=True)] == ["Message 6"]
+    assert store.query(min_level=50) == []
+
+
+def test_merge_places_records_by_time():
+    store = LogStore(capacity=10)
+    for i in (0, 2, 4):
+        store.put(Record(20, f"local {i}"), created=1000.0 + i)
+    assert store.merge([(1003.0, Record(30, "remote 3")), (1001.0, Record(30, "remote 1"))]) == 2
+    assert [r.message for r in store.query()] == ["local 0", "remote 1", "local 2", "remote 3", "local 4"]
+    assert [r.message for r in store.query(min_level=30)] == ["remote 1", "remote 3"]
+    assert [r.message for r in store.query(levels=[20])] == ["local 0", "local 2", "local 4"]
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from common.pipeline import StartupPipeline
+from common.threadmanager import ThreadManager
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def manager(qapp):
+    tm = ThreadManager(max_workers=4, max_tokens=2)
+    tm.start()
+    yield tm
+    tm.shutdown()
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_independent_steps_overlap_and_dependencies_wait(manager):
+    events = []
+    lock = threading.Lock()
+
+    def step(name, seconds=0.0):
+        def run():
+            with lock:
+                events.append(("start", name))
+            time.sleep(seconds)
+            with lock:
+                events.append(("end", name))
+            return name
+        return run
+
+    pipeline = StartupPipeline(manager)
+    pipeline.add("config", step("config"))
+    pipeline.add("palette", step("palette", 0.2), requires=("config",))
+    pipeline.add("backend", step("backend", 0.2), requires=("config",))
+    pipeline.add("window", step("window"), requires=("palette", "backend"), gui=True)
+
+    started = time.perf_counter()
+    pipeline.wait()
+    elapsed = time.perf_counter() - started
+
+    assert pipeline.result("window") == "window"
+    # palette and backend ran side by side
+    assert elapsed < 0.35
+    assert events.index(("end", "config")) < events.index(("start", "palette"))
+    assert events[-2:] == [("start", "window"), ("end", "window")]
+
+
+def test_gui_steps_run_on_gui_thread_and_progress_is_reported(manager):
+    threads = {}
+    progress = []
+
+    pipeline = StartupPipeline(manager, progress=lambda done, total, name: progress.append((done, total, name)))
+    pipeline.add("files", lambda: threads.setdefault("files", threading.current_thread()))
+    pipeline.add("register", lambda: threads.setdefault("register", threading.current_thread()),
+                 requires=("files",), gui=True)
+    pipeline.wait()
+
+    assert threads["register"] is threading.main_thread()
+    assert threads["files"] is not threading.main_thread()
+    assert progress == [(1, 2, "files"), (2, 2, "register")]
+
+
+def test_failure_propagates_to_dependents_only(manager):
+    def broken():
+        raise IOError("config missing")
+
+    pipeline = StartupPipeline(manager)
+    pipeline.add("config", broken)
+    pipeline.add("style", lambda: "style", requires=("config",))
+    pipeline.add("fonts", lambda: "fonts")
+
+    pipeline.wait("fonts")
+    with pytest.raises(IOError):
+        pipeline.wait("style")
+    assert pipeline.result("fonts") == "fonts"
+
+
+def test_rejects_unknown_and_cyclic_requirements(manager):
+    pipeline = StartupPipeline(manager)
+    pipeline.add("a", lambda: None, requires=("missing",))
+    with pytest.raises(KeyError):
+        pipeline.start()
+
+    pipeline = StartupPipeline(manager)
+    pipeline.add("a", lambda: None, requires=("b",))
+    pipeline.add("b", lambda: None, requires=("a",))
+    with pytest.raises(ValueError):
+        pipeline.start()
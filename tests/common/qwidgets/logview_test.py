@@ -0,0 +1,45 @@
+import logging
+
+import pytest
+from PySide6.QtCore import Qt
+
+from common.logger import LogEntry
+from common.qwidgets.logview import LogListModel
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def model():
+    return LogListModel(max_rows=3)
+
+
+def entries(*levels):
+    return [LogEntry(level, logging.getLevelName(level), f"line {i}", ()) for i, level in enumerate(levels)]
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_model_keeps_newest_rows(model):
+    model.append_records(entries(logging.INFO, logging.INFO))
+    model.append_records(entries(logging.INFO, logging.WARNING))
+    assert model.rowCount() == 3
+    assert model.record(0).message == "line 1"
+    assert model.record(2).levelno == logging.WARNING
+    assert model.data(model.index(2), Qt.ItemDataRole.DisplayRole).endswith("| WARNING | line 1")
+
+
+def test_oversized_batch_is_trimmed(model):
+    model.append_records(entries(*[logging.INFO] * 5))
+    assert [model.record(row).message for row in range(model.rowCount())] == ["line 2", "line 3", "line 4"]
+
+
+def test_min_level_filters_records(model):
+    model.min_level = logging.INFO
+    model.append_records(entries(logging.DEBUG, logging.ERROR))
+    assert model.rowCount() == 1
+    assert model.record(0).levelno == logging.ERROR
+    model.clear()
+    assert model.rowCount() == 0
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import logging
+import socket
+
+import pytest
+
+from common.logger import Logger
+from common.logjournal import JournalReader
+from common.tcpinterface.backendclient import BackendClient
+from common.tcpinterface.backendserver import BackendServer
+from common.tcpinterface.logforward import BackendLogCollector, LogForwarder
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def server():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    key = hashlib.sha256(b"test key").digest()
+    srv = BackendServer(port=port, secret_key=key)
+    srv.start()
+    yield srv, BackendClient(port=port, secret_key=key)
+    srv.disable_log_forwarding()
+    srv.stop()
+
+
+def record(message, level=logging.INFO):
+    return logging.LogRecord("sdk", level, __file__, 1, message, (), None)
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_pull_batches_by_size_and_level():
+    forwarder = LogForwarder(level=logging.DEBUG, capacity=3)
+    for i in range(5):
+        forwarder.handle(record(f"line {i}", logging.WARNING if i % 2 else logging.DEBUG))
+    # the buffer keeps the newest 3; a reader at 0 missed records 1
+    first = forwarder.pull(after=0, min_level=logging.DEBUG, max_bytes=200)
+    assert [r["message"] for r in first["records"]] == ["line 2"]
+    assert first["missed"] == 1 and first["more"]
+    rest = forwarder.pull(after=first["next"], min_level=logging.WARNING)
+    assert [r["message"] for r in rest["records"]] == ["line 3"]
+    assert rest["next"] == 4 and not rest["more"]
+
+
+def test_pull_cuts_long_messages_to_the_encoded_size():
+    forwarder = LogForwarder(level=logging.DEBUG, max_message=10_000)
+    # every character of this message takes six in JSON (\uXXXX)
+    forwarder.handle(record("\u00e9" * 2000))
+    fields = forwarder.pull(max_bytes=1000)["records"][0]
+    assert fields["message"] and len(json.dumps(fields)) <= 1000
+
+
+def test_collector_merges_backend_records(server):
+    srv, client = server
+    forwarder = srv.enable_log_forwarding(level=logging.INFO)
+    forwarder.process = "backend-host:1"    # pretend the backend runs elsewhere
+    logging.getLogger("sdk.device").warning("device %s offline", "A")
+    logging.getLogger("sdk.device").debug("filtered at the source")
+
+    logger = Logger()
+    collector = BackendLogCollector(client, logger)
+    assert collector.poll() == 1
+    entry = [e for e in logger.query(text="device") if e.name.startswith("backend:")][-1]
+    assert entry.message == "[backend] device A offline"
+    assert (entry.name, entry.levelno) == ("backend:sdk.device", logging.WARNING)
+    # the poll itself is not logged, so there is nothing new to forward
+    assert collector.poll() == 0
+
+
+def test_merged_records_reach_the_journal(server, tmp_path):
+    srv, client = server
+    forwarder = srv.enable_log_forwarding(level=logging.INFO)
+    forwarder.process = "backend-host:1"
+    logger = Logger()
+    sink = logger.add_journal_sink(str(tmp_path))
+    try:
+        logging.getLogger("sdk.device").warning("device %s rebooted", "B")
+        assert BackendLogCollector(client, logger).poll() == 1
+        logger.flush()
+    finally:
+        logger.remove_sink(sink)
+    with JournalReader(str(sink.journal.path)) as journal:
+        records = list(journal.records())
+    assert [(r.name, r.message) for r in records] == [("backend:sdk.device", "[backend] device B rebooted")]
+
+
+def test_collector_stops_for_backend_in_same_process(server):
+    srv, client = server
+    srv.enable_log_forwarding()
+    logging.getLogger("sdk").warning("same process")
+    collector = BackendLogCollector(client, Logger())
+    assert collector.poll() == 0
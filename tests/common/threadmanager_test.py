@@ -0,0 +1,571 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from common.threadmanager import (
+    ThreadManager,
+    CancelToken,
+    FutureWatcher,
+    TaskCancelledError,
+    DeadlineExceededError,
+)
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+@pytest.fixture
+def manager():
+    tm = ThreadManager(max_workers=2, max_tokens=2)
+    tm.start()
+    yield tm
+    tm.shutdown()
+
+
+@pytest.fixture
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+# -------------------------
+# Cancellation / deadlines / task groups
+# -------------------------
+def test_cancel_token_parent_cancels_children():
+    parent = CancelToken()
+    child = CancelToken(parent=parent)
+    parent.cancel()
+    assert child.cancelled
+    with pytest.raises(TaskCancelledError):
+        child.raise_if_cancelled()
+
+
+def test_cancel_token_runs_every_callback_when_one_raises():
+    parent = CancelToken()
+    called = []
+    parent.add_callback(lambda token: called.append("first"))
+    parent.add_callback(lambda token: 1 / 0)
+    child = CancelToken(parent=parent)
+    parent.add_callback(lambda token: called.append("last"))
+    parent.cancel()
+    assert called == ["first", "last"]
+    assert child.cancelled
+
+
+def test_cancel_token_deadline():
+    token = CancelToken(timeout=0.01)
+    time.sleep(0.02)
+    assert token.cancelled
+    with pytest.raises(DeadlineExceededError):
+        token.raise_if_cancelled()
+
+
+def test_submit_cancellable_passes_token(manager):
+    def work(x, cancel_token):
+        return x, isinstance(cancel_token, CancelToken)
+
+    fut = manager.submit_cancellable(work, (5,))
+    assert fut.result(timeout=2) == (5, True)
+
+
+def test_task_group_cancel_drops_queued_jobs(manager):
+    release = threading.Event()
+    ran = []
+
+    def blocker(cancel_token):
+        release.wait(2)
+        cancel_token.raise_if_cancelled()
+
+    def work(n):
+        ran.append(n)
+
+    group = manager.task_group("test")
+    group.submit_blocking(blocker)
+    group.submit_blocking(blocker)
+    queued = [group.submit_blocking(work, i) for i in range(5)]
+    assert group.cancel() == 7
+    release.set()
+
+    assert all(f.cancelled() for f in queued)
+    assert group.wait(timeout=2)
+    assert ran == []
+
+
+def test_blocking_deadline_cancels_waiters(manager):
+    def slow(cancel_token):
+        while not cancel_token.sleep(0.01):
+            pass
+        cancel_token.raise_if_cancelled()
+
+    fut = manager.submit_cancellable(slow, timeout=0.05)
+    with pytest.raises(DeadlineExceededError):
+        fut.result(timeout=2)
+
+
+def test_async_deadline(manager):
+    fut = manager.run_async(asyncio.sleep(5), timeout=0.05)
+    with pytest.raises(DeadlineExceededError):
+        fut.result(timeout=2)
+
+
+def test_async_group_cancel(manager):
+    group = manager.task_group()
+    fut = group.run_async(asyncio.sleep(5))
+    group.cancel()
+    with pytest.raises(concurrent.futures.CancelledError):
+        fut.result(timeout=2)
+
+
+# -------------------------
+# Qt bridge
+# -------------------------
+def test_wait_future_returns_result_without_polling(manager, qapp):
+    fut = manager.submit_blocking(lambda: (time.sleep(0.05), 42)[1])
+    assert manager.wait_future(fut, timeout=2) == 42
+
+
+def test_wait_future_timeout(manager, qapp):
+    fut = manager.submit_blocking(time.sleep, 0.5)
+    with pytest.raises(concurrent.futures.TimeoutError):
+        manager.wait_future(fut, timeout=0.05)
+
+
+def test_watcher_delivers_on_gui_thread(manager, qapp):
+    received = []
+    gui_thread = threading.current_thread()
+    fut = manager.submit_blocking(lambda: 7)
+    watcher = manager.watch(fut, lambda f: received.append((f.result(), threading.current_thread())))
+    assert isinstance(watcher, FutureWatcher)
+    manager.wait_future(fut, timeout=2)
+    deadline = time.monotonic() + 2
+    while not received and time.monotonic() < deadline:
+        qapp.processEvents()
+    assert received == [(7, gui_thread)]
+
+
+def test_as_awaitable(manager):
+    fut = manager.submit_blocking(lambda: "done")
+
+    async def waiter():
+        return await manager.as_awaitable(fut)
+
+    assert asyncio.run(waiter()) == "done"
+
+
+# -------------------------
+# Single-flight
+# -------------------------
+def test_submit_once_shares_concurrent_calls(manager):
+    calls = []
+    release = threading.Event()
+
+    def expensive(x):
+        calls.append(x)
+        release.wait(2)
+        return x * 2
+
+    futures = [manager.submit_once("key", expensive, (21,)) for _ in range(5)]
+    release.set()
+    assert all(f is futures[0] for f in futures)
+    assert futures[0].result(timeout=2) == 42
+    assert calls == [21]
+
+
+def test_submit_once_ttl_and_forget(manager):
+    calls = []
+
+    def work():
+        calls.append(1)
+        return len(calls)
+
+    first = manager.submit_once("ttl", work, ttl=10)
+    assert first.result(timeout=2) == 1
+    assert manager.submit_once("ttl", work, ttl=10).result(timeout=2) == 1
+
+    manager.forget_once("ttl")
+    assert manager.submit_once("ttl", work, ttl=10).result(timeout=2) == 2
+
+
+def test_submit_once_does_not_cache_failures(manager):
+    def boom():
+        raise ValueError("boom")
+
+    fut = manager.submit_once("fail", boom, ttl=10)
+    with pytest.raises(ValueError):
+        fut.result(timeout=2)
+    assert manager.submit_once("fail", boom, ttl=10) is not fut
+
+
+def test_submit_once_coroutine(manager):
+    async def coro(x):
+        await asyncio.sleep(0.01)
+        return x
+
+    assert manager.submit_once("coro", coro, (3,)).result(timeout=2) == 3
+
+
+# -------------------------
+# Debounce / throttle / rate limit
+# -------------------------
+def test_debounce_coalesces_to_latest_call(manager):
+    calls = []
+    futures = [manager.debounce("d", calls.append, (i,), delay=0.05) for i in range(10)]
+    assert all(f is futures[0] for f in futures)
+    futures[0].result(timeout=2)
+    assert calls == [9]
+
+
+def test_throttle_runs_leading_and_trailing(manager):
+    calls = []
+    leading = manager.throttle("t", calls.append, (0,), interval=0.1)
+    trailing = [manager.throttle("t", calls.append, (i,), interval=0.1) for i in range(1, 5)]
+    leading.result(timeout=2)
+    trailing[-1].result(timeout=2)
+    assert calls == [0, 4]
+
+
+def test_rate_limit_burst(manager):
+    calls = []
+    futures = [manager.rate_limit("r", calls.append, (i,), rate=20, burst=3) for i in range(6)]
+    for f in futures:
+        f.result(timeout=2)
+    assert calls == [0, 1, 2, 5]
+
+
+def test_debounce_coroutine(manager):
+    async def coro(x):
+        return x * 2
+
+    assert manager.debounce("dc", coro, (4,), delay=0.01).result(timeout=2) == 8
+
+
+# -------------------------
+# Event bus
+# -------------------------
+def test_on_keeps_multiple_subscribers(manager):
+    received = []
+    manager.on("evt", lambda x: received.append(("a", x)))
+    manager.on("evt", lambda x: received.append(("b", x)))
+    manager.emit("evt", 1)
+    assert received == [("a", 1), ("b", 1)]
+
+
+def test_slow_subscriber_does_not_block_emitter(manager):
+    release = threading.Event()
+    received = []
+
+    def slow(x):
+        release.wait(2)
+        received.append(x)
+
+    sub = manager.on("slow", slow, context="pool", max_queue=3, policy="drop_oldest")
+    start = time.monotonic()
+    for i in range(10):
+        manager.emit("slow", i)
+    assert time.monotonic() - start < 0.5
+    release.set()
+    deadline = time.monotonic() + 2
+    while sub.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert received[-1] == 9
+    assert sub.dropped > 0
+
+
+def test_coalesce_policy_on_loop(manager):
+    received = []
+    done = threading.Event()
+
+    def handler(x):
+        received.append(x)
+        if x == 99:
+            done.set()
+
+    manager.on("progress", handler, context="loop", policy="coalesce")
+    manager.run_coroutine_blocking(_emit_burst(manager, "progress", 100), timeout=2)
+    assert done.wait(2)
+    assert received == [99]
+
+
+async def _emit_burst(manager, name, n):
+    # emitting from the loop thread itself: nothing is delivered until we yield
+    for i in range(n):
+        manager.emit(name, i)
+
+
+@pytest.mark.parametrize("context", ["caller", "loop"])
+def test_raising_subscriber_keeps_receiving(manager, context):
+    received = []
+    delivered = threading.Event()
+
+    def handler(x):
+        if x == 0:
+            raise RuntimeError("subscriber failed")
+        received.append(x)
+        delivered.set()
+
+    manager.on("flaky", handler, context=context)
+    manager.emit("flaky", 0)
+    manager.emit("flaky", 1)
+    assert delivered.wait(2)
+    assert received == [1]
+
+
+def test_off_unsubscribes(manager):
+    received = []
+    sub = manager.on("gone", received.append)
+    sub.cancel()
+    manager.emit("gone", 1)
+    assert received == []
+
+
+# -------------------------
+# Parallel map / reduce
+# -------------------------
+def test_map_preserves_order(manager):
+    def slow_square(x):
+        time.sleep(0.001 * (10 - x % 10))
+        return x * x
+
+    assert list(manager.map(slow_square, range(50), chunksize=3, max_in_flight=4)) == [x * x for x in range(50)]
+
+
+def test_imap_unordered_streams_all_results(manager):
+    assert sorted(manager.imap_unordered(lambda x: x + 1, range(20), chunksize=4)) == list(range(1, 21))
+
+
+def test_map_consumes_input_lazily(manager):
+    consumed = []
+
+    def source():
+        for i in range(1000):
+            consumed.append(i)
+            yield i
+
+    results = manager.map(lambda x: x, source(), chunksize=2, max_in_flight=2)
+    assert next(results) == 0
+    assert len(consumed) < 20
+    results.close()
+
+
+def test_map_holds_back_submissions_behind_a_slow_head(manager):
+    release = threading.Event()
+    started = []
+
+    def work(x):
+        started.append(x)
+        if x == 0:
+            release.wait(2)
+        return x
+
+    results = manager.map(work, range(100), chunksize=1, max_in_flight=3)
+    consumer = threading.Thread(target=lambda: started.append(list(results)))
+    consumer.start()
+    deadline = time.monotonic() + 2
+    while len(started) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    # chunk 0 still running, 1 and 2 finished and buffered: nothing else may be submitted
+    assert sorted(started) == [0, 1, 2]
+    release.set()
+    consumer.join(timeout=2)
+    assert started[-1] == list(range(100))
+
+
+def test_map_propagates_exceptions(manager):
+    def fail_on_five(x):
+        if x == 5:
+            raise ValueError("five")
+        return x
+
+    with pytest.raises(ValueError):
+        list(manager.map(fail_on_five, range(10)))
+
+
+def test_reduce(manager):
+    assert manager.reduce(lambda a, b: a + b, range(101), 0, chunksize=7) == 5050
+    assert manager.reduce(max, ["a", "bbb", "cc"], 0, mapper=len, chunksize=1) == 3
+
+
+def test_map_process_lane(manager):
+    assert list(manager.map(abs, [-1, -2, 3], lane="process")) == [1, 2, 3]
+
+
+# -------------------------
+# Shutdown policies
+# -------------------------
+def test_shutdown_drains_with_progress():
+    tm = ThreadManager(max_workers=2, max_tokens=2)
+    futures = [tm.submit_blocking(time.sleep, 0.02) for _ in range(4)]
+    seen = []
+    report = tm.shutdown(policy="drain", timeout=2, progress=lambda done, total: seen.append((done, total)))
+    assert all(f.done() and not f.cancelled() for f in futures)
+    assert report.completed == 4 and report.timed_out == 0
+    assert seen[-1] == (4, 4)
+
+
+def test_shutdown_skips_abandonable_jobs():
+    tm = ThreadManager(max_workers=1, max_tokens=1)
+
+    def slow(cancel_token):
+        while not cancel_token.sleep(0.01):
+            pass
+
+    running = tm.submit_cancellable(slow, abandonable=True)
+    queued = tm.task_group("previews", abandonable=True).submit_blocking(time.sleep, 5)
+    start = time.monotonic()
+    report = tm.shutdown(policy="drain", timeout=5)
+    assert time.monotonic() - start < 1.0
+    assert queued.cancelled()
+    assert report.cancelled + report.abandoned == 2
+    running.exception(timeout=2)
+
+
+def test_shutdown_drain_deadline():
+    tm = ThreadManager(max_workers=1, max_tokens=1)
+    release = threading.Event()
+    tm.submit_blocking(release.wait, 2)
+    queued = tm.submit_blocking(lambda: None)
+    start = time.monotonic()
+    report = tm.shutdown(policy="drain", timeout=0.1)
+    release.set()
+    assert time.monotonic() - start < 1.0
+    assert queued.cancelled()
+    assert report.timed_out == 1 and report.cancelled == 1
+
+
+def test_shutdown_reports_map_chunks():
+    tm = ThreadManager(max_workers=1, max_tokens=1)
+    release = threading.Event()
+    results = tm.map(release.wait, [2, 2, 2], max_in_flight=3)
+    errors = []
+
+    def consume():
+        try:
+            list(results)
+        except concurrent.futures.CancelledError as ex:
+            errors.append(ex)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    deadline = time.monotonic() + 2
+    while tm.outstanding() < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    report = tm.shutdown(policy="drain", timeout=0.1)
+    release.set()
+    consumer.join(timeout=2)
+    assert report.total == 3
+    assert report.timed_out == 1 and report.cancelled == 2
+    assert errors and not consumer.is_alive()
+
+
+def test_shutdown_cancel_policy_cancels_async(manager):
+    fut = manager.run_async(asyncio.sleep(5))
+    report = manager.shutdown(policy="cancel")
+    assert fut.cancelled()
+    assert report.cancelled == 1
+
+
+def test_shutdown_persist_hands_over_queued_jobs():
+    tm = ThreadManager(max_workers=1, max_tokens=1)
+    persisted = []
+    tm.set_persist_handler(persisted.extend)
+    started, release = threading.Event(), threading.Event()
+    running = tm.submit_blocking(lambda: started.set() or release.wait(2))
+    tm.submit_blocking(pow, 2, 10)
+    assert started.wait(2)
+    report = tm.shutdown(policy="persist", timeout=2, progress=lambda settled, total: release.set())
+    assert running.result() is True
+    assert [(job.fn, job.args) for job in persisted] == [(pow, (2, 10))]
+    assert report.persisted == 1 and report.completed == 1
+
+
+def test_shutdown_survives_raising_persist_handler_and_progress():
+    tm = ThreadManager(max_workers=1, max_tokens=1)
+
+    started, release = threading.Event(), threading.Event()
+
+    def broken(*args):
+        release.set()
+        raise RuntimeError("callback failed")
+
+    tm.set_persist_handler(broken)
+    tm.submit_blocking(lambda: started.set() or release.wait(2))
+    tm.submit_blocking(pow, 2, 10)
+    assert started.wait(2)
+    report = tm.shutdown(policy="persist", timeout=2, progress=broken)
+    assert report.persisted == 1 and report.completed == 1
+    assert not tm.is_running() and tm._loop is None
+
+
+def test_submit_after_shutdown_restarts(manager):
+    manager.shutdown()
+    assert manager.submit_blocking(lambda: 1).result(timeout=2) == 1
+
+
+# -------------------------
+# Periodic / scheduled jobs
+# -------------------------
+def test_every_runs_until_cancelled(manager):
+    ticks = []
+    job = manager.every(0.02, lambda: ticks.append(time.monotonic()), delay=0)
+    time.sleep(0.2)
+    job.cancel()
+    time.sleep(0.03)  # a run may already be on its way to the pool
+    count = len(ticks)
+    assert count >= 4
+    time.sleep(0.1)
+    assert len(ticks) == count
+    assert not job.active
+
+
+def test_every_coalesces_identical_jobs(manager):
+    calls = []
+    first = manager.every(0.05, calls.append, ("poll",))
+    second = manager.every(0.05, calls.append, ("poll",))
+    assert first is second
+    first.cancel()
+    assert second.active
+    second.cancel()
+    assert not second.active
+    assert manager.every(0.05, calls.append, ("other",)) is not first
+
+
+def test_every_skips_runs_while_busy(manager):
+    release = threading.Event()
+    job = manager.every(0.01, release.wait, (0.3,), delay=0)
+    time.sleep(0.2)
+    job.cancel()
+    release.set()
+    assert job.runs == 1
+    assert job.skipped > 5
+
+
+def test_at_runs_once(manager):
+    done = threading.Event()
+    calls = []
+
+    async def fire():
+        calls.append(1)
+        done.set()
+
+    job = manager.at(time.time() + 0.05, fire)
+    assert done.wait(2)
+    time.sleep(0.05)
+    assert calls == [1] and not job.active
+
+
+def test_many_pollers_share_one_timer(manager):
+    jobs = [manager.every(0.05 + i * 0.0001, lambda: None, jitter=0.01) for i in range(200)]
+    time.sleep(0.15)
+    assert sum(job.runs for job in jobs) >= 200
+    assert not [t for t in manager.run_coroutine_blocking(_loop_tasks(), timeout=2) if "sleep" in repr(t)]
+    for job in jobs:
+        job.cancel()
+
+
+async def _loop_tasks():
+    return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]